@@ -1,5 +1,6 @@
 from datamodel import OrderDepth, UserId, TradingState, Order
 from typing import List, Dict, Tuple
+from order_router import merge, clip_to_limit
 import math
 
 class Trader:
@@ -322,44 +323,11 @@ class Trader:
         
     def apply_risk_management(self, orders: List[Order], current_position: int, position_limit: int) -> List[Order]:
         """Apply risk management rules to filter orders"""
-        filtered_orders = []
-        
-        # Track potential position changes from these orders
-        potential_position = current_position
-        
-        for order in orders:
-            # Calculate new position if this order executes
-            new_position = potential_position + order.quantity
-            
-            # Check if new position would exceed limits
-            if abs(new_position) <= position_limit:
-                filtered_orders.append(order)
-                potential_position = new_position
-            else:
-                # Adjust the order to respect position limits
-                adjusted_quantity = position_limit - potential_position if order.quantity > 0 else -position_limit - potential_position
-                if adjusted_quantity != 0:
-                    filtered_orders.append(Order(order.symbol, order.price, adjusted_quantity))
-                    potential_position += adjusted_quantity
-                    
-        return filtered_orders
+        return clip_to_limit(orders, current_position, position_limit)
         
     def merge_orders(self, orders: List[Order]) -> List[Order]:
         """Merge orders at the same price level"""
-        price_quantities = {}
-        
-        for order in orders:
-            if order.price in price_quantities:
-                price_quantities[order.price] += order.quantity
-            else:
-                price_quantities[order.price] = order.quantity
-                
-        merged_orders = []
-        for price, quantity in price_quantities.items():
-            if quantity != 0:  # Skip orders that would cancel out
-                merged_orders.append(Order(orders[0].symbol, price, quantity))
-                
-        return merged_orders
+        return merge(orders)
         
     def calculate_conversions(self, state: TradingState, product: str) -> Dict:
         """Calculate potential conversion opportunities"""
@@ -4,6 +4,115 @@ import string
 import statistics as stat
 import numpy as np
 import jsonpickle
+from fourier import FourierForecaster
+
+# KELP fit: (frequency, cos coefficient, sin coefficient) per term, every frequency a multiple
+# of 1/2000; the +f and -f terms of the original expression are folded together
+KELP_TERMS = [
+    (0.0005, 6.2736, 4.5294),
+    (0.0010, 3.8538, 2.9474),
+    (0.0015, -2.3392, -0.8518),
+    (0.0020, 0.9270, 1.0996),
+    (0.0025, -0.8978, -0.3498),
+    (0.0030, 0.2458, 0.3190),
+    (0.0035, 0.6500, -0.1664),
+    (0.0040, 0.0862, 0.6108),
+    (0.0045, -0.1904, 1.1708),
+    (0.0050, -0.5302, -0.3082),
+    (0.0055, -0.0468, 0.5038),
+    (0.0060, 0.9760, 0.6370),
+    (0.0065, -0.3694, 0.8246),
+    (0.0070, 0.4614, 0.1738),
+    (0.0075, -0.0320, 0.1020),
+    (0.0080, -0.3506, 0.1738),
+    (0.0085, 0.6324, -0.0168),
+    (0.0090, -0.0966, -0.4028),
+    (0.0095, 0.6024, 0.2762),
+    (0.0100, -0.2648, 0.0622),
+    (0.0105, 0.2244, -0.2808),
+    (0.0110, 0.2654, 0.3388),
+    (0.0115, -0.0436, -0.2650),
+    (0.0120, -0.0440, 0.5634),
+    (0.0125, 0.0938, -0.1992),
+    (0.0135, 0.3370, 0.0036),
+    (0.0140, 0.3000, -0.2198),
+    (0.0145, 0.0406, 0.0940),
+    (0.0155, -0.1400, -0.1116),
+    (0.0160, 0.1584, 0.1496),
+    (0.0165, -0.2178, 0.1112),
+    (0.0170, 0.0096, 0.1796),
+    (0.0175, 0.0044, 0.2578),
+    (0.0185, -0.2712, 0.1066),
+    (0.0190, 0.0474, 0.1590),
+    (0.0195, -0.2040, 0.1394),
+    (0.0205, -0.0624, 0.1412),
+    (0.0210, -0.0858, 0.0924),
+    (0.0215, -0.0860, 0.1742),
+    (0.0220, -0.1374, -0.0002),
+    (0.0225, 0.1218, 0.0920),
+    (0.0230, 0.1016, 0.1128),
+    (0.0235, 0.0960, 0.2552),
+    (0.0240, -0.1444, 0.0400),
+    (0.0245, -0.0142, 0.1810),
+    (0.0250, -0.0084, -0.2168),
+    (0.0255, -0.0614, 0.3644),
+    (0.0260, -0.2050, 0.1226),
+    (0.0265, 0.1052, -0.0530),
+    (0.0275, 0.1068, -0.1348),
+    (0.0280, -0.0412, 0.2354),
+    (0.0290, -0.2004, 0.1598),
+    (0.0295, 0.0872, -0.1184),
+    (0.0300, 0.1268, 0.1478),
+    (0.0305, 0.0824, 0.1786),
+    (0.0310, 0.0420, 0.1380),
+    (0.0315, 0.1426, -0.0736),
+    (0.0340, -0.0990, 0.0982),
+    (0.0345, -0.0106, 0.1064),
+    (0.0355, -0.1072, 0.0824),
+    (0.0370, 0.1090, 0.1154),
+    (0.0375, 0.1112, 0.0550),
+    (0.0380, 0.1172, -0.0162),
+    (0.0385, -0.1536, 0.0458),
+    (0.0395, 0.0818, 0.1614),
+    (0.0400, -0.0088, -0.1476),
+    (0.0410, 0.0556, 0.1940),
+    (0.0425, 0.0896, 0.0718),
+    (0.0430, 0.0248, 0.1100),
+    (0.0435, -0.0638, 0.1152),
+    (0.0460, 0.0690, 0.0900),
+    (0.0485, 0.0912, 0.0786),
+    (0.0495, -0.0186, 0.1368),
+    (0.0505, 0.0358, 0.1606),
+    (0.0510, 0.0826, 0.0886),
+    (0.0520, -0.0986, 0.0242),
+    (0.0525, 0.0672, 0.1490),
+    (0.0535, 0.1150, -0.0302),
+    (0.0540, 0.0526, 0.1344),
+    (0.0570, 0.0212, 0.0994),
+    (0.0590, 0.0444, 0.0900),
+    (0.0635, -0.0606, 0.1130),
+    (0.0690, 0.0650, -0.0890),
+    (0.0695, -0.0128, 0.1168),
+    (0.0760, 0.0952, 0.0428),
+    (0.0830, 0.0680, 0.1152),
+    (0.0930, -0.0988, 0.0230),
+    (0.0945, -0.0698, 0.0718),
+    (0.0990, -0.1086, -0.0670),
+    (0.1015, 0.0664, 0.1212),
+    (0.1065, 0.1180, -0.0430),
+    (0.1070, 0.0054, 0.1056),
+    (0.1080, -0.0250, 0.1030),
+    (0.1220, 0.1048, 0.0494),
+    (0.1365, -0.1002, -0.0046),
+    (0.1405, 0.1014, 0.0142),
+    (0.2015, 0.0882, 0.0788),
+    (0.2700, 0.1142, 0.0438),
+    (0.3410, 0.1056, 0.0234),
+    (0.3735, 0.0990, 0.0192),
+    (0.4290, 0.1202, -0.0618),
+    (0.4410, -0.0528, -0.1022),
+]
+KELP_FORECAST = FourierForecaster(*zip(*KELP_TERMS), mean=2019.0520)
 
 class Trader:
     
@@ -69,7 +178,7 @@ class Trader:
         #     return {}, 1, ""
 
     def fourier_cust(self, x):
-        return 2019.0520 + 3.1368 * np.cos(2 * np.pi * 0.0005 * x) + 2.2647 * np.sin(2 * np.pi * 0.0005 * x) + 1.9269 * np.cos(2 * np.pi * 0.0010 * x) + 1.4737 * np.sin(2 * np.pi * 0.0010 * x) + -1.1696 * np.cos(2 * np.pi * 0.0015 * x) + -0.4259 * np.sin(2 * np.pi * 0.0015 * x) + 0.4635 * np.cos(2 * np.pi * 0.0020 * x) + 0.5498 * np.sin(2 * np.pi * 0.0020 * x) + -0.4489 * np.cos(2 * np.pi * 0.0025 * x) + -0.1749 * np.sin(2 * np.pi * 0.0025 * x) + 0.1229 * np.cos(2 * np.pi * 0.0030 * x) + 0.1595 * np.sin(2 * np.pi * 0.0030 * x) + 0.3250 * np.cos(2 * np.pi * 0.0035 * x) + -0.0832 * np.sin(2 * np.pi * 0.0035 * x) + 0.0431 * np.cos(2 * np.pi * 0.0040 * x) + 0.3054 * np.sin(2 * np.pi * 0.0040 * x) + -0.0952 * np.cos(2 * np.pi * 0.0045 * x) + 0.5854 * np.sin(2 * np.pi * 0.0045 * x) + -0.2651 * np.cos(2 * np.pi * 0.0050 * x) + -0.1541 * np.sin(2 * np.pi * 0.0050 * x) + -0.0234 * np.cos(2 * np.pi * 0.0055 * x) + 0.2519 * np.sin(2 * np.pi * 0.0055 * x) + 0.4880 * np.cos(2 * np.pi * 0.0060 * x) + 0.3185 * np.sin(2 * np.pi * 0.0060 * x) + -0.1847 * np.cos(2 * np.pi * 0.0065 * x) + 0.4123 * np.sin(2 * np.pi * 0.0065 * x) + 0.2307 * np.cos(2 * np.pi * 0.0070 * x) + 0.0869 * np.sin(2 * np.pi * 0.0070 * x) + -0.0160 * np.cos(2 * np.pi * 0.0075 * x) + 0.0510 * np.sin(2 * np.pi * 0.0075 * x) + -0.1753 * np.cos(2 * np.pi * 0.0080 * x) + 0.0869 * np.sin(2 * np.pi * 0.0080 * x) + 0.3162 * np.cos(2 * np.pi * 0.0085 * x) + -0.0084 * np.sin(2 * np.pi * 0.0085 * x) + -0.0483 * np.cos(2 * np.pi * 0.0090 * x) + -0.2014 * np.sin(2 * np.pi * 0.0090 * x) + 0.3012 * np.cos(2 * np.pi * 0.0095 * x) + 0.1381 * np.sin(2 * np.pi * 0.0095 * x) + -0.1324 * np.cos(2 * np.pi * 0.0100 * x) + 0.0311 * np.sin(2 * np.pi * 0.0100 * x) + 0.1122 * np.cos(2 * np.pi * 0.0105 * x) + -0.1404 * np.sin(2 * np.pi * 0.0105 * x) + 0.1327 * np.cos(2 * np.pi * 0.0110 * x) + 0.1694 * np.sin(2 * np.pi * 0.0110 * x) + -0.0218 * np.cos(2 * np.pi * 0.0115 * x) + -0.1325 * np.sin(2 * np.pi * 0.0115 * x) + -0.0220 * np.cos(2 * np.pi * 0.0120 * x) + 0.2817 * np.sin(2 * np.pi * 0.0120 * x) + 0.0469 * np.cos(2 * np.pi * 0.0125 * x) + -0.0996 * np.sin(2 * np.pi * 0.0125 * x) + 0.1685 * np.cos(2 * np.pi * 0.0135 * x) + 0.0018 * np.sin(2 * np.pi * 0.0135 * x) + 0.1500 * np.cos(2 * np.pi * 0.0140 * x) + -0.1099 * np.sin(2 * np.pi * 0.0140 * x) + 0.0203 * np.cos(2 * np.pi * 0.0145 * x) + 0.0470 * np.sin(2 * np.pi * 0.0145 * x) + -0.0700 * np.cos(2 * np.pi * 0.0155 * x) + -0.0558 * np.sin(2 * np.pi * 0.0155 * x) + 0.0792 * np.cos(2 * np.pi * 0.0160 * x) + 0.0748 * np.sin(2 * np.pi * 0.0160 * x) + -0.1089 * np.cos(2 * np.pi * 0.0165 * x) + 0.0556 * np.sin(2 * np.pi * 0.0165 * x) + 0.0048 * np.cos(2 * np.pi * 0.0170 * x) + 0.0898 * np.sin(2 * np.pi * 0.0170 * x) + 0.0022 * np.cos(2 * np.pi * 0.0175 * x) + 0.1289 * np.sin(2 * np.pi * 0.0175 * x) + -0.1356 * np.cos(2 * np.pi * 0.0185 * x) + 0.0533 * np.sin(2 * np.pi * 0.0185 * x) + 0.0237 * np.cos(2 * np.pi * 0.0190 * x) + 0.0795 * np.sin(2 * np.pi * 0.0190 * x) + -0.1020 * np.cos(2 * np.pi * 0.0195 * x) + 0.0697 * np.sin(2 * np.pi * 0.0195 * x) + -0.0312 * np.cos(2 * np.pi * 0.0205 * x) + 0.0706 * np.sin(2 * np.pi * 0.0205 * x) + -0.0429 * np.cos(2 * np.pi * 0.0210 * x) + 0.0462 * np.sin(2 * np.pi * 0.0210 * x) + -0.0430 * np.cos(2 * np.pi * 0.0215 * x) + 0.0871 * np.sin(2 * np.pi * 0.0215 * x) + -0.0687 * np.cos(2 * np.pi * 0.0220 * x) + -0.0001 * np.sin(2 * np.pi * 0.0220 * x) + 0.0609 * np.cos(2 * np.pi * 0.0225 * x) + 0.0460 * np.sin(2 * np.pi * 0.0225 * x) + 0.0508 * np.cos(2 * np.pi * 0.0230 * x) + 0.0564 * np.sin(2 * np.pi * 0.0230 * x) + 0.0480 * np.cos(2 * np.pi * 0.0235 * x) + 0.1276 * np.sin(2 * np.pi * 0.0235 * x) + -0.0722 * np.cos(2 * np.pi * 0.0240 * x) + 0.0200 * np.sin(2 * np.pi * 0.0240 * x) + -0.0071 * np.cos(2 * np.pi * 0.0245 * x) + 0.0905 * np.sin(2 * np.pi * 0.0245 * x) + -0.0042 * np.cos(2 * np.pi * 0.0250 * x) + -0.1084 * np.sin(2 * np.pi * 0.0250 * x) + -0.0307 * np.cos(2 * np.pi * 0.0255 * x) + 0.1822 * np.sin(2 * np.pi * 0.0255 * x) + -0.1025 * np.cos(2 * np.pi * 0.0260 * x) + 0.0613 * np.sin(2 * np.pi * 0.0260 * x) + 0.0526 * np.cos(2 * np.pi * 0.0265 * x) + -0.0265 * np.sin(2 * np.pi * 0.0265 * x) + 0.0534 * np.cos(2 * np.pi * 0.0275 * x) + -0.0674 * np.sin(2 * np.pi * 0.0275 * x) + -0.0206 * np.cos(2 * np.pi * 0.0280 * x) + 0.1177 * np.sin(2 * np.pi * 0.0280 * x) + -0.1002 * np.cos(2 * np.pi * 0.0290 * x) + 0.0799 * np.sin(2 * np.pi * 0.0290 * x) + 0.0436 * np.cos(2 * np.pi * 0.0295 * x) + -0.0592 * np.sin(2 * np.pi * 0.0295 * x) + 0.0634 * np.cos(2 * np.pi * 0.0300 * x) + 0.0739 * np.sin(2 * np.pi * 0.0300 * x) + 0.0412 * np.cos(2 * np.pi * 0.0305 * x) + 0.0893 * np.sin(2 * np.pi * 0.0305 * x) + 0.0210 * np.cos(2 * np.pi * 0.0310 * x) + 0.0690 * np.sin(2 * np.pi * 0.0310 * x) + 0.0713 * np.cos(2 * np.pi * 0.0315 * x) + -0.0368 * np.sin(2 * np.pi * 0.0315 * x) + -0.0495 * np.cos(2 * np.pi * 0.0340 * x) + 0.0491 * np.sin(2 * np.pi * 0.0340 * x) + -0.0053 * np.cos(2 * np.pi * 0.0345 * x) + 0.0532 * np.sin(2 * np.pi * 0.0345 * x) + -0.0536 * np.cos(2 * np.pi * 0.0355 * x) + 0.0412 * np.sin(2 * np.pi * 0.0355 * x) + 0.0545 * np.cos(2 * np.pi * 0.0370 * x) + 0.0577 * np.sin(2 * np.pi * 0.0370 * x) + 0.0556 * np.cos(2 * np.pi * 0.0375 * x) + 0.0275 * np.sin(2 * np.pi * 0.0375 * x) + 0.0586 * np.cos(2 * np.pi * 0.0380 * x) + -0.0081 * np.sin(2 * np.pi * 0.0380 * x) + -0.0768 * np.cos(2 * np.pi * 0.0385 * x) + 0.0229 * np.sin(2 * np.pi * 0.0385 * x) + 0.0409 * np.cos(2 * np.pi * 0.0395 * x) + 0.0807 * np.sin(2 * np.pi * 0.0395 * x) + -0.0044 * np.cos(2 * np.pi * 0.0400 * x) + -0.0738 * np.sin(2 * np.pi * 0.0400 * x) + 0.0278 * np.cos(2 * np.pi * 0.0410 * x) + 0.0970 * np.sin(2 * np.pi * 0.0410 * x) + 0.0448 * np.cos(2 * np.pi * 0.0425 * x) + 0.0359 * np.sin(2 * np.pi * 0.0425 * x) + 0.0124 * np.cos(2 * np.pi * 0.0430 * x) + 0.0550 * np.sin(2 * np.pi * 0.0430 * x) + -0.0319 * np.cos(2 * np.pi * 0.0435 * x) + 0.0576 * np.sin(2 * np.pi * 0.0435 * x) + 0.0345 * np.cos(2 * np.pi * 0.0460 * x) + 0.0450 * np.sin(2 * np.pi * 0.0460 * x) + 0.0456 * np.cos(2 * np.pi * 0.0485 * x) + 0.0393 * np.sin(2 * np.pi * 0.0485 * x) + -0.0093 * np.cos(2 * np.pi * 0.0495 * x) + 0.0684 * np.sin(2 * np.pi * 0.0495 * x) + 0.0179 * np.cos(2 * np.pi * 0.0505 * x) + 0.0803 * np.sin(2 * np.pi * 0.0505 * x) + 0.0413 * np.cos(2 * np.pi * 0.0510 * x) + 0.0443 * np.sin(2 * np.pi * 0.0510 * x) + -0.0493 * np.cos(2 * np.pi * 0.0520 * x) + 0.0121 * np.sin(2 * np.pi * 0.0520 * x) + 0.0336 * np.cos(2 * np.pi * 0.0525 * x) + 0.0745 * np.sin(2 * np.pi * 0.0525 * x) + 0.0575 * np.cos(2 * np.pi * 0.0535 * x) + -0.0151 * np.sin(2 * np.pi * 0.0535 * x) + 0.0263 * np.cos(2 * np.pi * 0.0540 * x) + 0.0672 * np.sin(2 * np.pi * 0.0540 * x) + 0.0106 * np.cos(2 * np.pi * 0.0570 * x) + 0.0497 * np.sin(2 * np.pi * 0.0570 * x) + 0.0222 * np.cos(2 * np.pi * 0.0590 * x) + 0.0450 * np.sin(2 * np.pi * 0.0590 * x) + -0.0303 * np.cos(2 * np.pi * 0.0635 * x) + 0.0565 * np.sin(2 * np.pi * 0.0635 * x) + 0.0325 * np.cos(2 * np.pi * 0.0690 * x) + -0.0445 * np.sin(2 * np.pi * 0.0690 * x) + -0.0064 * np.cos(2 * np.pi * 0.0695 * x) + 0.0584 * np.sin(2 * np.pi * 0.0695 * x) + 0.0476 * np.cos(2 * np.pi * 0.0760 * x) + 0.0214 * np.sin(2 * np.pi * 0.0760 * x) + 0.0340 * np.cos(2 * np.pi * 0.0830 * x) + 0.0576 * np.sin(2 * np.pi * 0.0830 * x) + -0.0494 * np.cos(2 * np.pi * 0.0930 * x) + 0.0115 * np.sin(2 * np.pi * 0.0930 * x) + -0.0349 * np.cos(2 * np.pi * 0.0945 * x) + 0.0359 * np.sin(2 * np.pi * 0.0945 * x) + -0.0543 * np.cos(2 * np.pi * 0.0990 * x) + -0.0335 * np.sin(2 * np.pi * 0.0990 * x) + 0.0332 * np.cos(2 * np.pi * 0.1015 * x) + 0.0606 * np.sin(2 * np.pi * 0.1015 * x) + 0.0590 * np.cos(2 * np.pi * 0.1065 * x) + -0.0215 * np.sin(2 * np.pi * 0.1065 * x) + 0.0027 * np.cos(2 * np.pi * 0.1070 * x) + 0.0528 * np.sin(2 * np.pi * 0.1070 * x) + -0.0125 * np.cos(2 * np.pi * 0.1080 * x) + 0.0515 * np.sin(2 * np.pi * 0.1080 * x) + 0.0524 * np.cos(2 * np.pi * 0.1220 * x) + 0.0247 * np.sin(2 * np.pi * 0.1220 * x) + -0.0501 * np.cos(2 * np.pi * 0.1365 * x) + -0.0023 * np.sin(2 * np.pi * 0.1365 * x) + 0.0507 * np.cos(2 * np.pi * 0.1405 * x) + 0.0071 * np.sin(2 * np.pi * 0.1405 * x) + 0.0441 * np.cos(2 * np.pi * 0.2015 * x) + 0.0394 * np.sin(2 * np.pi * 0.2015 * x) + 0.0571 * np.cos(2 * np.pi * 0.2700 * x) + 0.0219 * np.sin(2 * np.pi * 0.2700 * x) + 0.0528 * np.cos(2 * np.pi * 0.3410 * x) + 0.0117 * np.sin(2 * np.pi * 0.3410 * x) + 0.0495 * np.cos(2 * np.pi * 0.3735 * x) + 0.0096 * np.sin(2 * np.pi * 0.3735 * x) + 0.0601 * np.cos(2 * np.pi * 0.4290 * x) + -0.0309 * np.sin(2 * np.pi * 0.4290 * x) + -0.0264 * np.cos(2 * np.pi * 0.4410 * x) + -0.0511 * np.sin(2 * np.pi * 0.4410 * x) + -0.0264 * np.cos(2 * np.pi * -0.4410 * x) + 0.0511 * np.sin(2 * np.pi * -0.4410 * x) + 0.0601 * np.cos(2 * np.pi * -0.4290 * x) + 0.0309 * np.sin(2 * np.pi * -0.4290 * x) + 0.0495 * np.cos(2 * np.pi * -0.3735 * x) + -0.0096 * np.sin(2 * np.pi * -0.3735 * x) + 0.0528 * np.cos(2 * np.pi * -0.3410 * x) + -0.0117 * np.sin(2 * np.pi * -0.3410 * x) + 0.0571 * np.cos(2 * np.pi * -0.2700 * x) + -0.0219 * np.sin(2 * np.pi * -0.2700 * x) + 0.0441 * np.cos(2 * np.pi * -0.2015 * x) + -0.0394 * np.sin(2 * np.pi * -0.2015 * x) + 0.0507 * np.cos(2 * np.pi * -0.1405 * x) + -0.0071 * np.sin(2 * np.pi * -0.1405 * x) + -0.0501 * np.cos(2 * np.pi * -0.1365 * x) + 0.0023 * np.sin(2 * np.pi * -0.1365 * x) + 0.0524 * np.cos(2 * np.pi * -0.1220 * x) + -0.0247 * np.sin(2 * np.pi * -0.1220 * x) + -0.0125 * np.cos(2 * np.pi * -0.1080 * x) + -0.0515 * np.sin(2 * np.pi * -0.1080 * x) + 0.0027 * np.cos(2 * np.pi * -0.1070 * x) + -0.0528 * np.sin(2 * np.pi * -0.1070 * x) + 0.0590 * np.cos(2 * np.pi * -0.1065 * x) + 0.0215 * np.sin(2 * np.pi * -0.1065 * x) + 0.0332 * np.cos(2 * np.pi * -0.1015 * x) + -0.0606 * np.sin(2 * np.pi * -0.1015 * x) + -0.0543 * np.cos(2 * np.pi * -0.0990 * x) + 0.0335 * np.sin(2 * np.pi * -0.0990 * x) + -0.0349 * np.cos(2 * np.pi * -0.0945 * x) + -0.0359 * np.sin(2 * np.pi * -0.0945 * x) + -0.0494 * np.cos(2 * np.pi * -0.0930 * x) + -0.0115 * np.sin(2 * np.pi * -0.0930 * x) + 0.0340 * np.cos(2 * np.pi * -0.0830 * x) + -0.0576 * np.sin(2 * np.pi * -0.0830 * x) + 0.0476 * np.cos(2 * np.pi * -0.0760 * x) + -0.0214 * np.sin(2 * np.pi * -0.0760 * x) + -0.0064 * np.cos(2 * np.pi * -0.0695 * x) + -0.0584 * np.sin(2 * np.pi * -0.0695 * x) + 0.0325 * np.cos(2 * np.pi * -0.0690 * x) + 0.0445 * np.sin(2 * np.pi * -0.0690 * x) + -0.0303 * np.cos(2 * np.pi * -0.0635 * x) + -0.0565 * np.sin(2 * np.pi * -0.0635 * x) + 0.0222 * np.cos(2 * np.pi * -0.0590 * x) + -0.0450 * np.sin(2 * np.pi * -0.0590 * x) + 0.0106 * np.cos(2 * np.pi * -0.0570 * x) + -0.0497 * np.sin(2 * np.pi * -0.0570 * x) + 0.0263 * np.cos(2 * np.pi * -0.0540 * x) + -0.0672 * np.sin(2 * np.pi * -0.0540 * x) + 0.0575 * np.cos(2 * np.pi * -0.0535 * x) + 0.0151 * np.sin(2 * np.pi * -0.0535 * x) + 0.0336 * np.cos(2 * np.pi * -0.0525 * x) + -0.0745 * np.sin(2 * np.pi * -0.0525 * x) + -0.0493 * np.cos(2 * np.pi * -0.0520 * x) + -0.0121 * np.sin(2 * np.pi * -0.0520 * x) + 0.0413 * np.cos(2 * np.pi * -0.0510 * x) + -0.0443 * np.sin(2 * np.pi * -0.0510 * x) + 0.0179 * np.cos(2 * np.pi * -0.0505 * x) + -0.0803 * np.sin(2 * np.pi * -0.0505 * x) + -0.0093 * np.cos(2 * np.pi * -0.0495 * x) + -0.0684 * np.sin(2 * np.pi * -0.0495 * x) + 0.0456 * np.cos(2 * np.pi * -0.0485 * x) + -0.0393 * np.sin(2 * np.pi * -0.0485 * x) + 0.0345 * np.cos(2 * np.pi * -0.0460 * x) + -0.0450 * np.sin(2 * np.pi * -0.0460 * x) + -0.0319 * np.cos(2 * np.pi * -0.0435 * x) + -0.0576 * np.sin(2 * np.pi * -0.0435 * x) + 0.0124 * np.cos(2 * np.pi * -0.0430 * x) + -0.0550 * np.sin(2 * np.pi * -0.0430 * x) + 0.0448 * np.cos(2 * np.pi * -0.0425 * x) + -0.0359 * np.sin(2 * np.pi * -0.0425 * x) + 0.0278 * np.cos(2 * np.pi * -0.0410 * x) + -0.0970 * np.sin(2 * np.pi * -0.0410 * x) + -0.0044 * np.cos(2 * np.pi * -0.0400 * x) + 0.0738 * np.sin(2 * np.pi * -0.0400 * x) + 0.0409 * np.cos(2 * np.pi * -0.0395 * x) + -0.0807 * np.sin(2 * np.pi * -0.0395 * x) + -0.0768 * np.cos(2 * np.pi * -0.0385 * x) + -0.0229 * np.sin(2 * np.pi * -0.0385 * x) + 0.0586 * np.cos(2 * np.pi * -0.0380 * x) + 0.0081 * np.sin(2 * np.pi * -0.0380 * x) + 0.0556 * np.cos(2 * np.pi * -0.0375 * x) + -0.0275 * np.sin(2 * np.pi * -0.0375 * x) + 0.0545 * np.cos(2 * np.pi * -0.0370 * x) + -0.0577 * np.sin(2 * np.pi * -0.0370 * x) + -0.0536 * np.cos(2 * np.pi * -0.0355 * x) + -0.0412 * np.sin(2 * np.pi * -0.0355 * x) + -0.0053 * np.cos(2 * np.pi * -0.0345 * x) + -0.0532 * np.sin(2 * np.pi * -0.0345 * x) + -0.0495 * np.cos(2 * np.pi * -0.0340 * x) + -0.0491 * np.sin(2 * np.pi * -0.0340 * x) + 0.0713 * np.cos(2 * np.pi * -0.0315 * x) + 0.0368 * np.sin(2 * np.pi * -0.0315 * x) + 0.0210 * np.cos(2 * np.pi * -0.0310 * x) + -0.0690 * np.sin(2 * np.pi * -0.0310 * x) + 0.0412 * np.cos(2 * np.pi * -0.0305 * x) + -0.0893 * np.sin(2 * np.pi * -0.0305 * x) + 0.0634 * np.cos(2 * np.pi * -0.0300 * x) + -0.0739 * np.sin(2 * np.pi * -0.0300 * x) + 0.0436 * np.cos(2 * np.pi * -0.0295 * x) + 0.0592 * np.sin(2 * np.pi * -0.0295 * x) + -0.1002 * np.cos(2 * np.pi * -0.0290 * x) + -0.0799 * np.sin(2 * np.pi * -0.0290 * x) + -0.0206 * np.cos(2 * np.pi * -0.0280 * x) + -0.1177 * np.sin(2 * np.pi * -0.0280 * x) + 0.0534 * np.cos(2 * np.pi * -0.0275 * x) + 0.0674 * np.sin(2 * np.pi * -0.0275 * x) + 0.0526 * np.cos(2 * np.pi * -0.0265 * x) + 0.0265 * np.sin(2 * np.pi * -0.0265 * x) + -0.1025 * np.cos(2 * np.pi * -0.0260 * x) + -0.0613 * np.sin(2 * np.pi * -0.0260 * x) + -0.0307 * np.cos(2 * np.pi * -0.0255 * x) + -0.1822 * np.sin(2 * np.pi * -0.0255 * x) + -0.0042 * np.cos(2 * np.pi * -0.0250 * x) + 0.1084 * np.sin(2 * np.pi * -0.0250 * x) + -0.0071 * np.cos(2 * np.pi * -0.0245 * x) + -0.0905 * np.sin(2 * np.pi * -0.0245 * x) + -0.0722 * np.cos(2 * np.pi * -0.0240 * x) + -0.0200 * np.sin(2 * np.pi * -0.0240 * x) + 0.0480 * np.cos(2 * np.pi * -0.0235 * x) + -0.1276 * np.sin(2 * np.pi * -0.0235 * x) + 0.0508 * np.cos(2 * np.pi * -0.0230 * x) + -0.0564 * np.sin(2 * np.pi * -0.0230 * x) + 0.0609 * np.cos(2 * np.pi * -0.0225 * x) + -0.0460 * np.sin(2 * np.pi * -0.0225 * x) + -0.0687 * np.cos(2 * np.pi * -0.0220 * x) + 0.0001 * np.sin(2 * np.pi * -0.0220 * x) + -0.0430 * np.cos(2 * np.pi * -0.0215 * x) + -0.0871 * np.sin(2 * np.pi * -0.0215 * x) + -0.0429 * np.cos(2 * np.pi * -0.0210 * x) + -0.0462 * np.sin(2 * np.pi * -0.0210 * x) + -0.0312 * np.cos(2 * np.pi * -0.0205 * x) + -0.0706 * np.sin(2 * np.pi * -0.0205 * x) + -0.1020 * np.cos(2 * np.pi * -0.0195 * x) + -0.0697 * np.sin(2 * np.pi * -0.0195 * x) + 0.0237 * np.cos(2 * np.pi * -0.0190 * x) + -0.0795 * np.sin(2 * np.pi * -0.0190 * x) + -0.1356 * np.cos(2 * np.pi * -0.0185 * x) + -0.0533 * np.sin(2 * np.pi * -0.0185 * x) + 0.0022 * np.cos(2 * np.pi * -0.0175 * x) + -0.1289 * np.sin(2 * np.pi * -0.0175 * x) + 0.0048 * np.cos(2 * np.pi * -0.0170 * x) + -0.0898 * np.sin(2 * np.pi * -0.0170 * x) + -0.1089 * np.cos(2 * np.pi * -0.0165 * x) + -0.0556 * np.sin(2 * np.pi * -0.0165 * x) + 0.0792 * np.cos(2 * np.pi * -0.0160 * x) + -0.0748 * np.sin(2 * np.pi * -0.0160 * x) + -0.0700 * np.cos(2 * np.pi * -0.0155 * x) + 0.0558 * np.sin(2 * np.pi * -0.0155 * x) + 0.0203 * np.cos(2 * np.pi * -0.0145 * x) + -0.0470 * np.sin(2 * np.pi * -0.0145 * x) + 0.1500 * np.cos(2 * np.pi * -0.0140 * x) + 0.1099 * np.sin(2 * np.pi * -0.0140 * x) + 0.1685 * np.cos(2 * np.pi * -0.0135 * x) + -0.0018 * np.sin(2 * np.pi * -0.0135 * x) + 0.0469 * np.cos(2 * np.pi * -0.0125 * x) + 0.0996 * np.sin(2 * np.pi * -0.0125 * x) + -0.0220 * np.cos(2 * np.pi * -0.0120 * x) + -0.2817 * np.sin(2 * np.pi * -0.0120 * x) + -0.0218 * np.cos(2 * np.pi * -0.0115 * x) + 0.1325 * np.sin(2 * np.pi * -0.0115 * x) + 0.1327 * np.cos(2 * np.pi * -0.0110 * x) + -0.1694 * np.sin(2 * np.pi * -0.0110 * x) + 0.1122 * np.cos(2 * np.pi * -0.0105 * x) + 0.1404 * np.sin(2 * np.pi * -0.0105 * x) + -0.1324 * np.cos(2 * np.pi * -0.0100 * x) + -0.0311 * np.sin(2 * np.pi * -0.0100 * x) + 0.3012 * np.cos(2 * np.pi * -0.0095 * x) + -0.1381 * np.sin(2 * np.pi * -0.0095 * x) + -0.0483 * np.cos(2 * np.pi * -0.0090 * x) + 0.2014 * np.sin(2 * np.pi * -0.0090 * x) + 0.3162 * np.cos(2 * np.pi * -0.0085 * x) + 0.0084 * np.sin(2 * np.pi * -0.0085 * x) + -0.1753 * np.cos(2 * np.pi * -0.0080 * x) + -0.0869 * np.sin(2 * np.pi * -0.0080 * x) + -0.0160 * np.cos(2 * np.pi * -0.0075 * x) + -0.0510 * np.sin(2 * np.pi * -0.0075 * x) + 0.2307 * np.cos(2 * np.pi * -0.0070 * x) + -0.0869 * np.sin(2 * np.pi * -0.0070 * x) + -0.1847 * np.cos(2 * np.pi * -0.0065 * x) + -0.4123 * np.sin(2 * np.pi * -0.0065 * x) + 0.4880 * np.cos(2 * np.pi * -0.0060 * x) + -0.3185 * np.sin(2 * np.pi * -0.0060 * x) + -0.0234 * np.cos(2 * np.pi * -0.0055 * x) + -0.2519 * np.sin(2 * np.pi * -0.0055 * x) + -0.2651 * np.cos(2 * np.pi * -0.0050 * x) + 0.1541 * np.sin(2 * np.pi * -0.0050 * x) + -0.0952 * np.cos(2 * np.pi * -0.0045 * x) + -0.5854 * np.sin(2 * np.pi * -0.0045 * x) + 0.0431 * np.cos(2 * np.pi * -0.0040 * x) + -0.3054 * np.sin(2 * np.pi * -0.0040 * x) + 0.3250 * np.cos(2 * np.pi * -0.0035 * x) + 0.0832 * np.sin(2 * np.pi * -0.0035 * x) + 0.1229 * np.cos(2 * np.pi * -0.0030 * x) + -0.1595 * np.sin(2 * np.pi * -0.0030 * x) + -0.4489 * np.cos(2 * np.pi * -0.0025 * x) + 0.1749 * np.sin(2 * np.pi * -0.0025 * x) + 0.4635 * np.cos(2 * np.pi * -0.0020 * x) + -0.5498 * np.sin(2 * np.pi * -0.0020 * x) + -1.1696 * np.cos(2 * np.pi * -0.0015 * x) + 0.4259 * np.sin(2 * np.pi * -0.0015 * x) + 1.9269 * np.cos(2 * np.pi * -0.0010 * x) + -1.4737 * np.sin(2 * np.pi * -0.0010 * x) + 3.1368 * np.cos(2 * np.pi * -0.0005 * x) + -2.2647 * np.sin(2 * np.pi * -0.0005 * x)
+        return KELP_FORECAST(x)
 
 
 class Persistence_Data(object):
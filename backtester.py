@@ -0,0 +1,387 @@
+from datamodel import Listing, OrderDepth, Trade, TradingState, Observation, ConversionObservation, Order
+from typing import List, Dict, Optional, Tuple
+from collections import defaultdict
+import contextlib
+import importlib
+import argparse
+import glob
+import csv
+import os
+import io
+
+DEFAULT_POSITION_LIMIT = 50
+# Products whose observations file carries no product column
+CONVERSION_PRODUCTS = ["ORCHIDS", "MAGNIFICENT_MACARONS"]
+SUBMISSION = "SUBMISSION"
+
+
+class MarketData:
+    """Historical order books, market trades and conversion observations for one day."""
+
+    def __init__(self, round_num: int, day: int):
+        self.round_num = round_num
+        self.day = day
+        self.timestamps: List[int] = []
+        self.products: List[str] = []
+        # timestamp -> product -> (buy_orders, sell_orders, mid_price)
+        self.books: Dict[int, Dict[str, Tuple[Dict[int, int], Dict[int, int], float]]] = {}
+        self.trades: Dict[int, List[Trade]] = defaultdict(list)
+        self.observations: Dict[int, Dict[str, ConversionObservation]] = {}
+
+    def order_depths(self, timestamp: int) -> Dict[str, OrderDepth]:
+        """Fresh OrderDepth objects for a tick (traders are free to mutate them)"""
+        return {
+            product: OrderDepth(buy_orders, sell_orders)
+            for product, (buy_orders, sell_orders, _) in self.books[timestamp].items()
+        }
+
+    def market_trades(self, timestamp: int) -> List[Trade]:
+        return self.trades.get(timestamp, [])
+
+    def conversion_observations(self, timestamp: int) -> Dict[str, ConversionObservation]:
+        return self.observations.get(timestamp, {})
+
+    def mid_price(self, timestamp: int, product: str) -> Optional[float]:
+        book = self.books[timestamp].get(product)
+        return book[2] if book is not None else None
+
+    def head(self, fraction: float) -> "MarketData":
+        """The first `fraction` of the day's ticks, sharing the underlying books"""
+        if fraction >= 1:
+            return self
+        partial = MarketData(self.round_num, self.day)
+        partial.products = self.products
+        partial.books = self.books
+        partial.trades = self.trades
+        partial.observations = self.observations
+        partial.timestamps = self.timestamps[:max(1, int(len(self.timestamps) * fraction))]
+        return partial
+
+
+def _find_file(data_dir: str, kind: str, round_num: int, day: int) -> Optional[str]:
+    matches = sorted(glob.glob(os.path.join(data_dir, f"{kind}_round_{round_num}_day_{day}*.csv")))
+    return matches[0] if matches else None
+
+
+def _number(value: str):
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def load_market_data(data_dir: str, round_num: int, day: int) -> MarketData:
+    """Load prices_/trades_/observations_round_X_day_Y.csv files in the prosperity log format"""
+    market = MarketData(round_num, day)
+
+    prices_file = _find_file(data_dir, "prices", round_num, day)
+    if prices_file is None:
+        raise FileNotFoundError(f"No prices file for round {round_num} day {day} in {data_dir}")
+
+    products = set()
+    with open(prices_file, newline="") as f:
+        for row in csv.DictReader(f, delimiter=";"):
+            timestamp = int(row["timestamp"])
+            product = row["product"]
+            buy_orders: Dict[int, int] = {}
+            sell_orders: Dict[int, int] = {}
+            for level in (1, 2, 3):
+                bid_price = row.get(f"bid_price_{level}")
+                if bid_price:
+                    buy_orders[int(float(bid_price))] = int(float(row[f"bid_volume_{level}"]))
+                ask_price = row.get(f"ask_price_{level}")
+                if ask_price:
+                    # Sell volumes are negative in OrderDepth
+                    sell_orders[int(float(ask_price))] = -abs(int(float(row[f"ask_volume_{level}"])))
+            mid_price = float(row["mid_price"]) if row.get("mid_price") else None
+            if timestamp not in market.books:
+                market.books[timestamp] = {}
+            market.books[timestamp][product] = (buy_orders, sell_orders, mid_price)
+            products.add(product)
+
+    market.timestamps = sorted(market.books.keys())
+    market.products = sorted(products)
+
+    trades_file = _find_file(data_dir, "trades", round_num, day)
+    if trades_file is not None:
+        with open(trades_file, newline="") as f:
+            for row in csv.DictReader(f, delimiter=";"):
+                timestamp = int(row["timestamp"])
+                market.trades[timestamp].append(Trade(
+                    row["symbol"], _number(row["price"]), int(float(row["quantity"])),
+                    row.get("buyer") or "", row.get("seller") or "", timestamp
+                ))
+
+    observations_file = _find_file(data_dir, "observations", round_num, day)
+    if observations_file is not None:
+        with open(observations_file, newline="") as f:
+            dialect = csv.Sniffer().sniff(f.readline(), delimiters=",;")
+            f.seek(0)
+            default_products = [product for product in CONVERSION_PRODUCTS if product in products]
+            for row in csv.DictReader(f, dialect=dialect):
+                timestamp = int(row["timestamp"])
+                observation = ConversionObservation(
+                    float(row["bidPrice"]), float(row["askPrice"]), float(row["transportFees"]),
+                    float(row["exportTariff"]), float(row["importTariff"]),
+                    float(row.get("sugarPrice") or 0), float(row.get("sunlightIndex") or 0)
+                )
+                for product in ([row["product"]] if row.get("product") else default_products):
+                    market.observations.setdefault(timestamp, {})[product] = observation
+
+    return market
+
+
+def get_position_limits(trader) -> Dict[str, int]:
+    """Read the per-product limits a trader enforces on itself (LIMIT or position_limits)"""
+    for attribute in ("LIMIT", "position_limits"):
+        limits = getattr(trader, attribute, None)
+        if isinstance(limits, dict):
+            return dict(limits)
+    symbol = getattr(trader, "MACARON_SYMBOL", None)
+    if symbol is not None:
+        return {symbol: trader.MACARON_POSITION_LIMIT}
+    return {}
+
+
+def load_trader(module_name: str, params: Optional[dict] = None):
+    """Import a trader module by name and build its Trader"""
+    module = importlib.import_module(module_name)
+    if params is not None:
+        return module.Trader(params=params)
+    return module.Trader()
+
+
+class BacktestResult:
+
+    def __init__(self, day: int):
+        self.day = day
+        # (timestamp, product, position, pnl)
+        self.rows: List[Tuple[int, str, int, float]] = []
+        self.final_pnl: Dict[str, float] = {}
+        self.final_position: Dict[str, int] = {}
+        self.rejected_ticks: Dict[str, int] = defaultdict(int)
+        self.errors: List[Tuple[int, str]] = []
+
+    @property
+    def total_pnl(self) -> float:
+        return sum(self.final_pnl.values())
+
+    def write_csv(self, path: str):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(["day", "timestamp", "product", "position", "profit_and_loss"])
+            for timestamp, product, position, pnl in self.rows:
+                writer.writerow([self.day, timestamp, product, position, pnl])
+
+
+class Backtester:
+    """Replays MarketData through Trader.run and matches the returned orders against the book."""
+
+    def __init__(self, trader, market: MarketData, limits: Optional[Dict[str, int]] = None,
+                 match_trades: str = "all", quiet: bool = True):
+        if match_trades not in ("all", "worse", "none"):
+            raise ValueError(f"match_trades must be 'all', 'worse' or 'none', got {match_trades!r}")
+        self.trader = trader
+        self.market = market
+        self.limits = get_position_limits(trader)
+        if limits:
+            self.limits.update(limits)
+        self.match_trades = match_trades
+        self.quiet = quiet
+
+        self.position: Dict[str, int] = {}
+        self.cash: Dict[str, float] = defaultdict(float)
+        self.trader_data = ""
+        self.listings = {product: Listing(product, product, "SEASHELLS") for product in market.products}
+
+    def limit(self, product: str) -> int:
+        return self.limits.get(product, DEFAULT_POSITION_LIMIT)
+
+    def run(self) -> BacktestResult:
+        result = BacktestResult(self.market.day)
+        own_trades: Dict[str, List[Trade]] = {}
+        market_trades: Dict[str, List[Trade]] = {}
+        last_mid: Dict[str, float] = {}
+
+        for timestamp in self.market.timestamps:
+            order_depths = self.market.order_depths(timestamp)
+            observations = Observation({}, self.market.conversion_observations(timestamp))
+            state = TradingState(
+                self.trader_data, timestamp, self.listings, order_depths,
+                own_trades, market_trades, dict(self.position), observations
+            )
+
+            try:
+                if self.quiet:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        orders, conversions, trader_data = self.trader.run(state)
+                else:
+                    orders, conversions, trader_data = self.trader.run(state)
+            except Exception as e:
+                result.errors.append((timestamp, repr(e)))
+                orders, conversions, trader_data = {}, 0, self.trader_data
+
+            self.trader_data = trader_data if trader_data is not None else ""
+            self.convert(conversions or 0, observations)
+
+            own_trades, market_trades = self.match(timestamp, orders or {}, result)
+
+            for product in self.market.products:
+                mid = self.market.mid_price(timestamp, product)
+                if mid is not None:
+                    last_mid[product] = mid
+                position = self.position.get(product, 0)
+                pnl = self.cash[product] + position * last_mid.get(product, 0)
+                result.rows.append((timestamp, product, position, pnl))
+                result.final_pnl[product] = pnl
+
+        result.final_position = dict(self.position)
+        return result
+
+    def convert(self, conversions: int, observations: Observation):
+        """Apply a conversion request against the first product that has a conversion observation"""
+        if conversions == 0:
+            return
+        for product, observation in observations.conversionObservations.items():
+            position = self.position.get(product, 0)
+            # Conversions can only reduce an open position
+            if position == 0 or (position > 0) == (conversions > 0) or abs(conversions) > abs(position):
+                continue
+            if conversions > 0:
+                price = observation.askPrice + observation.transportFees + observation.importTariff
+            else:
+                price = observation.bidPrice - observation.transportFees - observation.exportTariff
+            self.position[product] = position + conversions
+            self.cash[product] -= conversions * price
+            return
+
+    def match(self, timestamp: int, orders: Dict[str, List[Order]], result: BacktestResult):
+        own_trades: Dict[str, List[Trade]] = defaultdict(list)
+        leftover_trades: Dict[str, List[Trade]] = defaultdict(list)
+        remaining_trades: Dict[str, List[List]] = defaultdict(list)
+        for trade in self.market.market_trades(timestamp):
+            remaining_trades[trade.symbol].append([trade, trade.quantity])
+
+        books = {
+            product: (order_depth.buy_orders, order_depth.sell_orders)
+            for product, order_depth in self.market.order_depths(timestamp).items()
+        }
+
+        for product, product_orders in orders.items():
+            if not product_orders or product not in books:
+                continue
+            position = self.position.get(product, 0)
+            limit = self.limit(product)
+            total_buy = sum(order.quantity for order in product_orders if order.quantity > 0)
+            total_sell = sum(-order.quantity for order in product_orders if order.quantity < 0)
+            # The exchange rejects every order for a product if they could breach the limit together
+            if position + total_buy > limit or position - total_sell < -limit:
+                result.rejected_ticks[product] += 1
+                continue
+
+            buy_orders, sell_orders = books[product]
+            for order in product_orders:
+                if order.quantity > 0:
+                    self.fill_buy(order, sell_orders, remaining_trades[product], own_trades, timestamp)
+                elif order.quantity < 0:
+                    self.fill_sell(order, buy_orders, remaining_trades[product], own_trades, timestamp)
+
+        for product, trades in remaining_trades.items():
+            for trade, quantity in trades:
+                if quantity > 0:
+                    leftover_trades[product].append(
+                        Trade(trade.symbol, trade.price, quantity, trade.buyer, trade.seller, timestamp)
+                    )
+        return dict(own_trades), dict(leftover_trades)
+
+    def record_fill(self, product: str, price: int, quantity: int, own_trades, timestamp: int):
+        self.position[product] = self.position.get(product, 0) + quantity
+        self.cash[product] -= price * quantity
+        if quantity > 0:
+            own_trades[product].append(Trade(product, price, quantity, SUBMISSION, "", timestamp))
+        else:
+            own_trades[product].append(Trade(product, price, -quantity, "", SUBMISSION, timestamp))
+
+    def fill_buy(self, order: Order, sell_orders: Dict[int, int], trades: List[List], own_trades, timestamp: int):
+        remaining = order.quantity
+        for price in sorted(sell_orders.keys()):
+            if price > order.price or remaining == 0:
+                break
+            quantity = min(remaining, -sell_orders[price])
+            self.record_fill(order.symbol, price, quantity, own_trades, timestamp)
+            remaining -= quantity
+            sell_orders[price] += quantity
+            if sell_orders[price] == 0:
+                del sell_orders[price]
+
+        if self.match_trades == "none":
+            return
+        for trade in trades:
+            if remaining == 0:
+                break
+            price = trade[0].price
+            if price > order.price or (self.match_trades == "worse" and price == order.price):
+                continue
+            quantity = min(remaining, trade[1])
+            if quantity > 0:
+                self.record_fill(order.symbol, order.price, quantity, own_trades, timestamp)
+                remaining -= quantity
+                trade[1] -= quantity
+
+    def fill_sell(self, order: Order, buy_orders: Dict[int, int], trades: List[List], own_trades, timestamp: int):
+        remaining = -order.quantity
+        for price in sorted(buy_orders.keys(), reverse=True):
+            if price < order.price or remaining == 0:
+                break
+            quantity = min(remaining, buy_orders[price])
+            self.record_fill(order.symbol, price, -quantity, own_trades, timestamp)
+            remaining -= quantity
+            buy_orders[price] -= quantity
+            if buy_orders[price] == 0:
+                del buy_orders[price]
+
+        if self.match_trades == "none":
+            return
+        for trade in trades:
+            if remaining == 0:
+                break
+            price = trade[0].price
+            if price < order.price or (self.match_trades == "worse" and price == order.price):
+                continue
+            quantity = min(remaining, trade[1])
+            if quantity > 0:
+                self.record_fill(order.symbol, order.price, -quantity, own_trades, timestamp)
+                remaining -= quantity
+                trade[1] -= quantity
+
+
+def run_backtest(trader, market: MarketData, limits: Optional[Dict[str, int]] = None,
+                 match_trades: str = "all", quiet: bool = True) -> BacktestResult:
+    return Backtester(trader, market, limits, match_trades, quiet).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay historical prosperity data through a Trader")
+    parser.add_argument("trader", help="trader module name, e.g. trader_round3")
+    parser.add_argument("data_dir", help="directory with prices_/trades_/observations_ csv files")
+    parser.add_argument("round", type=int)
+    parser.add_argument("--days", type=int, nargs="+", default=[0])
+    parser.add_argument("--match-trades", choices=["all", "worse", "none"], default="all")
+    parser.add_argument("--verbose", action="store_true", help="show the trader's own prints")
+    parser.add_argument("--out", help="write the per-tick position/pnl series to this csv")
+    args = parser.parse_args()
+
+    for day in args.days:
+        market = load_market_data(args.data_dir, args.round, day)
+        result = run_backtest(load_trader(args.trader), market, match_trades=args.match_trades, quiet=not args.verbose)
+        print(f"Round {args.round} day {day}: {len(market.timestamps)} ticks")
+        for product, pnl in sorted(result.final_pnl.items()):
+            print(f"  {product}: {pnl:,.1f} (position {result.final_position.get(product, 0)}, "
+                  f"rejected ticks {result.rejected_ticks.get(product, 0)})")
+        print(f"  Total: {result.total_pnl:,.1f}")
+        for timestamp, error in result.errors[:5]:
+            print(f"  error at {timestamp}: {error}")
+        if args.out:
+            result.write_csv(args.out if len(args.days) == 1 else args.out.replace(".csv", f"_day_{day}.csv"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from datamodel import OrderDepth, Levels
+from typing import Dict, List, NamedTuple, Optional
+import numpy as np
+
+
+class ComponentQuotes(NamedTuple):
+    """Top of book per component, in BasketBook.components order; NaN price / 0 volume for an empty side"""
+    bid: np.ndarray
+    bid_volume: np.ndarray
+    ask: np.ndarray
+    ask_volume: np.ndarray  # positive
+
+
+class ImpliedQuotes(NamedTuple):
+    """Synthetic top of book per basket, in BasketBook.baskets order; NaN price / 0 volume when a component side is empty"""
+    bid: np.ndarray
+    bid_volume: np.ndarray
+    ask: np.ndarray
+    ask_volume: np.ndarray
+
+
+class BasketBook:
+    """Prices any set of baskets against their components through one composition matrix.
+
+    `composition` maps basket -> {component: units}; baskets may share components (PICNIC_BASKET1
+    and PICNIC_BASKET2 both hold CROISSANTS and JAMS). weights[b, c] is the number of units of
+    component c in basket b, so implied quotes for every basket are one matrix-vector product and
+    executable volume is a row-wise minimum of component volume // weight.
+    """
+
+    def __init__(self, composition: Dict[str, Dict[str, int]]):
+        self.baskets: List[str] = list(composition)
+        self.components: List[str] = []
+        for units in composition.values():
+            self.components.extend(component for component in units if component not in self.components)
+        self.weights = np.zeros((len(self.baskets), len(self.components)), dtype=np.int64)
+        for b, units in enumerate(composition.values()):
+            for component, quantity in units.items():
+                self.weights[b, self.components.index(component)] = quantity
+        self.uses = self.weights > 0
+        # Divisor for the volume // weight step with unused components mapped to 1
+        self._divisor = np.where(self.uses, self.weights, 1)
+
+    def index(self, basket: str) -> int:
+        return self.baskets.index(basket)
+
+    def component_quotes(self, order_depths: Dict[str, OrderDepth]) -> ComponentQuotes:
+        n = len(self.components)
+        bid, ask = np.full(n, np.nan), np.full(n, np.nan)
+        bid_volume, ask_volume = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64)
+        for c, component in enumerate(self.components):
+            depth = order_depths.get(component)
+            if depth is None:
+                continue
+            if depth.buy_orders:
+                bid[c], bid_volume[c] = depth.best_bid, depth.best_bid_volume
+            if depth.sell_orders:
+                ask[c], ask_volume[c] = depth.best_ask, -depth.best_ask_volume
+        return ComponentQuotes(bid, bid_volume, ask, ask_volume)
+
+    def combine(self, prices: np.ndarray) -> np.ndarray:
+        """weights @ prices, NaN for any basket using a component whose price is NaN"""
+        missing = self.uses & np.isnan(prices)
+        combined = self.weights @ np.nan_to_num(prices)
+        return np.where(missing.any(axis=1), np.nan, combined)
+
+    def executable_volume(self, volumes: np.ndarray) -> np.ndarray:
+        """Whole baskets the component volumes can fill, per basket"""
+        per_component = np.where(self.uses, volumes // self._divisor, np.iinfo(np.int64).max)
+        return per_component.min(axis=1)
+
+    def implied(self, order_depths: Dict[str, OrderDepth]) -> ImpliedQuotes:
+        """Synthetic best bid/ask and executable volume for every basket at once"""
+        quotes = self.component_quotes(order_depths)
+        bid, ask = self.combine(quotes.bid), self.combine(quotes.ask)
+        bid_volume = np.where(np.isnan(bid), 0, self.executable_volume(quotes.bid_volume))
+        ask_volume = np.where(np.isnan(ask), 0, self.executable_volume(quotes.ask_volume))
+        return ImpliedQuotes(bid, bid_volume, ask, ask_volume)
+
+    def ladder(self, order_depths: Dict[str, OrderDepth], basket: str, side: str) -> Levels:
+        """Every level of one basket's synthetic book on `side` ("bid" or "ask"), best first.
+
+        Component c's cost of its first u units, F_c(u), is piecewise linear in u with knots at its
+        cumulative level volumes, so np.interp evaluates it at u = k * w_c for every basket count k
+        at once. Basket k then trades at sum_c F_c(k w_c) - F_c((k-1) w_c), which includes the
+        blended price of a basket whose units straddle two component levels. Runs of equal basket
+        prices merge into one synthetic level.
+        """
+        b = self.index(basket)
+        used = [(self.components[c], int(self.weights[b, c])) for c in np.flatnonzero(self.uses[b])]
+        component_levels = []
+        for component, weight in used:
+            depth = order_depths.get(component)
+            if depth is None:
+                return _EMPTY
+            levels = depth.bids if side == "bid" else depth.asks
+            if not levels.prices:
+                return _EMPTY
+            component_levels.append((levels, weight))
+        count = min(levels.cumulative[-1] // weight for levels, weight in component_levels)
+        if count == 0:
+            return _EMPTY
+
+        basket_prices = np.zeros(count)
+        for levels, weight in component_levels:
+            prices = np.asarray(levels.prices, dtype=float)
+            volumes = np.abs(np.asarray(levels.volumes, dtype=float))
+            units = np.concatenate(([0.0], levels.cumulative))
+            cost = np.concatenate(([0.0], np.cumsum(prices * volumes)))
+            basket_prices += np.diff(np.interp(np.arange(count + 1) * weight, units, cost))
+        basket_prices = np.rint(basket_prices).astype(np.int64)
+
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(basket_prices)) + 1))
+        volumes = np.diff(np.append(starts, count))
+        cumulative = np.cumsum(volumes)
+        if side == "ask":
+            volumes = -volumes
+        return Levels(tuple(basket_prices[starts].tolist()), tuple(volumes.tolist()), tuple(cumulative.tolist()))
+
+    def synthetic_order_depth(self, order_depths: Dict[str, OrderDepth], basket: str) -> OrderDepth:
+        """One basket's full synthetic book as an OrderDepth"""
+        depth = OrderDepth()
+        for side, orders in (("bid", depth.buy_orders), ("ask", depth.sell_orders)):
+            levels = self.ladder(order_depths, basket, side)
+            orders.update(zip(levels.prices, levels.volumes))
+        return depth
+
+
+_EMPTY = Levels((), (), ())
+
+
+def sweep_price(levels: Levels, quantity: int) -> Optional[int]:
+    """Limit price that reaches `quantity` units into a ladder (its last price if the ladder is shallower)"""
+    if not levels.prices:
+        return None
+    for price, cumulative in zip(levels.prices, levels.cumulative):
+        if cumulative >= quantity:
+            return price
+    return levels.prices[-1]
@@ -0,0 +1,106 @@
+from datamodel import OrderDepth, Order, ConversionObservation
+from typing import Dict, List, Optional, Tuple
+from bisect import bisect_left
+
+
+class ConversionPlanner:
+    """Cross-exchange arbitrage for a product with conversion observations (ORCHIDS, MAGNIFICENT_MACARONS).
+
+    A long bought locally is sold abroad by converting at bidPrice - exportTariff - transportFees; a
+    short is covered at askPrice + importTariff + transportFees. At most `conversion_limit` units
+    convert per tick (None for no cap), so the k-th unit queued for conversion waits ceil(k / cap)
+    ticks and a long pays `storage_cost` per unit per tick until then. The storage each queue slot
+    pays is tabled once; only slots that convert within `horizon` ticks are traded, so a tick costs
+    one pass over the book with a bisect per level.
+
+    Taking is held back by the expected edge of quoting instead: `make_probability` times the
+    margin of an ask `make_offset` ticks inside the foreign ask.
+    """
+
+    def __init__(self, symbol: str, position_limit: int, conversion_limit: Optional[int] = None,
+                 storage_cost: float = 0.0, horizon: int = 1, make_probability: float = 0.0, make_offset: int = 2):
+        self.symbol = symbol
+        self.position_limit = position_limit
+        self.conversion_limit = conversion_limit if conversion_limit is not None else 2 * position_limit
+        self.make_probability = make_probability
+        self.make_offset = make_offset
+        # Queue slots that convert within the horizon, and storage[k] paid by the unit in slot k
+        self.capacity = min(self.conversion_limit * horizon, 2 * position_limit)
+        self.storage = [storage_cost * (k // self.conversion_limit + 1) for k in range(self.capacity)]
+
+    def implied_bid_ask(self, observation: ConversionObservation) -> Tuple[float, float]:
+        """Proceeds of converting a long unit (before storage), and the cost of covering a short one"""
+        return (
+            observation.bidPrice - observation.exportTariff - observation.transportFees,
+            observation.askPrice + observation.importTariff + observation.transportFees,
+        )
+
+    def conversions(self, position: int) -> int:
+        """Conversion request that unwinds as much of `position` as the cap allows"""
+        return -max(-self.conversion_limit, min(self.conversion_limit, position))
+
+    def take(self, order_depth: OrderDepth, observation: ConversionObservation, position: int) -> Tuple[List[Order], int, int]:
+        """Cross local levels that beat conversion, after this tick's conversions; (orders, bought, sold)"""
+        orders: List[Order] = []
+        residual = position + self.conversions(position)
+        implied_bid, implied_ask = self.implied_bid_ask(observation)
+        ask = round(observation.askPrice) - self.make_offset
+        edge = (ask - implied_ask) * self.make_probability if ask > implied_ask else 0
+
+        queued = max(residual, 0)
+        room = min(self.position_limit - residual, self.capacity - queued)
+        buy_volume = 0
+        for price, volume in zip(order_depth.asks.prices, order_depth.asks.volumes):
+            # Units whose storage still leaves them profitable to convert at this price
+            slot = queued + buy_volume
+            fits = bisect_left(self.storage, implied_bid - edge - price, slot, self.capacity) - slot
+            quantity = min(-volume, fits, room - buy_volume)
+            if quantity <= 0:
+                break
+            orders.append(Order(self.symbol, round(price), quantity))
+            buy_volume += quantity
+
+        room = min(self.position_limit + residual, self.capacity - max(-residual, 0))
+        sell_volume = 0
+        for price, volume in zip(order_depth.bids.prices, order_depth.bids.volumes):
+            if price <= implied_ask + edge:
+                break
+            quantity = min(volume, room - sell_volume)
+            if quantity <= 0:
+                break
+            orders.append(Order(self.symbol, round(price), -quantity))
+            sell_volume += quantity
+        return orders, buy_volume, sell_volume
+
+    def make(self, observation: ConversionObservation, position: int, buy_volume: int, sell_volume: int) -> List[Order]:
+        """Quotes for the rest of the room: inside the foreign book where that still beats conversion.
+
+        Bids form a ladder, one price per storage bucket, as later slots wait longer to convert.
+        """
+        residual = position + self.conversions(position)
+        implied_bid, implied_ask = self.implied_bid_ask(observation)
+        aggressive_bid = round(observation.bidPrice) + self.make_offset
+        aggressive_ask = round(observation.askPrice) - self.make_offset
+
+        bids: Dict[int, int] = {}
+        slot = max(residual, 0) + buy_volume
+        end = slot + max(self.position_limit - (residual + buy_volume), 0)
+        while slot < min(end, self.capacity):
+            bucket_end = min((slot // self.conversion_limit + 1) * self.conversion_limit, end, self.capacity)
+            bid_limit = implied_bid - self.storage[slot]
+            price = round(aggressive_bid if aggressive_bid < bid_limit else bid_limit - 1)
+            bids[price] = bids.get(price, 0) + bucket_end - slot
+            slot = bucket_end
+        orders = [Order(self.symbol, price, quantity) for price, quantity in bids.items()]
+
+        if aggressive_ask >= implied_ask + 0.5:
+            ask = aggressive_ask
+        elif aggressive_ask + 1 >= implied_ask + 0.5:
+            ask = aggressive_ask + 1
+        else:
+            ask = implied_ask + 2
+        sell_quantity = min(self.position_limit + (residual - sell_volume),
+                            self.capacity - (max(-residual, 0) + sell_volume))
+        if sell_quantity > 0:
+            orders.append(Order(self.symbol, round(ask), -sell_quantity))
+        return orders
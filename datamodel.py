@@ -1,5 +1,6 @@
 import json
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from itertools import accumulate
 from json import JSONEncoder
 
 
@@ -12,6 +13,7 @@ ObservationValue = int
 
 
 class Listing:
+    __slots__ = ("symbol", "product", "denomination")
 
     def __init__(self, symbol: Symbol, product: Product, denomination: Product):
         self.symbol = symbol
@@ -20,6 +22,7 @@ class Listing:
 
 
 class ConversionObservation:
+    __slots__ = ("bidPrice", "askPrice", "transportFees", "exportTariff", "importTariff", "sugarPrice", "sunlightIndex")
 
     def __init__(self, bidPrice: float, askPrice: float, transportFees: float, exportTariff: float, importTariff: float,
                  sugarPrice: float, sunlightIndex: float):
@@ -33,6 +36,7 @@ class ConversionObservation:
 
 
 class Observation:
+    __slots__ = ("plainValueObservations", "conversionObservations")
 
     def __init__(self, plainValueObservations: Dict[Product, ObservationValue],
                  conversionObservations: Dict[Product, ConversionObservation]) -> None:
@@ -40,12 +44,13 @@ class Observation:
         self.conversionObservations = conversionObservations
 
     def __str__(self) -> str:
-        return "(plainValueObservations: " + jsonpickle.encode(
-            self.plainValueObservations) + ", conversionObservations: " + jsonpickle.encode(
-            self.conversionObservations) + ")"
+        return "(plainValueObservations: " + json.dumps(
+            self.plainValueObservations, cls=ProsperityEncoder) + ", conversionObservations: " + json.dumps(
+            self.conversionObservations, cls=ProsperityEncoder) + ")"
 
 
 class Order:
+    __slots__ = ("symbol", "price", "quantity")
 
     def __init__(self, symbol: Symbol, price: int, quantity: int) -> None:
         self.symbol = symbol
@@ -59,14 +64,129 @@ class Order:
         return "(" + self.symbol + ", " + str(self.price) + ", " + str(self.quantity) + ")"
 
 
-class OrderDepth:
+class Levels(NamedTuple):
+    """One side of a book sorted best price first"""
+    prices: Tuple[int, ...]
+    volumes: Tuple[int, ...]  # signed as in the dict, so ask volumes are negative
+    cumulative: Tuple[int, ...]  # absolute volume available at this price or better
+
+
+_EMPTY_LEVELS = Levels((), (), ())
+
+
+class BookSide(dict):
+    """price -> volume dict that caches its sorted Levels and drops the cache on every mutation"""
+
+    __slots__ = ("descending", "_levels")
+
+    def __init__(self, orders=(), descending: bool = False):
+        super().__init__(orders)
+        self.descending = descending
+        self._levels: Optional[Levels] = None
+
+    # pickle / jsonpickle restore dict subclasses without __init__, so the slots travel in the state.
+    # Levels are kept as (price, volume) pairs, as JSON object keys would turn the prices into strings.
+    def __getstate__(self):
+        return self.descending, tuple(self.items())
+
+    def __setstate__(self, state):
+        self.descending, orders = state
+        self._levels = None
+        super().clear()
+        super().update(orders)
+
+    def levels(self) -> Levels:
+        if self._levels is None:
+            if not self:
+                self._levels = _EMPTY_LEVELS
+            else:
+                prices = tuple(sorted(self, reverse=self.descending))
+                volumes = tuple([self[price] for price in prices])
+                self._levels = Levels(prices, volumes, tuple(accumulate(abs(volume) for volume in volumes)))
+        return self._levels
+
+    def __setitem__(self, price, volume):
+        self._levels = None
+        super().__setitem__(price, volume)
+
+    def __delitem__(self, price):
+        self._levels = None
+        super().__delitem__(price)
 
-    def __init__(self, buy_orders, sell_orders):
-        self.buy_orders: Dict[int, int] = buy_orders
-        self.sell_orders: Dict[int, int] = sell_orders
+    def pop(self, *args):
+        self._levels = None
+        return super().pop(*args)
+
+    def popitem(self):
+        self._levels = None
+        return super().popitem()
+
+    def setdefault(self, price, volume=None):
+        self._levels = None
+        return super().setdefault(price, volume)
+
+    def update(self, *args, **kwargs):
+        self._levels = None
+        super().update(*args, **kwargs)
+
+    def clear(self):
+        self._levels = None
+        super().clear()
+
+    def __ior__(self, other):
+        self._levels = None
+        return super().__ior__(other)
+
+
+class OrderDepth:
+    __slots__ = ("buy_orders", "sell_orders")
+
+    def __init__(self, buy_orders=None, sell_orders=None):
+        self.buy_orders: Dict[int, int] = BookSide(buy_orders or (), descending=True)
+        self.sell_orders: Dict[int, int] = BookSide(sell_orders or ())
+
+    def _side(self, name: str, descending: bool) -> BookSide:
+        orders = getattr(self, name)
+        if type(orders) is not BookSide:
+            # A plain dict was assigned after construction, adopt it so its levels can be cached too
+            orders = BookSide(orders, descending)
+            setattr(self, name, orders)
+        return orders
+
+    @property
+    def bids(self) -> Levels:
+        """Cached bid levels, highest price first"""
+        return self._side("buy_orders", True).levels()
+
+    @property
+    def asks(self) -> Levels:
+        """Cached ask levels, lowest price first"""
+        return self._side("sell_orders", False).levels()
+
+    @property
+    def best_bid(self) -> Optional[int]:
+        prices = self.bids.prices
+        return prices[0] if prices else None
+
+    @property
+    def best_ask(self) -> Optional[int]:
+        prices = self.asks.prices
+        return prices[0] if prices else None
+
+    @property
+    def best_bid_volume(self) -> int:
+        volumes = self.bids.volumes
+        return volumes[0] if volumes else 0
+
+    @property
+    def best_ask_volume(self) -> int:
+        """Volume at the best ask, negative like sell_orders"""
+        volumes = self.asks.volumes
+        return volumes[0] if volumes else 0
 
 
 class Trade:
+    __slots__ = ("symbol", "price", "quantity", "buyer", "seller", "timestamp")
 
     def __init__(self, symbol: Symbol, price: int, quantity: int, buyer: UserId = None, seller: UserId = None,
                  timestamp: int = 0) -> None:
@@ -107,10 +227,23 @@ class TradingState(object):
         self.observations = observations
 
     def toJSON(self):
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True)
+        return json.dumps(self, default=to_dict, sort_keys=True)
+
+
+_SLOTS: Dict[type, Tuple[str, ...]] = {}
+
+
+def to_dict(o) -> dict:
+    """JSON view of a datamodel object: its slots in declaration order, or its __dict__"""
+    fields = _SLOTS.get(type(o))
+    if fields is None:
+        fields = _SLOTS[type(o)] = getattr(type(o), "__slots__", None) or ()
+    if not fields:
+        return o.__dict__
+    return {name: getattr(o, name) for name in fields}
 
 
 class ProsperityEncoder(JSONEncoder):
 
     def default(self, o):
-        return o.__dict__
\ No newline at end of file
+        return to_dict(o)
\ No newline at end of file
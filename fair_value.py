@@ -0,0 +1,87 @@
+from datamodel import OrderDepth, Levels, Trade
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+
+class FairValues(NamedTuple):
+    """Fair value estimates off one book; see FairValueEstimator"""
+    mid: float
+    mm_mid: Optional[float]  # None when either side has no level of at least adverse_volume
+    microprice: float
+    size_weighted_mid: float
+    vwap: float
+    imbalance: float  # (bid_volume - ask_volume) / (bid_volume + ask_volume) at the top level
+
+    def mm_mid_or(self, default: Optional[float]) -> Optional[float]:
+        return self.mm_mid if self.mm_mid is not None else default
+
+
+class FairValueEstimator:
+    """Book-based fair values for any product, from one pass over each side's cached levels.
+
+    - mid: halfway between the best bid and ask
+    - mm_mid: halfway between the best bid and ask of at least `adverse_volume` units, i.e. the
+      market maker's quotes once small orders stepping inside them are ignored
+    - microprice: top-of-book mid weighted towards the side with less volume,
+      (bid * ask_volume + ask * bid_volume) / (bid_volume + ask_volume)
+    - size_weighted_mid: the microprice over the top `depth` levels, each side's VWAP weighted by
+      the other side's total volume
+    - vwap: volume-weighted price of the top `depth` levels of both sides
+    - imbalance: top-of-book volume imbalance in [-1, 1], positive when bids outweigh asks
+
+    `depth` of None uses every level. Levels with zero volume are ignored throughout.
+    """
+
+    def __init__(self, adverse_volume: int = 0, depth: Optional[int] = None):
+        self.adverse_volume = adverse_volume
+        self.depth = depth
+
+    def _side(self, levels: Levels) -> Tuple[Optional[int], int, Optional[int], int, int]:
+        """(best price and its volume, first price with at least adverse_volume, volume and volume * price
+        of the top depth levels); levels with no volume are skipped as they cannot be traded"""
+        best_price = mm_price = None
+        best_volume = volume = value = 0
+        depth = len(levels.prices) if self.depth is None else self.depth
+        i = 0
+        for price, level_volume in zip(levels.prices, levels.volumes):
+            level_volume = abs(level_volume)
+            if level_volume == 0:
+                continue
+            if best_price is None:
+                best_price, best_volume = price, level_volume
+            if mm_price is None and level_volume >= self.adverse_volume:
+                mm_price = price
+            if i < depth:
+                volume += level_volume
+                value += price * level_volume
+            elif mm_price is not None:
+                break
+            i += 1
+        return best_price, best_volume, mm_price, volume, value
+
+    def estimate(self, order_depth: OrderDepth) -> Optional[FairValues]:
+        """All estimates for the book, None if either side has no level with volume"""
+        best_bid, best_bid_volume, mm_bid, bid_volume, bid_value = self._side(order_depth.bids)
+        if best_bid is None:
+            return None
+        best_ask, best_ask_volume, mm_ask, ask_volume, ask_value = self._side(order_depth.asks)
+        if best_ask is None:
+            return None
+        return FairValues(
+            mid=(best_bid + best_ask) / 2,
+            mm_mid=(mm_bid + mm_ask) / 2 if mm_bid is not None and mm_ask is not None else None,
+            microprice=(best_bid * best_ask_volume + best_ask * best_bid_volume) / (best_bid_volume + best_ask_volume),
+            size_weighted_mid=(bid_value / bid_volume * ask_volume + ask_value / ask_volume * bid_volume) / (bid_volume + ask_volume),
+            vwap=(bid_value + ask_value) / (bid_volume + ask_volume),
+            imbalance=(best_bid_volume - best_ask_volume) / (best_bid_volume + best_ask_volume),
+        )
+
+
+def trade_flow(trades: Iterable[Trade], mid: float) -> int:
+    """Signed volume of market trades: above the mid counts as buying, below as selling"""
+    flow = 0
+    for trade in trades:
+        if trade.price > mid:
+            flow += trade.quantity
+        elif trade.price < mid:
+            flow -= trade.quantity
+    return flow
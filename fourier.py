@@ -0,0 +1,107 @@
+from ring_buffer import RingBuffer
+from typing import Optional, Sequence
+import numpy as np
+
+
+class FourierForecaster:
+    """mean + sum_k a_k cos(2 pi f_k (x - origin)) + b_k sin(2 pi f_k (x - origin)).
+
+    The terms are kept as one complex coefficient c_k = a_k - i b_k per frequency, so a forecast is
+    Re(exp(i omega x) @ c): one exp and one dot product however many terms there are. x may be a
+    scalar or an array of indices.
+    """
+
+    def __init__(self, frequencies: Sequence[float], cos_coefs: Sequence[float], sin_coefs: Sequence[float],
+                 mean: float = 0.0, origin: float = 0.0):
+        self.frequencies = np.asarray(frequencies, dtype=float)
+        self.omega = 2 * np.pi * self.frequencies
+        self.coefs = np.asarray(cos_coefs, dtype=float) - 1j * np.asarray(sin_coefs, dtype=float)
+        self.mean = mean
+        self.origin = origin
+
+    @property
+    def cos_coefs(self) -> np.ndarray:
+        return self.coefs.real
+
+    @property
+    def sin_coefs(self) -> np.ndarray:
+        return -self.coefs.imag
+
+    def __call__(self, x):
+        phase = np.multiply.outer(np.asarray(x, dtype=float) - self.origin, self.omega)
+        return self.mean + (np.exp(1j * phase) @ self.coefs).real
+
+    @classmethod
+    def from_spectrum(cls, spectrum: np.ndarray, bins: np.ndarray, n: int, mean: float, origin: float = 0.0) -> "FourierForecaster":
+        """Forecaster from DFT values `spectrum` at `bins` of an n-sample window starting at `origin`"""
+        bins = np.asarray(bins)
+        # A real series is (1/n) sum over +-k, so every bin but DC and Nyquist counts twice
+        scale = np.where((bins == 0) | (2 * bins == n), 1.0, 2.0) / n
+        coefs = scale * spectrum
+        return cls(bins / n, coefs.real, -coefs.imag, mean, origin)
+
+    @classmethod
+    def fit(cls, prices: Sequence[float], n_terms: int, origin: float = 0.0) -> "FourierForecaster":
+        """Keep the n_terms strongest frequencies of the rfft of `prices` (sample 0 at `origin`)"""
+        prices = np.asarray(prices, dtype=float)
+        spectrum = np.fft.rfft(prices)
+        bins = strongest_bins(spectrum, n_terms)
+        return cls.from_spectrum(spectrum[bins], bins, len(prices), spectrum[0].real / len(prices), origin)
+
+
+def strongest_bins(spectrum: np.ndarray, n_terms: int) -> np.ndarray:
+    """Indices of the n_terms largest-magnitude bins of an rfft, DC excluded, in increasing frequency"""
+    magnitude = np.abs(spectrum[1:])
+    n_terms = min(n_terms, len(magnitude))
+    return np.sort(np.argpartition(magnitude, -n_terms)[-n_terms:] + 1)
+
+
+class SlidingDFT:
+    """DFT of the last `window` samples at fixed `bins`, updated in O(len(bins)) per sample.
+
+    X_k <- (X_k + new - oldest) * exp(2 pi i k / window) moves the window one sample along.
+    Rounding drifts slowly under that recurrence, so each time the buffer wraps the bins are
+    recomputed exactly from the samples, like RingBuffer's running sums. Until `window` samples have
+    arrived the missing ones count as zero.
+    """
+
+    def __init__(self, window: int, bins: Sequence[int]):
+        # bins index the rfft of the window, 0 <= k <= window // 2
+        self.window = window
+        self.bins = np.asarray(bins, dtype=np.int64)
+        self.twiddle = np.exp(2j * np.pi * self.bins / window)
+        self.samples = RingBuffer(window)
+        self.spectrum = np.zeros(len(self.bins), dtype=complex)
+        self.total = 0.0
+        self.count = 0  # samples seen, so the window starts at index count - window
+
+    @classmethod
+    def from_prices(cls, prices: Sequence[float], n_terms: int) -> "SlidingDFT":
+        """Track the n_terms strongest frequencies of `prices`, starting from those prices"""
+        prices = np.asarray(prices, dtype=float)
+        sliding = cls(len(prices), strongest_bins(np.fft.rfft(prices), n_terms))
+        for price in prices:
+            sliding.update(price)
+        return sliding
+
+    def update(self, value: float):
+        oldest = self.samples.window()[0] if self.samples.full else 0.0
+        self.samples.append(value)
+        self.count += 1
+        if self.count % self.window == 0:
+            self._resync()
+        else:
+            self.spectrum = (self.spectrum + (value - oldest)) * self.twiddle
+            self.total += value - oldest
+
+    def _resync(self):
+        samples = self.samples.window()
+        self.spectrum = np.fft.rfft(samples)[self.bins]
+        self.total = float(samples.sum())
+
+    def forecaster(self) -> Optional[FourierForecaster]:
+        """Fit over the current window, indexed by sample count (the first sample is x = 0)"""
+        if not self.samples.full:
+            return None
+        return FourierForecaster.from_spectrum(self.spectrum, self.bins, self.window, self.total / self.window,
+                                               origin=self.count - self.window)
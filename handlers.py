@@ -0,0 +1,76 @@
+from datamodel import TradingState, Order
+from trader_codec import Schema
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class _Entry:
+    __slots__ = ("name", "handler", "symbols", "observations", "state", "setup", "ready")
+
+    def __init__(self, name, handler, symbols, observations, state, setup):
+        self.name = name
+        self.handler = handler
+        self.symbols = tuple(symbols)
+        self.observations = tuple(observations)
+        self.state = state
+        self.setup = setup
+        self.ready = setup is None
+
+
+class HandlerRegistry:
+    """Maps product symbols to the strategies that trade them.
+
+    Each handler declares the symbols whose books it needs, the conversion observations it reads
+    and the traderData fields it keeps. A handler runs only on ticks where all of its symbols and
+    observations are present; its `setup` (building pricers, caches, ...) runs once, the first
+    time that happens, so a trader can register every product of every round and pay nothing
+    for products that are not listed. The traderData schema is the union of the declared fields.
+
+    A handler is called as handler(state, data) with the decoded traderData dict and returns the
+    orders for its first symbol as a list, a {symbol: orders} dict, or (orders, conversions).
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, _Entry] = {}
+
+    def register(self, name: str, handler: Callable[[TradingState, Dict[str, Any]], Any], symbols: Sequence[str],
+                 observations: Sequence[str] = (), state: Optional[Dict[str, Any]] = None,
+                 setup: Optional[Callable[[], None]] = None):
+        if name in self.entries:
+            raise ValueError(f"Handler {name} is already registered")
+        self.entries[name] = _Entry(name, handler, symbols, observations, state or {}, setup)
+
+    def schema(self) -> Schema:
+        fields = {}
+        for entry in self.entries.values():
+            for field_name, field in entry.state.items():
+                if fields.setdefault(field_name, field) is not field:
+                    raise ValueError(f"traderData field {field_name} is declared by more than one handler")
+        return Schema(**fields)
+
+    def active(self, state: TradingState) -> List[_Entry]:
+        conversion_observations = state.observations.conversionObservations if state.observations else {}
+        return [
+            entry for entry in self.entries.values()
+            if all(symbol in state.order_depths for symbol in entry.symbols)
+            and all(symbol in conversion_observations for symbol in entry.observations)
+        ]
+
+    def run(self, state: TradingState, data: Dict[str, Any]) -> Tuple[Dict[str, List[Order]], int]:
+        """Run every active handler; orders for a symbol from several handlers are concatenated"""
+        result: Dict[str, List[Order]] = {}
+        conversions = 0
+        for entry in self.active(state):
+            if not entry.ready:
+                entry.setup()
+                entry.ready = True
+            output = entry.handler(state, data)
+            if isinstance(output, tuple):
+                output, handler_conversions = output
+                conversions += handler_conversions
+            if output is None:
+                continue
+            if isinstance(output, list):
+                output = {entry.symbols[0]: output}
+            for symbol, orders in output.items():
+                result.setdefault(symbol, []).extend(orders)
+        return result, conversions
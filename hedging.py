@@ -0,0 +1,45 @@
+from datamodel import OrderDepth, Order
+from typing import List, Sequence
+import numpy as np
+
+
+def net_delta(deltas: np.ndarray, positions: Sequence[int]) -> float:
+    """Delta of an option book in units of the underlying: one dot product over the chain"""
+    return float(np.dot(deltas, np.asarray(positions, dtype=float)))
+
+
+class DeltaHedger:
+    """Keeps the underlying position near -(option book delta).
+
+    Nothing is traded while the underlying position is within `band` units of the hedge target,
+    so small delta drift tick to tick does not churn the book. Once outside the band the hedger
+    takes liquidity level by level (best price first) toward the target, never past the
+    position limit and never more than `max_order` units in one tick.
+    """
+
+    def __init__(self, symbol: str, limit: int, band: float, max_order: int = None):
+        self.symbol = symbol
+        self.limit = limit
+        self.band = band
+        self.max_order = max_order
+
+    def target(self, option_delta: float) -> int:
+        return int(np.clip(round(-option_delta), -self.limit, self.limit))
+
+    def orders(self, order_depth: OrderDepth, position: int, option_delta: float) -> List[Order]:
+        needed = self.target(option_delta) - position
+        if abs(needed) <= self.band:
+            return []
+        if self.max_order is not None:
+            needed = int(np.clip(needed, -self.max_order, self.max_order))
+
+        levels = order_depth.asks if needed > 0 else order_depth.bids
+        remaining = abs(needed)
+        orders = []
+        for price, available in zip(levels.prices, levels.volumes):
+            quantity = min(remaining, abs(available))
+            orders.append(Order(self.symbol, price, quantity if needed > 0 else -quantity))
+            remaining -= quantity
+            if remaining == 0:
+                break
+        return orders
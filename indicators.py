@@ -0,0 +1,142 @@
+from typing import Optional, Tuple
+from rolling import RollingWindow
+import struct
+
+# count, ema, ema_fast, ema_slow, signal, prev_close, gain_sum / avg_gain, loss_sum / avg_loss, atr
+_STATE = struct.Struct("<q8d")
+_NAN = float("nan")
+
+
+def _opt(value: float) -> Optional[float]:
+    return None if value != value else value
+
+
+def _nan(value: Optional[float]) -> float:
+    return _NAN if value is None else value
+
+
+class IndicatorEngine:
+    """Technical indicators over a price series, updated in O(1) per value.
+
+    - SMA and Bollinger bands (sma +- band_width * sample std) over the last `period` values
+    - EMA with span `period`, MACD = EMA(fast) - EMA(slow) and its EMA(signal) signal line,
+      all seeded with the first value like pandas ewm(span, adjust=False)
+    - RSI and ATR with Wilder's smoothing: the first `rsi_period` / `atr_period` changes are
+      averaged, after which avg <- avg + (x - avg) / period
+
+    Values are None until enough history has arrived. Bars without a high/low (one price per tick)
+    use the close for both, so the true range is the absolute change in close.
+    """
+
+    def __init__(self, period: int = 10, fast: int = 12, slow: int = 26, signal: int = 9,
+                 rsi_period: int = 14, atr_period: int = 14, band_width: float = 2.0):
+        self.period = period
+        self.fast = fast
+        self.slow = slow
+        self.signal_period = signal
+        self.rsi_period = rsi_period
+        self.atr_period = atr_period
+        self.band_width = band_width
+        self.window = RollingWindow(period)
+        self.count = 0
+        self.ema: Optional[float] = None
+        self.ema_fast: Optional[float] = None
+        self.ema_slow: Optional[float] = None
+        self.signal: Optional[float] = None
+        self.prev_close: Optional[float] = None
+        # Running sums of gains / losses during the RSI warm-up, Wilder averages afterwards
+        self._gain = 0.0
+        self._loss = 0.0
+        # Running sum of true ranges during the ATR warm-up, Wilder average afterwards
+        self._atr = 0.0
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None):
+        high = close if high is None else high
+        low = close if low is None else low
+        self.window.append(close)
+        self.ema = _ema(self.ema, close, self.period)
+        self.ema_fast = _ema(self.ema_fast, close, self.fast)
+        self.ema_slow = _ema(self.ema_slow, close, self.slow)
+        self.signal = _ema(self.signal, self.ema_fast - self.ema_slow, self.signal_period)
+
+        previous = self.prev_close
+        if previous is not None:
+            # self.count changes have been seen once this one is included
+            change = close - previous
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            if self.count <= self.rsi_period:
+                self._gain += gain
+                self._loss += loss
+                if self.count == self.rsi_period:
+                    self._gain /= self.rsi_period
+                    self._loss /= self.rsi_period
+            else:
+                self._gain += (gain - self._gain) / self.rsi_period
+                self._loss += (loss - self._loss) / self.rsi_period
+
+            true_range = max(high - low, abs(high - previous), abs(low - previous))
+            if self.count <= self.atr_period:
+                self._atr += true_range
+                if self.count == self.atr_period:
+                    self._atr /= self.atr_period
+            else:
+                self._atr += (true_range - self._atr) / self.atr_period
+        self.prev_close = close
+        self.count += 1
+
+    @property
+    def sma(self) -> Optional[float]:
+        return self.window.mean if self.window.full else None
+
+    @property
+    def stdev(self) -> Optional[float]:
+        return self.window.stdev if self.window.full else None
+
+    @property
+    def upper_band(self) -> Optional[float]:
+        return self.sma + self.band_width * self.stdev if self.window.full else None
+
+    @property
+    def lower_band(self) -> Optional[float]:
+        return self.sma - self.band_width * self.stdev if self.window.full else None
+
+    @property
+    def macd(self) -> Optional[float]:
+        return self.ema_fast - self.ema_slow if self.count >= self.slow else None
+
+    @property
+    def histogram(self) -> Optional[float]:
+        return self.macd - self.signal if self.count >= self.slow else None
+
+    @property
+    def rsi(self) -> Optional[float]:
+        if self.count <= self.rsi_period:
+            return None
+        if self._loss == 0:
+            return 100.0 if self._gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + self._gain / self._loss)
+
+    @property
+    def atr(self) -> Optional[float]:
+        return self._atr if self.count > self.atr_period else None
+
+    def pack(self, out: bytearray):
+        out += _STATE.pack(self.count, _nan(self.ema), _nan(self.ema_fast), _nan(self.ema_slow), _nan(self.signal),
+                           _nan(self.prev_close), self._gain, self._loss, self._atr)
+        self.window.pack(out)
+
+    @classmethod
+    def unpack(cls, buffer, offset: int, *args, **kwargs) -> Tuple["IndicatorEngine", int]:
+        engine = cls(*args, **kwargs)
+        count, ema, ema_fast, ema_slow, signal, prev_close, engine._gain, engine._loss, engine._atr = \
+            _STATE.unpack_from(buffer, offset)
+        engine.count = count
+        engine.ema, engine.ema_fast, engine.ema_slow = _opt(ema), _opt(ema_fast), _opt(ema_slow)
+        engine.signal, engine.prev_close = _opt(signal), _opt(prev_close)
+        engine.window, offset = RollingWindow.unpack(buffer, offset + _STATE.size, engine.period)
+        return engine, offset
+
+
+def _ema(previous: Optional[float], value: float, span: int) -> float:
+    return value if previous is None else previous + 2.0 / (span + 1) * (value - previous)
+
@@ -0,0 +1,54 @@
+import numpy as np
+import math
+
+# Table range and spacing; beyond +-LIMIT the CDF is 0 or 1 to within 1e-19
+LIMIT = 9.0
+STEP = 1.0 / 2048
+_INV_STEP = 1.0 / STEP
+
+# Linear interpolation error is at most STEP^2 / 8 * max|f''|; for the CDF f'' = -x pdf(x) peaks
+# at x = 1, for the PDF f'' = (x^2 - 1) pdf(x) peaks at x = 0
+CDF_MAX_ERROR = STEP ** 2 / 8 * math.exp(-0.5) / math.sqrt(2 * math.pi)
+PDF_MAX_ERROR = STEP ** 2 / 8 / math.sqrt(2 * math.pi)
+
+GRID = np.linspace(-LIMIT, LIMIT, int(round(2 * LIMIT * _INV_STEP)) + 1)
+CDF_TABLE = 0.5 * (1.0 + np.frompyfunc(math.erf, 1, 1)(GRID / math.sqrt(2)).astype(float))
+PDF_TABLE = np.exp(-0.5 * GRID * GRID) / math.sqrt(2 * math.pi)
+# Per-interval slopes, padded so the entry at +LIMIT can be indexed too
+_CDF_SLOPE = np.append(np.diff(CDF_TABLE), 0.0)
+_PDF_SLOPE = np.append(np.diff(PDF_TABLE), 0.0)
+_LAST = len(GRID) - 1
+_INV_SQRT2 = 1.0 / math.sqrt(2)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2 * math.pi)
+
+
+# Scalars go straight to the C erf/exp: in CPython an interpreted table lookup (~300 ns) is
+# slower than math.erf (~170 ns), and erf is exact. The table pays off on arrays.
+def cdf(x: float) -> float:
+    """Standard normal CDF of a scalar"""
+    return 0.5 * (1.0 + math.erf(x * _INV_SQRT2))
+
+
+def pdf(x: float) -> float:
+    """Standard normal PDF of a scalar"""
+    return _INV_SQRT_2PI * math.exp(-0.5 * x * x)
+
+
+def _lookup(x, table: np.ndarray, slope: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    missing = np.isnan(x)
+    position = (np.clip(np.where(missing, 0.0, x), -LIMIT, LIMIT) + LIMIT) * _INV_STEP
+    i = np.minimum(position.astype(np.intp), _LAST)
+    value = table[i] + (position - i) * slope[i]
+    # NaN stays NaN instead of reading some table entry
+    return np.where(missing, np.nan, value) if missing.any() else value
+
+
+def cdf_array(x) -> np.ndarray:
+    """Standard normal CDF elementwise, within CDF_MAX_ERROR"""
+    return _lookup(x, CDF_TABLE, _CDF_SLOPE)
+
+
+def pdf_array(x) -> np.ndarray:
+    """Standard normal PDF elementwise, within PDF_MAX_ERROR"""
+    return _lookup(x, PDF_TABLE, _PDF_SLOPE)
@@ -0,0 +1,128 @@
+from typing import NamedTuple, Optional, Sequence, Union
+from normal_table import cdf_array, pdf_array
+import numpy as np
+
+# Table lookups within normal_table.CDF_MAX_ERROR / PDF_MAX_ERROR (~1e-8)
+norm_cdf = cdf_array
+norm_pdf = pdf_array
+
+
+class Greeks(NamedTuple):
+    """Per-strike arrays, in the order of OptionChain.strikes"""
+    price: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+
+
+class OptionChain:
+    """Black-Scholes European calls on one underlying, evaluated for every strike in one pass.
+
+    log(K) is cached at construction; sqrt(T), log(S) and the discount factor are computed once
+    per call, so pricing cost is a handful of NumPy ops regardless of how many strikes are listed.
+    sigma may be a scalar or a per-strike array (an implied-vol smile).
+    """
+
+    def __init__(self, strikes: Sequence[float]):
+        self.strikes = np.asarray(strikes, dtype=float)
+        self.log_strikes = np.log(self.strikes)
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+    def d1_d2(self, S: float, T: float, sigma: Union[float, np.ndarray], r: float = 0.0):
+        sigma_sqrt_t = np.asarray(sigma, dtype=float) * np.sqrt(T)
+        d1 = (np.log(S) - self.log_strikes + r * T) / sigma_sqrt_t + 0.5 * sigma_sqrt_t
+        return d1, d1 - sigma_sqrt_t
+
+    def greeks(self, S: float, T: float, sigma: Union[float, np.ndarray], r: float = 0.0) -> Greeks:
+        """Price, delta, gamma and vega (per unit of sigma) for all strikes.
+
+        Expired or degenerate inputs (T <= 0, sigma <= 0, S <= 0) price at intrinsic value with a
+        step delta and zero gamma/vega, strike by strike when sigma is an array.
+        """
+        K = self.strikes
+        sigma = np.broadcast_to(np.asarray(sigma, dtype=float), K.shape)
+        live = (sigma > 0) & (T > 0) & (S > 0)
+        if not live.all():
+            intrinsic = Greeks(np.maximum(S - K, 0.0), (S > K).astype(float), np.zeros_like(K), np.zeros_like(K))
+            if not live.any():
+                return intrinsic
+            sigma = np.where(live, sigma, 1.0)
+
+        sqrt_t = np.sqrt(T)
+        d1, d2 = self.d1_d2(S, T, sigma, r)
+        discounted_k = K * np.exp(-r * T)
+        pdf_d1 = norm_pdf(d1)
+        delta = norm_cdf(d1)
+        greeks = Greeks(
+            price=S * delta - discounted_k * norm_cdf(d2),
+            delta=delta,
+            gamma=pdf_d1 / (S * sigma * sqrt_t),
+            vega=S * pdf_d1 * sqrt_t,
+        )
+        if not live.all():
+            greeks = Greeks(*(np.where(live, value, fallback) for value, fallback in zip(greeks, intrinsic)))
+        return greeks
+
+    def price(self, S: float, T: float, sigma: Union[float, np.ndarray], r: float = 0.0) -> np.ndarray:
+        return self.greeks(S, T, sigma, r).price
+
+    def moneyness(self, S: float, T: float) -> np.ndarray:
+        """log(K / S) / sqrt(T), the smile's x axis"""
+        return (self.log_strikes - np.log(S)) / np.sqrt(T)
+
+    def implied_vol(self, S: float, T: float, prices: np.ndarray, guess: Optional[np.ndarray] = None,
+                    tol: float = 1e-6, max_iter: int = 50) -> np.ndarray:
+        """Implied volatilities for the whole chain at once, NaN where no vol reproduces the price.
+
+        Runs Newton on every strike together, keeping a [low, high] bracket per strike; strikes
+        whose Newton step leaves the bracket (or whose vega vanishes) take a bisection step instead.
+        `guess` (typically last tick's solution) warm-starts the iteration, unsolved strikes start
+        from the Brenner-Subrahmanyam approximation.
+        """
+        prices = np.asarray(prices, dtype=float)
+        K = self.strikes
+        # Outside (intrinsic, S) no volatility reproduces the price
+        valid = np.isfinite(prices) & (prices > np.maximum(S - K, 0.0)) & (prices < S) & (T > 0)
+        ivs = np.full(len(K), np.nan)
+        if not valid.any():
+            return ivs
+
+        low = np.full(len(K), 1e-8)
+        high = np.full(len(K), 5.0 / np.sqrt(T))  # sigma * sqrt(T) = 5 prices any call at S
+        sigma = np.sqrt(2 * np.pi / T) * prices / S
+        if guess is not None:
+            guess = np.asarray(guess, dtype=float)
+            sigma = np.where(np.isfinite(guess) & (guess > 0), guess, sigma)
+        sigma = np.clip(np.where(valid, sigma, 1.0), low * 2, high / 2)
+        target = np.where(valid, prices, 0.0)
+
+        active = valid.copy()
+        for _ in range(max_iter):
+            greeks = self.greeks(S, T, sigma)
+            error = greeks.price - target
+            active &= np.abs(error) > tol
+            if not active.any():
+                break
+            high = np.where(active & (error > 0), sigma, high)
+            low = np.where(active & (error < 0), sigma, low)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton = sigma - error / greeks.vega
+            step = np.where((newton > low) & (newton < high), newton, 0.5 * (low + high))
+            sigma = np.where(active, step, sigma)
+        ivs[valid] = sigma[valid]
+        return ivs
+
+
+def fit_smile(moneyness: np.ndarray, ivs: np.ndarray, weights: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+    """Least-squares quadratic iv = a m^2 + b m + c over the solved strikes (np.polyval order), None under 3 points"""
+    solved = np.isfinite(ivs)
+    if solved.sum() < 3:
+        return None
+    w = None if weights is None else np.asarray(weights, dtype=float)[solved]
+    return np.polyfit(np.asarray(moneyness)[solved], ivs[solved], 2, w=w)
+
+
+def smile_vol(coefficients: np.ndarray, moneyness: np.ndarray) -> np.ndarray:
+    return np.polyval(coefficients, moneyness)
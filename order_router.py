@@ -0,0 +1,56 @@
+from datamodel import Order
+from typing import Dict, List, Optional
+
+
+def merge(orders: List[Order]) -> List[Order]:
+    """One order per price, in order of first appearance; buys and sells at the same price net out"""
+    quantities: Dict[int, int] = {}
+    for order in orders:
+        quantities[order.price] = quantities.get(order.price, 0) + order.quantity
+    if not orders:
+        return []
+    symbol = orders[0].symbol
+    return [Order(symbol, price, quantity) for price, quantity in quantities.items() if quantity != 0]
+
+
+def clip_to_limit(orders: List[Order], position: int, limit: int) -> List[Order]:
+    """Trim orders, earliest first, so total buys and total sells each fit the position limit.
+
+    The exchange rejects every order for a product when position + all buys > limit or
+    position - all sells < -limit, so buy and sell room are consumed separately; orders past the
+    room are shrunk or dropped rather than costing the whole batch.
+    """
+    buy_room = max(limit - position, 0)
+    sell_room = max(limit + position, 0)
+    clipped = []
+    for order in orders:
+        quantity = order.quantity
+        if quantity > 0:
+            quantity = min(quantity, buy_room)
+            buy_room -= quantity
+        elif quantity < 0:
+            quantity = -min(-quantity, sell_room)
+            sell_room += quantity
+        if quantity == order.quantity:
+            clipped.append(order)
+        elif quantity != 0:
+            clipped.append(Order(order.symbol, order.price, quantity))
+    return clipped
+
+
+def route(orders: Dict[str, List[Order]], positions: Dict[str, int], limits: Dict[str, int],
+          default_limit: Optional[int] = None) -> Dict[str, List[Order]]:
+    """Final stage of Trader.run: merge, net and clip every product's orders to its limit.
+
+    Products without a limit (and no default_limit) pass through merged but unclipped.
+    Products left with no orders are dropped.
+    """
+    routed = {}
+    for product, product_orders in orders.items():
+        merged = merge(product_orders)
+        limit = limits.get(product, default_limit)
+        if limit is not None:
+            merged = clip_to_limit(merged, positions.get(product, 0), limit)
+        if merged:
+            routed[product] = merged
+    return routed
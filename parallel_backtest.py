@@ -0,0 +1,170 @@
+from backtester import MarketData, run_backtest
+from tick_store import open_market_data
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple, Any
+import contextlib
+import importlib
+import inspect
+import argparse
+import copy
+import json
+import csv
+import os
+
+# Per-worker cache so each process loads (or maps) a day's market data once
+_MARKET_CACHE: Dict[Tuple[str, int, int], MarketData] = {}
+_DATA_DIR: Optional[str] = None
+
+
+class BacktestJob:
+    """One (trader module, day, params) backtest."""
+
+    def __init__(self, job_id: int, trader: str, round_num: int, day: int, params: Optional[dict] = None, label: str = ""):
+        self.job_id = job_id
+        self.trader = trader
+        self.round_num = round_num
+        self.day = day
+        self.params = params
+        self.label = label or (json.dumps(params, sort_keys=True) if params else "default")
+
+
+def merge_params(base: dict, overrides: dict) -> dict:
+    """Deep-merge {product: {key: value}} overrides onto a copy of a PARAMS dict"""
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_params(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+@contextlib.contextmanager
+def trader_with_params(module_name: str, params: Optional[dict] = None):
+    """Build a module's Trader with PARAMS overrides, whether it takes params= or reads the module global"""
+    module = importlib.import_module(module_name)
+    if not params:
+        yield module.Trader()
+        return
+
+    base = getattr(module, "PARAMS", {})
+    merged = merge_params(base, params)
+    if "params" in inspect.signature(module.Trader.__init__).parameters:
+        yield module.Trader(params=merged)
+        return
+
+    # Trader reads the module level PARAMS directly (trader_round2), swap it for the job
+    module.PARAMS = merged
+    try:
+        yield module.Trader()
+    finally:
+        module.PARAMS = base
+
+
+def _init_worker(data_dir: str):
+    global _DATA_DIR
+    _DATA_DIR = data_dir
+    _MARKET_CACHE.clear()
+
+
+def get_market_data(round_num: int, day: int) -> MarketData:
+    key = (_DATA_DIR, round_num, day)
+    if key not in _MARKET_CACHE:
+        _MARKET_CACHE[key] = open_market_data(_DATA_DIR, round_num, day)
+    return _MARKET_CACHE[key]
+
+
+def _run_job(job: BacktestJob):
+    market = get_market_data(job.round_num, job.day)
+    with trader_with_params(job.trader, job.params) as trader:
+        result = run_backtest(trader, market)
+    return job, result
+
+
+class ResultTable:
+    """Per-tick position/pnl rows of every job merged into one table."""
+
+    COLUMNS = ["job_id", "trader", "label", "day", "timestamp", "product", "position", "profit_and_loss"]
+
+    def __init__(self):
+        self.rows: List[Tuple] = []
+        # job_id -> (trader, label, day, final pnl, errors)
+        self.summary: Dict[int, Tuple[str, str, int, float, int]] = {}
+
+    def add(self, job: BacktestJob, result):
+        for timestamp, product, position, pnl in result.rows:
+            self.rows.append((job.job_id, job.trader, job.label, job.day, timestamp, product, position, pnl))
+        self.summary[job.job_id] = (job.trader, job.label, job.day, result.total_pnl, len(result.errors))
+
+    def sort(self):
+        self.rows.sort(key=lambda row: (row[0], row[4], row[5]))
+
+    def total_pnl(self) -> Dict[Tuple[str, str], float]:
+        """Final pnl summed over days for each (trader, label)"""
+        totals: Dict[Tuple[str, str], float] = {}
+        for trader, label, _, pnl, _ in self.summary.values():
+            totals[(trader, label)] = totals.get((trader, label), 0) + pnl
+        return totals
+
+    def write_csv(self, path: str):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(self.COLUMNS)
+            writer.writerows(self.rows)
+
+
+def make_jobs(traders: List[str], round_num: int, days: List[int], param_sets: Optional[List[dict]] = None) -> List[BacktestJob]:
+    jobs = []
+    # Day-major order so consecutive jobs in a worker reuse its cached market data
+    for day in days:
+        for trader in traders:
+            for params in (param_sets or [None]):
+                jobs.append(BacktestJob(len(jobs), trader, round_num, day, params))
+    return jobs
+
+
+def run_parallel(jobs: List[BacktestJob], data_dir: str, workers: Optional[int] = None) -> ResultTable:
+    table = ResultTable()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(data_dir)
+        for job in jobs:
+            table.add(*_run_job(job))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data_dir,)) as executor:
+            futures = [executor.submit(_run_job, job) for job in jobs]
+            for future in as_completed(futures):
+                table.add(*future.result())
+    table.sort()
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run (trader, day, params) backtests across a process pool")
+    parser.add_argument("data_dir")
+    parser.add_argument("round", type=int)
+    parser.add_argument("--traders", nargs="+", required=True, help="trader module names")
+    parser.add_argument("--days", type=int, nargs="+", default=[0])
+    parser.add_argument("--params", help="json file holding a list of PARAMS override dicts")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", help="write the merged per-tick table to this csv")
+    args = parser.parse_args()
+
+    param_sets: Optional[List[Dict[str, Any]]] = None
+    if args.params:
+        with open(args.params) as f:
+            param_sets = json.load(f)
+
+    jobs = make_jobs(args.traders, args.round, args.days, param_sets)
+    table = run_parallel(jobs, args.data_dir, args.workers)
+
+    for job_id, (trader, label, day, pnl, errors) in sorted(table.summary.items()):
+        print(f"[{job_id}] {trader} day {day} {label}: {pnl:,.1f}" + (f" ({errors} errors)" if errors else ""))
+    for (trader, label), pnl in sorted(table.total_pnl().items(), key=lambda item: -item[1]):
+        print(f"{trader} {label}: {pnl:,.1f}")
+    if args.out:
+        table.write_csv(args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+from backtester import MarketData, run_backtest
+from parallel_backtest import trader_with_params
+from tick_store import open_market_data
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Dict, Optional, Tuple, Any
+import argparse
+import random
+import pickle
+import math
+import json
+import csv
+import os
+
+# Worker state: every day's market data, unpickled once from the shared memory block
+_MARKETS: Dict[int, MarketData] = {}
+_TRADER: Optional[str] = None
+
+
+class ParamSpace:
+    """Declared ranges for PARAMS entries, keyed by dotted path ("PICNIC_BASKET1.z_threshold").
+
+    A list is a set of discrete choices, a dict {"low", "high", "steps"} is a numeric range
+    (integer valued when low and high are both ints).
+    """
+
+    def __init__(self, ranges: Dict[str, Any]):
+        self.ranges = ranges
+
+    def values(self, name: str) -> List[Any]:
+        spec = self.ranges[name]
+        if isinstance(spec, list):
+            return spec
+        low, high, steps = spec["low"], spec["high"], spec.get("steps", 5)
+        if steps == 1:
+            return [low]
+        points = [low + (high - low) * i / (steps - 1) for i in range(steps)]
+        if isinstance(low, int) and isinstance(high, int):
+            return sorted(set(int(round(point)) for point in points))
+        return points
+
+    def sample_value(self, name: str, rng: random.Random) -> Any:
+        spec = self.ranges[name]
+        if isinstance(spec, list):
+            return rng.choice(spec)
+        if isinstance(spec["low"], int) and isinstance(spec["high"], int):
+            return rng.randint(spec["low"], spec["high"])
+        return rng.uniform(spec["low"], spec["high"])
+
+    def grid(self) -> List[Dict[str, Any]]:
+        candidates = [{}]
+        for name in self.ranges:
+            candidates = [dict(candidate, **{name: value}) for candidate in candidates for value in self.values(name)]
+        return candidates
+
+    def sample(self, n: int, seed: int = 0) -> List[Dict[str, Any]]:
+        rng = random.Random(seed)
+        return [{name: self.sample_value(name, rng) for name in self.ranges} for _ in range(n)]
+
+
+def to_overrides(candidate: Dict[str, Any]) -> dict:
+    """{"A.b": 1} -> {"A": {"b": 1}}"""
+    overrides: dict = {}
+    for path, value in candidate.items():
+        node = overrides
+        keys = path.split(".")
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = value
+    return overrides
+
+
+def _init_worker(shm_name: str, size: int, trader: str):
+    global _TRADER
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _MARKETS.update(pickle.loads(shm.buf[:size]))
+    finally:
+        shm.close()
+    _TRADER = trader
+
+
+def evaluate(candidate: Dict[str, Any], fraction: float = 1.0) -> Tuple[float, Dict[int, float]]:
+    """Total and per-day pnl of one candidate on the worker's market data"""
+    day_pnl = {}
+    for day, market in sorted(_MARKETS.items()):
+        with trader_with_params(_TRADER, to_overrides(candidate)) as trader:
+            day_pnl[day] = run_backtest(trader, market.head(fraction)).total_pnl
+    return sum(day_pnl.values()), day_pnl
+
+
+def _evaluate_job(job: Tuple[Dict[str, Any], float]):
+    return evaluate(*job)
+
+
+class Sweep:
+    """Evaluates PARAMS candidates for one trader module across a process pool."""
+
+    def __init__(self, trader: str, markets: Dict[int, MarketData], workers: Optional[int] = None):
+        self.trader = trader
+        self.markets = markets
+        self.workers = workers or os.cpu_count() or 1
+        # (candidate, fraction of each day replayed, total pnl, per-day pnl)
+        self.surface: List[Tuple[Dict[str, Any], float, float, Dict[int, float]]] = []
+
+    def __enter__(self):
+        # Market data is published once into shared memory; workers attach instead of reparsing csv files.
+        # A TickStoreDay pickles as its path, so stored days are mmap-shared through the page cache instead.
+        payload = pickle.dumps(self.markets, protocol=pickle.HIGHEST_PROTOCOL)
+        self.shm = shared_memory.SharedMemory(create=True, size=len(payload))
+        self.shm.buf[:len(payload)] = payload
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.shm.name, len(payload), self.trader)
+        )
+        return self
+
+    def __exit__(self, *exc):
+        self.executor.shutdown()
+        self.shm.close()
+        self.shm.unlink()
+
+    def run(self, candidates: List[Dict[str, Any]], fraction: float = 1.0) -> List[Tuple[Dict[str, Any], float, float, Dict[int, float]]]:
+        jobs = [(candidate, fraction) for candidate in candidates]
+        rows = []
+        for candidate, (total, day_pnl) in zip(candidates, self.executor.map(_evaluate_job, jobs)):
+            rows.append((candidate, fraction, total, day_pnl))
+        self.surface.extend(rows)
+        return sorted(rows, key=lambda row: -row[2])
+
+    def grid(self, space: ParamSpace):
+        return self.run(space.grid())
+
+    def random(self, space: ParamSpace, n: int, seed: int = 0):
+        return self.run(space.sample(n, seed))
+
+    def successive_halving(self, space: ParamSpace, n: int, eta: int = 3, min_fraction: float = 0.1, seed: int = 0):
+        """Replay every candidate on a short prefix of each day, keep the best 1/eta, grow the prefix by eta"""
+        candidates = space.sample(n, seed)
+        fraction = min_fraction
+        while len(candidates) > 1 and fraction < 1:
+            ranked = self.run(candidates, fraction)
+            candidates = [row[0] for row in ranked[:max(1, math.ceil(len(ranked) / eta))]]
+            fraction *= eta
+        return self.run(candidates, 1.0)
+
+    def ranked(self) -> List[Tuple[Dict[str, Any], float, float, Dict[int, float]]]:
+        """Every evaluation so far, full-day results first, best pnl first"""
+        return sorted(self.surface, key=lambda row: (-row[1], -row[2]))
+
+    def write_csv(self, path: str, space: ParamSpace):
+        days = sorted(self.markets.keys())
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(list(space.ranges) + ["fraction", "total_pnl"] + [f"day_{day}" for day in days])
+            for candidate, fraction, total, day_pnl in self.ranked():
+                writer.writerow([candidate[name] for name in space.ranges] + [fraction, total] + [day_pnl[day] for day in days])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel grid/random/successive-halving sweep over a trader's PARAMS")
+    parser.add_argument("trader", help="trader module name, e.g. trader_round2")
+    parser.add_argument("data_dir")
+    parser.add_argument("round", type=int)
+    parser.add_argument("--space", required=True, help='json file: {"PRODUCT.key": [choices] or {"low", "high", "steps"}}')
+    parser.add_argument("--days", type=int, nargs="+", default=[0])
+    parser.add_argument("--method", choices=["grid", "random", "halving"], default="grid")
+    parser.add_argument("--samples", type=int, default=27, help="candidates for random/halving")
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--out", help="write the ranked pnl surface to this csv")
+    args = parser.parse_args()
+
+    with open(args.space) as f:
+        space = ParamSpace(json.load(f))
+    markets = {day: open_market_data(args.data_dir, args.round, day) for day in args.days}
+
+    with Sweep(args.trader, markets, args.workers) as sweep:
+        if args.method == "grid":
+            sweep.grid(space)
+        elif args.method == "random":
+            sweep.random(space, args.samples, args.seed)
+        else:
+            sweep.successive_halving(space, args.samples, args.eta, seed=args.seed)
+
+    for candidate, fraction, total, _ in sweep.ranked()[:args.top]:
+        print(f"{total:>12,.1f}  (fraction {fraction:.2f})  {json.dumps(candidate, sort_keys=True)}")
+    if args.out:
+        sweep.write_csv(args.out, space)
+
+
+if __name__ == "__main__":
+    main()
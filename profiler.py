@@ -0,0 +1,195 @@
+from backtester import load_trader, run_backtest
+from tick_store import open_market_data
+from trader_codec import Schema
+from handlers import HandlerRegistry
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+import argparse
+import inspect
+import time
+import sys
+
+# The exchange's hard time budget for one Trader.run call
+DEFAULT_BUDGET_MS = 900.0
+CODEC_STAGES = {"decode": "traderData decode", "encode": "traderData encode"}
+_MISSING = object()
+
+
+class _TimedCodec:
+    """Stands in for a codec module (jsonpickle) inside a trader module and times decode/encode."""
+
+    def __init__(self, codec, profiler: "TickProfiler"):
+        self._codec = codec
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        attribute = getattr(self._codec, name)
+        if name in CODEC_STAGES:
+            return self._profiler.timed(attribute, CODEC_STAGES[name])
+        return attribute
+
+
+class TickProfiler:
+    """Times every stage of Trader.run for each tick.
+
+    Each method of the trader becomes a stage, tagged with the product when its first argument
+    is a listed symbol (take_orders[STARFRUIT]), as does every handler and setup in the trader's
+    HandlerRegistry (under its method name, or handler[name] for lambdas), and the traderData codec (trader_codec.Schema or
+    the module's jsonpickle) gets decode and encode stages. Stage times are exclusive: a nested stage's time is not counted in its caller,
+    and whatever run spends outside any stage is reported as "run (self)".
+    """
+
+    def __init__(self, trader, budget_ms: float = DEFAULT_BUDGET_MS, codecs: Tuple[str, ...] = ("jsonpickle",)):
+        self.trader = trader
+        self.budget_ms = budget_ms
+        self.module = sys.modules[type(trader).__module__]
+        self.codecs = codecs
+        self.products: set = set()
+
+        # One dict of stage -> ms per tick
+        self.ticks: List[Tuple[int, Dict[str, float]]] = []
+        self._current: Optional[Dict[str, float]] = None
+        self._stack: List[float] = []
+        self._patched: List[Tuple[object, str, object]] = []
+
+    def timed(self, function, stage: str, tag_product: bool = False):
+        profiler = self
+
+        def wrapper(*args, **kwargs):
+            current = profiler._current
+            if current is None:
+                return function(*args, **kwargs)
+            name = stage
+            if tag_product and args and isinstance(args[0], str) and args[0] in profiler.products:
+                name = f"{stage}[{args[0]}]"
+            profiler._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                child = profiler._stack.pop()
+                current[name] = current.get(name, 0.0) + elapsed - child
+                if profiler._stack:
+                    profiler._stack[-1] += elapsed
+
+        return wrapper
+
+    def _patch(self, owner, name: str, replacement):
+        # Instance attributes shadowing a class method are deleted again; slotted attributes are restored
+        self._patched.append((owner, name, owner.__dict__.get(name, _MISSING) if hasattr(owner, "__dict__") else getattr(owner, name)))
+        setattr(owner, name, replacement)
+
+    def _handler_stage(self, function, kind: str, name: str) -> str:
+        if getattr(function, "__self__", None) is self.trader:
+            return function.__name__
+        return f"{kind}[{name}]"
+
+    def install(self) -> "TickProfiler":
+        for name, method in inspect.getmembers(self.trader, inspect.ismethod):
+            if name.startswith("__") or name == "run":
+                continue
+            self._patch(self.trader, name, self.timed(method, name, tag_product=True))
+        # Registries hold the handlers they were given, so the instance patches above never reach them
+        for registry in vars(self.trader).values():
+            if not isinstance(registry, HandlerRegistry):
+                continue
+            for entry in registry.entries.values():
+                for kind in ("handler", "setup"):
+                    function = getattr(entry, kind)
+                    if function is not None:
+                        self._patch(entry, kind, self.timed(function, self._handler_stage(function, kind, entry.name)))
+        for codec in self.codecs:
+            if hasattr(self.module, codec):
+                self._patch(self.module, codec, _TimedCodec(getattr(self.module, codec), self))
+        for name, stage in CODEC_STAGES.items():
+            self._patch(Schema, name, self.timed(Schema.__dict__[name], stage))
+        self._patch(self.trader, "run", self._run_wrapper(self.trader.run))
+        return self
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._patched):
+            if original is _MISSING:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._patched = []
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    def _run_wrapper(self, run):
+        profiler = self
+
+        def wrapper(state):
+            profiler.products = set(state.order_depths)
+            profiler._current = current = {}
+            profiler._stack = [0.0]
+            start = time.perf_counter()
+            try:
+                return run(state)
+            finally:
+                total = (time.perf_counter() - start) * 1000
+                current["run (self)"] = total - profiler._stack.pop()
+                current["total"] = total
+                profiler._current = None
+                profiler.ticks.append((state.timestamp, current))
+
+        return wrapper
+
+    def over_budget(self) -> List[Tuple[int, float]]:
+        """(timestamp, total ms) of every tick that blew the budget"""
+        return [(timestamp, stages["total"]) for timestamp, stages in self.ticks if stages["total"] > self.budget_ms]
+
+    def summary(self) -> List[Tuple[str, int, float, float, float, float]]:
+        """(stage, calls, p50 ms, p99 ms, max ms, share of total time) sorted by total time spent"""
+        samples: Dict[str, List[float]] = {}
+        for _, stages in self.ticks:
+            for stage, ms in stages.items():
+                samples.setdefault(stage, []).append(ms)
+        grand_total = sum(samples.get("total", [])) or 1.0
+        rows = []
+        for stage, values in samples.items():
+            values = np.asarray(values)
+            rows.append((stage, len(values), float(np.percentile(values, 50)), float(np.percentile(values, 99)),
+                         float(values.max()), float(values.sum()) / grand_total))
+        return sorted(rows, key=lambda row: -row[5])
+
+    def report(self) -> str:
+        lines = [f"{'stage':<48}{'ticks':>7}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'share':>8}"]
+        for stage, calls, p50, p99, worst, share in self.summary():
+            lines.append(f"{stage:<48}{calls:>7}{p50:>10.3f}{p99:>10.3f}{worst:>10.3f}{share:>8.1%}")
+        over = self.over_budget()
+        lines.append(f"{len(over)} of {len(self.ticks)} ticks over the {self.budget_ms:g} ms budget")
+        for timestamp, total in sorted(over, key=lambda item: -item[1])[:10]:
+            lines.append(f"  {timestamp}: {total:.1f} ms")
+        return "\n".join(lines)
+
+
+def profile_backtest(trader, market, budget_ms: float = DEFAULT_BUDGET_MS) -> TickProfiler:
+    with TickProfiler(trader, budget_ms) as profiler:
+        run_backtest(trader, market)
+    return profiler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency profile of Trader.run over a backtest")
+    parser.add_argument("trader", help="trader module name, e.g. trader_round3")
+    parser.add_argument("data_dir")
+    parser.add_argument("round", type=int)
+    parser.add_argument("--days", type=int, nargs="+", default=[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+
+    for day in args.days:
+        market = open_market_data(args.data_dir, args.round, day)
+        profiler = profile_backtest(load_trader(args.trader), market, args.budget_ms)
+        print(f"Round {args.round} day {day}")
+        print(profiler.report())
+
+
+if __name__ == "__main__":
+    main()
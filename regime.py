@@ -0,0 +1,182 @@
+from typing import Optional, Tuple
+import numpy as np
+import argparse
+import struct
+import sys
+
+# count, t mean, driver mean, t variance, t/driver covariance, last response
+_STATE = struct.Struct("<q5d")
+
+
+class RegimeDetector:
+    """Learns, online, the driver level below which a response starts to trend.
+
+    Built for MAGNIFICENT_MACARONS, where sugar (and the macarons) rally once the sunlight index
+    drops below a critical level, but usable for any driver / response pair:
+
+    - Slope: an exponentially weighted least-squares line of the driver against time (forgetting
+      factor `slope_decay`), kept as EW means, variance and covariance, so `slope` and `forecast`
+      track the driver's trend.
+    - Threshold: each tick's response change is added to the driver bin it happened in; bins
+      cover [low, high) in steps of `bin_width` and all decay by `bin_decay` per tick. The threshold
+      is the mean-shift change point across bins: the split maximising
+      n_below * n_above / n * (mean_below - mean_above)^2 with the response rising faster below,
+      both sides holding at least `min_weight` of decayed observations. The gain over the variance
+      of the response changes is the split's chi-square score; below `min_score` (~3.5 sigma by
+      default) there is no threshold. A split is only seen once the driver has spent time on both
+      sides of it, so the bins keep about a day (10k ticks) of evidence by default.
+
+    Every update is O(number of bins). State packs into a few hundred bytes of float32 bins.
+    """
+
+    def __init__(self, low: float, high: float, bin_width: float, slope_decay: float = 0.99,
+                 bin_decay: float = 0.9999, min_weight: float = 50.0, min_score: float = 12.0):
+        self.low = low
+        self.bin_width = bin_width
+        self.n_bins = max(int(np.ceil((high - low) / bin_width)), 2)
+        self.slope_decay = slope_decay
+        self.bin_decay = bin_decay
+        self.min_weight = min_weight
+        self.min_score = min_score
+        self.count = 0
+        self._mean_t = 0.0
+        self._mean_x = 0.0
+        self._var_t = 0.0
+        self._cov = 0.0
+        self.last_response: Optional[float] = None
+        self.weights = np.zeros(self.n_bins)
+        self.sums = np.zeros(self.n_bins)
+        self.squares = np.zeros(self.n_bins)
+
+    def bin(self, driver: float) -> int:
+        return min(max(int((driver - self.low) // self.bin_width), 0), self.n_bins - 1)
+
+    def update(self, driver: float, response: Optional[float] = None):
+        # EW regression of the driver on the tick count; the first values get plain averaging
+        alpha = max(1.0 - self.slope_decay, 1.0 / (self.count + 1))
+        dt = self.count - self._mean_t
+        dx = driver - self._mean_x
+        self._mean_t += alpha * dt
+        self._mean_x += alpha * dx
+        self._var_t = (1 - alpha) * (self._var_t + alpha * dt * dt)
+        self._cov = (1 - alpha) * (self._cov + alpha * dt * dx)
+        self.count += 1
+
+        if response is not None:
+            if self.last_response is not None:
+                self.weights *= self.bin_decay
+                self.sums *= self.bin_decay
+                self.squares *= self.bin_decay
+                b = self.bin(driver)
+                change = response - self.last_response
+                self.weights[b] += 1.0
+                self.sums[b] += change
+                self.squares[b] += change * change
+            self.last_response = response
+
+    @property
+    def threshold(self) -> Optional[float]:
+        """Learned critical driver level, None until a split has enough evidence on both sides"""
+        # Splits k = 1..n_bins-1 put bins < k below the threshold and bins >= k above it
+        weight_below = np.cumsum(self.weights)[:-1]
+        sum_below = np.cumsum(self.sums)[:-1]
+        total_weight, total_sum = weight_below[-1] + self.weights[-1], sum_below[-1] + self.sums[-1]
+        weight_above = total_weight - weight_below
+        valid = (weight_below >= self.min_weight) & (weight_above >= self.min_weight)
+        if not valid.any():
+            return None
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shift = sum_below / weight_below - (total_sum - sum_below) / weight_above
+            gain = weight_below * weight_above / total_weight * shift * shift
+        gain = np.where(valid & (shift > 0), gain, -1.0)
+        k = int(np.argmax(gain))
+        variance = self.squares.sum() / total_weight - (total_sum / total_weight) ** 2
+        if gain[k] <= 0 or gain[k] < self.min_score * variance:
+            return None
+        return self.low + (k + 1) * self.bin_width
+
+    @property
+    def slope(self) -> float:
+        """Driver change per tick over the recent (EW) window"""
+        return self._cov / self._var_t if self._var_t > 0 else 0.0
+
+    def forecast(self, steps: int = 0) -> float:
+        """Fitted driver `steps` ticks after the latest update"""
+        return self._mean_x + self.slope * (self.count - 1 + steps - self._mean_t)
+
+    def critical(self, default: float) -> float:
+        """Learned threshold, or `default` until both sides of a split have enough evidence"""
+        threshold = self.threshold
+        return default if threshold is None else threshold
+
+    def pack(self, out: bytearray):
+        out += _STATE.pack(self.count, self._mean_t, self._mean_x, self._var_t, self._cov,
+                           float("nan") if self.last_response is None else self.last_response)
+        out += self.weights.astype("<f4").tobytes()
+        out += self.sums.astype("<f4").tobytes()
+        out += self.squares.astype("<f4").tobytes()
+
+    @classmethod
+    def unpack(cls, buffer, offset: int, *args, **kwargs) -> Tuple["RegimeDetector", int]:
+        detector = cls(*args, **kwargs)
+        detector.count, detector._mean_t, detector._mean_x, detector._var_t, detector._cov, last = \
+            _STATE.unpack_from(buffer, offset)
+        detector.last_response = None if last != last else last
+        offset += _STATE.size
+        n = detector.n_bins
+        detector.weights = np.frombuffer(buffer, dtype="<f4", count=n, offset=offset).astype(float)
+        detector.sums = np.frombuffer(buffer, dtype="<f4", count=n, offset=offset + 4 * n).astype(float)
+        detector.squares = np.frombuffer(buffer, dtype="<f4", count=n, offset=offset + 8 * n).astype(float)
+        return detector, offset + 12 * n
+
+
+def recover_break(detector: RegimeDetector, break_level: float, drift: float, ticks: int = 10000,
+                  center: float = 3900.0, amplitude: float = 400.0, period: float = 10000.0,
+                  noise: float = 1.0, seed: int = 0) -> Tuple[float, float]:
+    """Synthetic check: the driver swings as a sinusoid and the response drifts by `drift` per tick
+    below `break_level` plus N(0, noise) steps. Over the second half of the series, returns the share
+    of ticks whose threshold lands within one bin of the break and the share with any threshold."""
+    rng = np.random.default_rng(seed)
+    driver = center + amplitude * np.sin(2 * np.pi * np.arange(ticks) / period)
+    steps = np.where(driver < break_level, drift, 0.0) + rng.normal(0.0, noise, ticks)
+    response = np.cumsum(steps)
+    checked = found = recovered = 0
+    for i in range(ticks):
+        detector.update(driver[i], response[i])
+        if i >= ticks // 2:
+            threshold = detector.threshold
+            checked += 1
+            found += threshold is not None
+            recovered += threshold is not None and abs(threshold - break_level) <= detector.bin_width
+    return recovered / checked, found / checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that RegimeDetector recovers a known break on a synthetic series")
+    parser.add_argument("--low", type=float, default=3000)
+    parser.add_argument("--high", type=float, default=5000)
+    parser.add_argument("--bin-width", type=float, default=50)
+    parser.add_argument("--break-level", type=float, default=3800)
+    parser.add_argument("--drift", type=float, default=0.3, help="response drift per tick below the break")
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument("--min-share", type=float, default=0.8, help="required share of second-half ticks recovering the break")
+    args = parser.parse_args()
+
+    ok = True
+    shares = []
+    for seed in range(args.seeds):
+        recovered, _ = recover_break(RegimeDetector(args.low, args.high, args.bin_width), args.break_level,
+                                     args.drift, args.ticks, seed=seed)
+        # The same series without the break must not produce a threshold
+        _, false_positive = recover_break(RegimeDetector(args.low, args.high, args.bin_width), args.break_level,
+                                          0.0, args.ticks, seed=seed)
+        ok &= recovered >= args.min_share and false_positive == 0
+        shares.append(recovered)
+        print(f"seed {seed:3d}  recovered {recovered:6.1%}  null threshold {false_positive:6.1%}")
+    print(f"mean recovered {np.mean(shares):.1%}  {'ok' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+from typing import Tuple
+import numpy as np
+import struct
+import math
+
+_STATE = struct.Struct("<qIdd")
+
+
+class RingBuffer:
+    """Fixed-capacity float64 circular buffer backed by one NumPy array.
+
+    Every value is written twice, at pos and pos + capacity, so the last k values are always a
+    contiguous slice of the array and window(k) is a zero-copy view that np.std / np.mean can
+    consume directly. Mean and variance are kept incrementally (running sum plus a sliding
+    Welford sum of squared deviations) and recomputed exactly each time the write position wraps,
+    which bounds floating point drift at amortised O(1) cost.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity)
+        self._pos = 0  # next write position in [0, capacity)
+        self._size = 0
+        self.count = 0  # values appended so far
+        self._sum = 0.0
+        self._m2 = 0.0
+
+    def append(self, value: float):
+        value = float(value)
+        data, capacity, n = self._data, self.capacity, self._size
+        if n == capacity:
+            old = data[self._pos]
+            old_mean = self._sum / n
+            self._sum += value - old
+            self._m2 += (value - old) * (value - self._sum / n + old - old_mean)
+            if self._m2 < 0:
+                self._m2 = 0.0
+        else:
+            delta = value - (self._sum / n if n else 0.0)
+            self._sum += value
+            n += 1
+            self._m2 += delta * (value - self._sum / n)
+            self._size = n
+        data[self._pos] = value
+        data[self._pos + capacity] = value
+        self._pos += 1
+        self.count += 1
+        if self._pos == capacity:
+            self._pos = 0
+            self._resync()
+
+    def _resync(self):
+        values = self.window()
+        self._sum = float(values.sum())
+        self._m2 = float(((values - self._sum / len(values)) ** 2).sum()) if len(values) else 0.0
+
+    def window(self, k: int = None) -> np.ndarray:
+        """Zero-copy view of the last k values (all values when k is None), oldest first"""
+        n = self._size if k is None else min(k, self._size)
+        end = self._pos + self.capacity
+        return self._data[end - n:end]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        return iter(self.window().tolist())
+
+    @property
+    def full(self) -> bool:
+        return self._size == self.capacity
+
+    @property
+    def last(self) -> float:
+        return float(self._data[self._pos + self.capacity - 1]) if self._size else None
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._size if self._size else 0.0
+
+    @property
+    def var(self) -> float:
+        """Population variance, matching np.var"""
+        return self._m2 / self._size if self._size else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation, matching np.std"""
+        return math.sqrt(self.var)
+
+    def zscore(self, value: float) -> float:
+        std = self.std
+        return (value - self.mean) / std if std != 0 else 0.0
+
+    def pack(self, out: bytearray):
+        out += _STATE.pack(self.count, self._size, self._sum, self._m2)
+        out += self.window().astype("<f8", copy=False).tobytes()
+
+    @classmethod
+    def unpack(cls, buffer, offset: int, capacity: int) -> Tuple["RingBuffer", int]:
+        ring = cls(capacity)
+        count, size, ring._sum, ring._m2 = _STATE.unpack_from(buffer, offset)
+        offset += _STATE.size
+        end = offset + 8 * size
+        # Keep the newest values if the capacity shrank between versions of the schema
+        values = np.frombuffer(buffer, dtype="<f8", count=size, offset=offset)[-capacity:]
+        if len(values) != size:
+            ring._sum = 0.0
+        size = len(values)
+        ring._data[:size] = values
+        ring._data[capacity:capacity + size] = values
+        ring._size = size
+        ring._pos = size % capacity
+        ring.count = count
+        if ring._sum == 0.0:
+            ring._resync()
+        return ring, end
+
@@ -0,0 +1,53 @@
+from typing import Optional, Sequence, Tuple
+import numpy as np
+import struct
+
+_COUNT = struct.Struct("<q")
+
+
+class RecursiveLeastSquares:
+    """Online linear regression y ~ weights @ x with exponential forgetting.
+
+    Each update is the standard RLS step: gain k = P x / (forgetting + x' P x), weights move by
+    k times the prediction error, and P <- (P - k x' P) / forgetting, so old observations fade
+    with weight forgetting^age. `prior` sets the starting weights and `delta` the starting P = delta * I,
+    i.e. how loosely that prior is held. State is the k weights and the k x k P matrix.
+    """
+
+    def __init__(self, n_features: int, forgetting: float = 0.999, delta: float = 1.0,
+                 prior: Optional[Sequence[float]] = None):
+        self.n_features = n_features
+        self.forgetting = forgetting
+        self.weights = np.zeros(n_features) if prior is None else np.array(prior, dtype=float)
+        self.P = np.eye(n_features) * delta
+        self.count = 0
+
+    def predict(self, x: Sequence[float]) -> float:
+        return float(self.weights @ np.asarray(x, dtype=float))
+
+    def update(self, x: Sequence[float], y: float):
+        x = np.asarray(x, dtype=float)
+        Px = self.P @ x
+        gain = Px / (self.forgetting + x @ Px)
+        self.weights += gain * (y - self.weights @ x)
+        P = (self.P - np.outer(gain, Px)) / self.forgetting
+        # Keep P symmetric against rounding
+        self.P = (P + P.T) * 0.5
+        self.count += 1
+
+    def pack(self, out: bytearray):
+        out += _COUNT.pack(self.count)
+        out += self.weights.astype("<f8", copy=False).tobytes()
+        out += self.P.astype("<f8", copy=False).tobytes()
+
+    @classmethod
+    def unpack(cls, buffer, offset: int, *args, **kwargs) -> Tuple["RecursiveLeastSquares", int]:
+        model = cls(*args, **kwargs)
+        n = model.n_features
+        model.count = _COUNT.unpack_from(buffer, offset)[0]
+        offset += _COUNT.size
+        model.weights = np.frombuffer(buffer, dtype="<f8", count=n, offset=offset).copy()
+        offset += 8 * n
+        model.P = np.frombuffer(buffer, dtype="<f8", count=n * n, offset=offset).reshape(n, n).copy()
+        return model, offset + 8 * n * n
+
@@ -0,0 +1,140 @@
+from typing import Optional, Tuple
+from collections import deque
+from trader_codec import FloatSeries, IntSeries
+import struct
+import math
+
+_STATE = struct.Struct("<qddd")
+# Typed-array packers for the window values and the min/max candidates' sequence numbers
+_VALUES = FloatSeries()
+_SEQUENCES = IntSeries()
+
+
+class RollingWindow:
+    """Moving-window statistics with O(1) updates and constant memory.
+
+    Keeps the last `window` values with a running sum (exact for the integer and half-integer
+    prices we see, so the mean matches statistics.mean), a running sum of squared deviations
+    (Welford, updated for both the value entering and the value leaving the window), an optional
+    EMA over every value seen, and monotonic deques for the window min/max.
+    """
+
+    def __init__(self, window: int, alpha: Optional[float] = None):
+        self.window = window
+        self.alpha = alpha
+        self.values = deque(maxlen=window)
+        self.count = 0  # values seen so far, also the sequence number of the next value
+        self._sum = 0.0
+        self._m2 = 0.0
+        self.ema: Optional[float] = None
+        # (sequence number, value) candidates for the window max / min
+        self._max = deque()
+        self._min = deque()
+
+    def append(self, value: float):
+        values = self.values
+        n = len(values)
+        if n == self.window:
+            old = values[0]
+            old_mean = self._sum / n
+            self._sum += value - old
+            self._m2 += (value - old) * (value - self._sum / n + old - old_mean)
+            if self._m2 < 0:
+                self._m2 = 0.0
+        else:
+            delta = value - (self._sum / n if n else 0.0)
+            self._sum += value
+            self._m2 += delta * (value - self._sum / (n + 1))
+        values.append(value)
+
+        if self.alpha is not None:
+            self.ema = value if self.ema is None else self.alpha * value + (1 - self.alpha) * self.ema
+
+        sequence = self.count
+        self.count += 1
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((sequence, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((sequence, value))
+        oldest = self.count - self.window
+        if self._max[0][0] < oldest:
+            self._max.popleft()
+        if self._min[0][0] < oldest:
+            self._min.popleft()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+    @property
+    def last(self) -> Optional[float]:
+        return self.values[-1] if self.values else None
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._sum / len(self.values) if self.values else None
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, matching statistics.variance"""
+        n = len(self.values)
+        return self._m2 / (n - 1) if n > 1 else 0.0
+
+    @property
+    def pvariance(self) -> float:
+        """Population variance, matching np.var / statistics.pvariance"""
+        n = len(self.values)
+        return self._m2 / n if n > 0 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def pstdev(self) -> float:
+        return math.sqrt(self.pvariance)
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._max[0][1] if self._max else None
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._min[0][1] if self._min else None
+
+    def zscore(self, value: float) -> float:
+        std = self.pstdev
+        return (value - self.mean) / std if std > 0 else 0.0
+
+    def pack(self, out: bytearray):
+        out += _STATE.pack(self.count, self._sum, self._m2, float("nan") if self.ema is None else self.ema)
+        _VALUES.pack(self.values, out)
+        for candidates in (self._max, self._min):
+            _SEQUENCES.pack([sequence for sequence, _ in candidates], out)
+            _VALUES.pack([value for _, value in candidates], out)
+
+    @classmethod
+    def unpack(cls, buffer, offset: int, window: int, alpha: Optional[float] = None) -> Tuple["RollingWindow", int]:
+        rolling = cls(window, alpha)
+        rolling.count, rolling._sum, rolling._m2, ema = _STATE.unpack_from(buffer, offset)
+        rolling.ema = None if ema != ema else ema
+        values, offset = _VALUES.unpack(buffer, offset + _STATE.size)
+        rolling.values.extend(values)
+        for candidates in (rolling._max, rolling._min):
+            sequences, offset = _SEQUENCES.unpack(buffer, offset)
+            values, offset = _VALUES.unpack(buffer, offset)
+            candidates.extend(zip(sequences, values))
+        return rolling, offset
+
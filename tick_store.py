@@ -0,0 +1,239 @@
+from datamodel import Listing, OrderDepth, Trade, TradingState, Observation, ConversionObservation
+from backtester import MarketData, load_market_data
+from typing import List, Dict, Optional
+import numpy as np
+import argparse
+import json
+import os
+
+# Fixed dtypes of the columnar layout, one .npy file per field
+BOOK_FIELDS = {
+    "bid_price": np.int32,
+    "bid_volume": np.int32,
+    "ask_price": np.int32,
+    "ask_volume": np.int32,
+}
+OBSERVATION_FIELDS = ["bidPrice", "askPrice", "transportFees", "exportTariff", "importTariff", "sugarPrice", "sunlightIndex"]
+LEVELS = 3
+
+
+def day_path(store_dir: str, round_num: int, day: int) -> str:
+    return os.path.join(store_dir, f"round_{round_num}_day_{day}")
+
+
+def write_day(market: MarketData, path: str):
+    """Write a MarketData day as fixed-dtype column arrays
+
+    Book levels are (ticks, products, levels) arrays where a zero volume marks an empty level,
+    trades are flat arrays sorted by tick with an offsets index, observations are
+    (ticks, products, fields) float64 arrays holding nan where a product has none.
+    """
+    os.makedirs(path, exist_ok=True)
+    products = market.products
+    product_index = {product: i for i, product in enumerate(products)}
+    n_ticks, n_products = len(market.timestamps), len(products)
+
+    books = {field: np.zeros((n_ticks, n_products, LEVELS), dtype=dtype) for field, dtype in BOOK_FIELDS.items()}
+    mid_price = np.full((n_ticks, n_products), np.nan)
+    present = np.zeros((n_ticks, n_products), dtype=bool)
+
+    trade_tick, trade_symbol, trade_price, trade_quantity, trade_buyer, trade_seller = [], [], [], [], [], []
+    names: Dict[str, int] = {"": 0}
+
+    observation_products = sorted({product for observations in market.observations.values() for product in observations})
+    observation_index = {product: i for i, product in enumerate(observation_products)}
+    observations = np.full((n_ticks, len(observation_products), len(OBSERVATION_FIELDS)), np.nan)
+
+    for i, timestamp in enumerate(market.timestamps):
+        for product, (buy_orders, sell_orders, mid) in market.books[timestamp].items():
+            j = product_index[product]
+            present[i, j] = True
+            if mid is not None:
+                mid_price[i, j] = mid
+            for level, price in enumerate(sorted(buy_orders, reverse=True)[:LEVELS]):
+                books["bid_price"][i, j, level] = price
+                books["bid_volume"][i, j, level] = buy_orders[price]
+            for level, price in enumerate(sorted(sell_orders)[:LEVELS]):
+                books["ask_price"][i, j, level] = price
+                books["ask_volume"][i, j, level] = -sell_orders[price]
+
+        for trade in market.market_trades(timestamp):
+            trade_tick.append(i)
+            trade_symbol.append(product_index.setdefault(trade.symbol, len(product_index)))
+            trade_price.append(trade.price)
+            trade_quantity.append(trade.quantity)
+            trade_buyer.append(names.setdefault(trade.buyer or "", len(names)))
+            trade_seller.append(names.setdefault(trade.seller or "", len(names)))
+
+        for product, observation in market.conversion_observations(timestamp).items():
+            observations[i, observation_index[product]] = [getattr(observation, field) for field in OBSERVATION_FIELDS]
+
+    trade_tick = np.array(trade_tick, dtype=np.int32)
+    columns = dict(books)
+    columns.update({
+        "timestamps": np.array(market.timestamps, dtype=np.int64),
+        "mid_price": mid_price,
+        "present": present,
+        "trade_offsets": np.searchsorted(trade_tick, np.arange(n_ticks + 1)).astype(np.int64),
+        "trade_symbol": np.array(trade_symbol, dtype=np.int16),
+        "trade_price": np.array(trade_price, dtype=np.float64),
+        "trade_quantity": np.array(trade_quantity, dtype=np.int32),
+        "trade_buyer": np.array(trade_buyer, dtype=np.int32),
+        "trade_seller": np.array(trade_seller, dtype=np.int32),
+        "observations": observations,
+    })
+    for name, array in columns.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+
+    symbols = sorted(product_index, key=product_index.get)
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({
+            "round": market.round_num,
+            "day": market.day,
+            "products": products,
+            "symbols": symbols,
+            "names": sorted(names, key=names.get),
+            "observation_products": observation_products,
+            "levels": LEVELS,
+        }, f)
+
+
+class TickStoreDay:
+    """Read-only view over one converted day, opened with mmap.
+
+    Implements the same interface the Backtester uses on MarketData, but books, trades and
+    observations are materialized per tick from the column arrays only when asked for.
+    """
+
+    def __init__(self, path: str, start: int = 0, stop: Optional[int] = None):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.round_num = meta["round"]
+        self.day = meta["day"]
+        self.products: List[str] = meta["products"]
+        self.symbols: List[str] = meta["symbols"]
+        self.names: List[str] = meta["names"]
+        self.observation_products: List[str] = meta["observation_products"]
+        self.product_index = {product: j for j, product in enumerate(self.products)}
+
+        columns = {}
+        for name in os.listdir(path):
+            if name.endswith(".npy"):
+                columns[name[:-4]] = np.load(os.path.join(path, name), mmap_mode="r")
+        self.columns = columns
+
+        all_timestamps = columns["timestamps"]
+        stop = len(all_timestamps) if stop is None else stop
+        self.start, self.stop = start, stop
+        self.timestamps: List[int] = all_timestamps[start:stop].tolist()
+        self._index: Optional[Dict[int, int]] = None
+
+    def __reduce__(self):
+        # Pickle as a path so workers re-open the same mmap instead of copying arrays
+        return TickStoreDay, (self.path, self.start, self.stop)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def head(self, fraction: float) -> "TickStoreDay":
+        if fraction >= 1:
+            return self
+        return TickStoreDay(self.path, self.start, self.start + max(1, int(len(self.timestamps) * fraction)))
+
+    def index(self, timestamp: int) -> int:
+        if self._index is None:
+            self._index = {timestamp: self.start + i for i, timestamp in enumerate(self.timestamps)}
+        return self._index[timestamp]
+
+    def order_depths(self, timestamp: int) -> Dict[str, OrderDepth]:
+        i = self.index(timestamp)
+        columns = self.columns
+        present = columns["present"][i].tolist()
+        bid_price, bid_volume = columns["bid_price"][i].tolist(), columns["bid_volume"][i].tolist()
+        ask_price, ask_volume = columns["ask_price"][i].tolist(), columns["ask_volume"][i].tolist()
+        order_depths = {}
+        for j, product in enumerate(self.products):
+            if not present[j]:
+                continue
+            order_depths[product] = OrderDepth(
+                {price: volume for price, volume in zip(bid_price[j], bid_volume[j]) if volume},
+                {price: -volume for price, volume in zip(ask_price[j], ask_volume[j]) if volume},
+            )
+        return order_depths
+
+    def market_trades(self, timestamp: int) -> List[Trade]:
+        i = self.index(timestamp)
+        columns = self.columns
+        start, stop = columns["trade_offsets"][i:i + 2].tolist()
+        if start == stop:
+            return []
+        trades = []
+        for symbol, price, quantity, buyer, seller in zip(
+                columns["trade_symbol"][start:stop].tolist(), columns["trade_price"][start:stop].tolist(),
+                columns["trade_quantity"][start:stop].tolist(), columns["trade_buyer"][start:stop].tolist(),
+                columns["trade_seller"][start:stop].tolist()):
+            trades.append(Trade(self.symbols[symbol], int(price) if price.is_integer() else price, quantity,
+                                self.names[buyer], self.names[seller], timestamp))
+        return trades
+
+    def conversion_observations(self, timestamp: int) -> Dict[str, ConversionObservation]:
+        if not self.observation_products:
+            return {}
+        rows = self.columns["observations"][self.index(timestamp)].tolist()
+        return {
+            product: ConversionObservation(*row)
+            for product, row in zip(self.observation_products, rows)
+            if row[0] == row[0]  # nan check
+        }
+
+    def mid_price(self, timestamp: int, product: str) -> Optional[float]:
+        mid = float(self.columns["mid_price"][self.index(timestamp), self.product_index[product]])
+        return None if mid != mid else mid
+
+    def trading_state(self, timestamp: int, traderData: str = "", position: Optional[Dict[str, int]] = None) -> TradingState:
+        """A standalone TradingState for one tick (market trades as own trades are left empty)"""
+        market_trades: Dict[str, List[Trade]] = {}
+        for trade in self.market_trades(timestamp):
+            market_trades.setdefault(trade.symbol, []).append(trade)
+        return TradingState(
+            traderData, timestamp,
+            {product: Listing(product, product, "SEASHELLS") for product in self.products},
+            self.order_depths(timestamp), {}, market_trades, dict(position or {}),
+            Observation({}, self.conversion_observations(timestamp)),
+        )
+
+    def states(self):
+        for timestamp in self.timestamps:
+            yield self.trading_state(timestamp)
+
+
+def convert(data_dir: str, round_num: int, day: int, store_dir: str) -> str:
+    path = day_path(store_dir, round_num, day)
+    write_day(load_market_data(data_dir, round_num, day), path)
+    return path
+
+
+def open_market_data(data_dir: str, round_num: int, day: int):
+    """A converted TickStoreDay when data_dir holds one for the day, otherwise the parsed csv files"""
+    path = day_path(data_dir, round_num, day)
+    if os.path.exists(os.path.join(path, "meta.json")):
+        return TickStoreDay(path)
+    return load_market_data(data_dir, round_num, day)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert prosperity csv logs into a memory-mapped column store")
+    parser.add_argument("data_dir", help="directory with prices_/trades_/observations_ csv files")
+    parser.add_argument("round", type=int)
+    parser.add_argument("--days", type=int, nargs="+", default=[0])
+    parser.add_argument("--out", help="store directory (defaults to data_dir)")
+    args = parser.parse_args()
+
+    for day in args.days:
+        path = convert(args.data_dir, args.round, day, args.out or args.data_dir)
+        print(f"Round {args.round} day {day} -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+from typing import Dict, Any, Optional, Tuple
+from collections import deque
+from array import array
+import struct
+import base64
+import sys
+
+# Bumped whenever the wire layout of the field types changes
+VERSION = 1
+
+_HEADER = struct.Struct("<BH")
+_COUNT = struct.Struct("<I")
+_KEY_LENGTH = struct.Struct("<B")
+_SWAP = sys.byteorder != "little"
+
+
+class Float:
+    """float64 scalar; None round-trips through NaN"""
+
+    _format = struct.Struct("<d")
+
+    def __init__(self, default: Optional[float] = None):
+        self.default = default
+
+    def new(self):
+        return self.default
+
+    def pack(self, value, out: bytearray):
+        out += self._format.pack(float("nan") if value is None else value)
+
+    def unpack(self, buffer: bytes, offset: int) -> Tuple[Any, int]:
+        value = self._format.unpack_from(buffer, offset)[0]
+        return (None if value != value else value), offset + 8
+
+
+class Bool:
+    def __init__(self, default: bool = False):
+        self.default = default
+
+    def new(self):
+        return self.default
+
+    def pack(self, value, out: bytearray):
+        out.append(1 if value else 0)
+
+    def unpack(self, buffer: bytes, offset: int) -> Tuple[Any, int]:
+        return buffer[offset] == 1, offset + 1
+
+
+class _Series:
+    """A history packed as a typed array and decoded straight into a deque ring buffer"""
+
+    def __init__(self, maxlen: Optional[int], typecode: str):
+        self.maxlen = maxlen
+        self.typecode = typecode
+
+    def new(self):
+        return deque(maxlen=self.maxlen)
+
+    def pack(self, value, out: bytearray):
+        values = array(self.typecode, value)
+        if _SWAP:
+            values.byteswap()
+        out += _COUNT.pack(len(values))
+        out += values.tobytes()
+
+    def unpack(self, buffer: bytes, offset: int) -> Tuple[Any, int]:
+        count = _COUNT.unpack_from(buffer, offset)[0]
+        offset += 4
+        values = array(self.typecode)
+        end = offset + count * values.itemsize
+        values.frombytes(buffer[offset:end])
+        if _SWAP:
+            values.byteswap()
+        return deque(values, maxlen=self.maxlen), end
+
+
+class FloatSeries(_Series):
+    """Float history; typecode "d" keeps full float64 precision, "f" halves the size for histories
+    that can afford float32"""
+
+    def __init__(self, maxlen: Optional[int] = None, typecode: str = "d"):
+        super().__init__(maxlen, typecode)
+
+
+class IntSeries(_Series):
+    """Integer history (sequence numbers, volumes); typecode "q" is int64, "i" int32"""
+
+    def __init__(self, maxlen: Optional[int] = None, typecode: str = "q"):
+        super().__init__(maxlen, typecode)
+
+
+class Map:
+    """Dict keyed by short strings (product symbols) with values of one field type"""
+
+    def __init__(self, value_type):
+        self.value_type = value_type
+
+    def new(self):
+        return {}
+
+    def pack(self, value: Dict[str, Any], out: bytearray):
+        out += _COUNT.pack(len(value))
+        for key, item in value.items():
+            encoded = key.encode()
+            out += _KEY_LENGTH.pack(len(encoded))
+            out += encoded
+            self.value_type.pack(item, out)
+
+    def unpack(self, buffer: bytes, offset: int) -> Tuple[Any, int]:
+        count = _COUNT.unpack_from(buffer, offset)[0]
+        offset += 4
+        value = {}
+        for _ in range(count):
+            length = buffer[offset]
+            key = bytes(buffer[offset + 1:offset + 1 + length]).decode()
+            value[key], offset = self.value_type.unpack(buffer, offset + 1 + length)
+        return value, offset
+
+
+class Packed:
+    """A class that packs itself: pack(out) on the value, unpack(buffer, offset, *args, **kwargs) on the class.
+
+        Packed(RingBuffer, 100)   # new() is RingBuffer(100); unpack gets the same arguments
+
+    The arguments are the constructor's, so a new or decoded value has the declared shape.
+    """
+
+    def __init__(self, cls, *args, **kwargs):
+        self.cls = cls
+        self.args = args
+        self.kwargs = kwargs
+
+    def new(self):
+        return self.cls(*self.args, **self.kwargs)
+
+    def pack(self, value, out: bytearray):
+        value.pack(out)
+
+    def unpack(self, buffer: bytes, offset: int) -> Tuple[Any, int]:
+        return self.cls.unpack(buffer, offset, *self.args, **self.kwargs)
+
+
+class Schema:
+    """An ordered set of named fields encoded as one base64 traderData string.
+
+        SCHEMA = Schema(last_price=Float(), log_returns=FloatSeries(100))
+        data = SCHEMA.decode(state.traderData)   # {"last_price": None, "log_returns": deque([])}
+        traderData = SCHEMA.encode(data)
+
+    Fields missing from the payload (an empty or older traderData) decode to their defaults,
+    so fields can be appended to a schema between rounds.
+    """
+
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def new(self) -> Dict[str, Any]:
+        return {name: field.new() for name, field in self.fields.items()}
+
+    def pack(self, value: Dict[str, Any], out: bytearray):
+        for name, field in self.fields.items():
+            field.pack(value[name] if name in value else field.new(), out)
+
+    def unpack(self, buffer: bytes, offset: int, count: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+        value = {}
+        for index, (name, field) in enumerate(self.fields.items()):
+            if count is not None and index >= count:
+                value[name] = field.new()
+            else:
+                value[name], offset = field.unpack(buffer, offset)
+        return value, offset
+
+    def encode(self, value: Dict[str, Any]) -> str:
+        out = bytearray(_HEADER.pack(VERSION, len(self.fields)))
+        self.pack(value, out)
+        return base64.b64encode(out).decode("ascii")
+
+    def decode(self, traderData: str) -> Dict[str, Any]:
+        if not traderData:
+            return self.new()
+        try:
+            buffer = memoryview(base64.b64decode(traderData))
+            version, count = _HEADER.unpack_from(buffer, 0)
+            if version != VERSION:
+                return self.new()
+            return self.unpack(buffer, _HEADER.size, count)[0]
+        except (ValueError, struct.error, IndexError, UnicodeDecodeError) as e:
+            print(f"Error decoding traderData: {e}")
+            return self.new()
@@ -1,9 +1,12 @@
 from datamodel import OrderDepth, UserId, TradingState, Order
+from order_router import route
+from handlers import HandlerRegistry
+from fair_value import FairValueEstimator
 from typing import List, Dict
 import numpy as np
-import statistics as stat
 import math
-import jsonpickle
+from trader_codec import Schema, Map, Float, FloatSeries, Packed
+from rolling import RollingWindow
 
 class Trader:
     
@@ -13,13 +16,22 @@ class Trader:
         self.position_limits = {"KELP": 50,"RAINFOREST_RESIN": 50, "SQUID_INK":50}
         self.risk_adjustment = 0.5
         self.max_spread_pct = 0.02  # Maximum acceptable spread percentage
+        self.fair_value = FairValueEstimator()  # Mid and VWAP in one pass over the cached levels
         
         # Data storage
         self.historical_prices = {}  # Stores historical prices for each product
+        self.recent_prices = {}  # Last 5 prices for the market making volatility
         self.ema_short = {}  # Short-term EMA (fast)
         self.ema_long = {}  # Long-term EMA (slow)
         self.spread_history = {}  # Tracks bid-ask spreads
         self.volume_history = {}  # Tracks trading volume
+        self.persistence_schema = persistence_schema(self.window_size)
+
+        # Strategy per product; products that are not listed are skipped
+        self.handlers = HandlerRegistry()
+        self.handlers.register("RAINFOREST_RESIN", lambda state, data: self.handle_resin(state), ["RAINFOREST_RESIN"])
+        for product in ["KELP", "SQUID_INK"]:
+            self.handlers.register(product, lambda state, data, product=product: self.handle_others(state, product), [product])
         
     def update_emas(self, product: str, current_price: float):
         """Update exponential moving averages using only basic math"""
@@ -32,43 +44,24 @@ class Trader:
             # Long-term EMA (slower reaction)
             self.ema_long[product] = 0.05 * current_price + 0.95 * self.ema_long[product]
     
-    def calculate_vwap(self, order_depth: OrderDepth) -> float:
-        """Calculate Volume Weighted Average Price without pandas"""
-        total_volume = 0
-        total_value = 0
-        
-        for price, volume in order_depth.buy_orders.items():
-            total_value += price * abs(volume)
-            total_volume += abs(volume)
-            
-        for price, volume in order_depth.sell_orders.items():
-            total_value += price * abs(volume)
-            total_volume += abs(volume)
-            
-        return total_value / total_volume if total_volume > 0 else None
-    
     def calculate_fair_price(self, product: str, order_depth: OrderDepth) -> float:
         """Calculate fair price using multiple indicators"""
-        if len(order_depth.sell_orders) == 0 or len(order_depth.buy_orders) == 0:
+        book = self.fair_value.estimate(order_depth)
+        if book is None:
             return None
             
-        best_bid = max(order_depth.buy_orders.keys())
-        best_ask = min(order_depth.sell_orders.keys())
-        mid_price = (best_bid + best_ask) / 2
+        # Plain mid: on the round 1 days it beats the MM-mid and microprice as this strategy's anchor
+        mid_price = book.mid
         
-        # Update historical prices
+        # Update historical prices (the window keeps only the most recent window_size prices)
         if product not in self.historical_prices:
-            self.historical_prices[product] = []
+            self.historical_prices[product] = RollingWindow(self.window_size)
+            self.recent_prices[product] = RollingWindow(5)
         self.historical_prices[product].append(mid_price)
+        self.recent_prices[product].append(mid_price)
         
-        # Keep only the most recent prices
-        if len(self.historical_prices[product]) > self.window_size:
-            self.historical_prices[product] = self.historical_prices[product][-self.window_size:]
-        
-        # Calculate VWAP
-        vwap = self.calculate_vwap(order_depth)
-        if vwap is None:
-            vwap = mid_price
+        # VWAP over every level of both sides
+        vwap = book.vwap
             
         # Update EMAs
         self.update_emas(product, mid_price)
@@ -76,9 +69,9 @@ class Trader:
         # Calculate statistical indicators
         sma = None
         std_dev = None
-        if len(self.historical_prices[product]) >= self.window_size:
-            sma = stat.mean(self.historical_prices[product])
-            std_dev = stat.stdev(self.historical_prices[product]) if len(self.historical_prices[product]) > 1 else 0
+        if self.historical_prices[product].full:
+            sma = self.historical_prices[product].mean
+            std_dev = self.historical_prices[product].stdev
             
         # Combine indicators (weighted average)
         if sma is not None and std_dev is not None:
@@ -111,22 +104,18 @@ class Trader:
         if len(order_depth.sell_orders) == 0 or len(order_depth.buy_orders) == 0:
             return None, None
             
-        best_bid = max(order_depth.buy_orders.keys())
-        best_ask = min(order_depth.sell_orders.keys())
+        best_bid = order_depth.best_bid
+        best_ask = order_depth.best_ask
         current_spread = best_ask - best_bid
         spread_pct = current_spread / best_bid if best_bid > 0 else 0
         
-        # Update spread history
+        # Update spread history (the window keeps only recent spreads)
         if product not in self.spread_history:
-            self.spread_history[product] = []
+            self.spread_history[product] = RollingWindow(self.window_size)
         self.spread_history[product].append(spread_pct)
-        
-        # Keep only recent spreads
-        if len(self.spread_history[product]) > self.window_size:
-            self.spread_history[product] = self.spread_history[product][-self.window_size:]
-            
+
         # Calculate average spread
-        avg_spread = stat.mean(self.spread_history[product]) if self.spread_history[product] else 0
+        avg_spread = self.spread_history[product].mean or 0
         
         return current_spread, avg_spread
     
@@ -156,9 +145,9 @@ class Trader:
         orders = []
         
         # Calculate dynamic spread based on volatility
-        if len(self.historical_prices.get(product, [])) >= 5:
-            recent_prices = self.historical_prices[product][-5:]
-            volatility = stat.stdev(recent_prices) / stat.mean(recent_prices) if len(recent_prices) > 1 else 0
+        if product in self.recent_prices and self.recent_prices[product].full:
+            recent_prices = self.recent_prices[product]
+            volatility = recent_prices.stdev / recent_prices.mean
         else:
             volatility = 0
             
@@ -198,8 +187,8 @@ class Trader:
         orders = self.market_make(product, fair_price, position, position_limit, avg_spread or 0.01)
         
         # Add aggressive orders when price is far from fair value
-        best_bid = max(order_depth.buy_orders.keys()) if order_depth.buy_orders else 0
-        best_ask = min(order_depth.sell_orders.keys()) if order_depth.sell_orders else 0
+        best_bid = order_depth.best_bid if order_depth.buy_orders else 0
+        best_ask = order_depth.best_ask if order_depth.sell_orders else 0
         
         if best_ask < fair_price * 0.995:  # Good buying opportunity
             buy_qty = self.calculate_order_quantity(product, best_ask, fair_price, position, position_limit)
@@ -245,14 +234,9 @@ class Trader:
         return orders
     
     def run(self, state: TradingState):
-        result = {}
-        conversions = 0
         print(state.traderData)
         # convert state.traderData to self
-        if state.traderData == "":
-            persistence_Data = Persistence_Data({},{},{},{},{})
-        else:
-            persistence_Data = jsonpickle.decode(state.traderData)
+        persistence_Data = Persistence_Data(**self.persistence_schema.decode(state.traderData))
 
         # Data storage
         self.historical_prices = persistence_Data.historical_prices  # Stores historical prices for each product
@@ -260,22 +244,32 @@ class Trader:
         self.ema_long = persistence_Data.ema_long  # Long-term EMA (slow)
         self.spread_history = persistence_Data.spread_history  # Tracks bid-ask spreads
         self.volume_history = persistence_Data.volume_history  # Tracks trading volume
+        self.recent_prices = persistence_Data.recent_prices
         
-        for product in state.order_depths:
-            
-            if product in ['RAINFOREST_RESIN']:
-                orders = self.handle_resin(state)
-            else:
-                orders = self.handle_others(state, product)
-            result[product] = orders
-        
-        return result, conversions, jsonpickle.encode(persistence_Data)
+        result, conversions = self.handlers.run(state, vars(persistence_Data))
+
+        # Merge, net and clip to the limits so no product's batch is rejected
+        result = route(result, state.position, self.position_limits, default_limit=50)
+        return result, conversions, self.persistence_schema.encode(vars(persistence_Data))
 
 
 class Persistence_Data(object):
-    def __init__(self, historical_prices, ema_short, ema_long, spread_history, volume_history):
+    def __init__(self, historical_prices, ema_short, ema_long, spread_history, volume_history, recent_prices=None):
         self.historical_prices = historical_prices
         self.ema_short = ema_short
         self.ema_long = ema_long
         self.spread_history = spread_history
         self.volume_history = volume_history
+        self.recent_prices = recent_prices if recent_prices is not None else {}
+
+
+def persistence_schema(window_size: int) -> Schema:
+    """traderData layout of Persistence_Data, histories kept to the Trader's window_size"""
+    return Schema(
+        historical_prices=Map(Packed(RollingWindow, window_size)),
+        ema_short=Map(Float()),
+        ema_long=Map(Float()),
+        spread_history=Map(Packed(RollingWindow, window_size)),
+        volume_history=Map(FloatSeries(window_size)),
+        recent_prices=Map(Packed(RollingWindow, 5)),
+    )
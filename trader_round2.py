@@ -1,6 +1,11 @@
 from datamodel import OrderDepth, TradingState, Order
-from typing import List, Dict, Optional
-import jsonpickle
+from typing import List, Dict, Optional, Tuple
+from trader_codec import Schema, Packed
+from ring_buffer import RingBuffer
+from basket import BasketBook
+from basket_arbitrage import BasketArbitrage
+from order_router import route
+from fair_value import FairValueEstimator, FairValues
 import numpy as np
 import math
 
@@ -33,6 +38,11 @@ PARAMS = {
         "base_edge": 2,
         "volatility_window": 15
     },
+    # Hedged cross-basket arbitrage: minimum total edge to act on, and the solver's time budget
+    "ARBITRAGE": {
+        "min_edge": 10,
+        "deadline_ms": 10
+    },
     Product.CROISSANTS: {
         "ema_alpha": 0.2,
         "position_penalty": 0.05,
@@ -62,23 +72,33 @@ class Trader:
         self.spread_history = {basket: [] for basket in BASKET_COMPOSITION}
         self.volatility = {basket: 0 for basket in BASKET_COMPOSITION}
         self.component_emas = {comp: None for comp in [Product.CROISSANTS, Product.JAMS, Product.DJEMBE]}
+        self.estimators = {comp: FairValueEstimator() for comp in self.component_emas}
+        self.baskets = BasketBook(BASKET_COMPOSITION)
+        self.arbitrage = BasketArbitrage(self.baskets, self.position_limits, PARAMS["ARBITRAGE"]["min_edge"], PARAMS["ARBITRAGE"]["deadline_ms"])
+        # Spread histories decode straight into NumPy ring buffers of each basket's spread_window,
+        # carrying their running mean/variance with them
+        self.schema = Schema(**{
+            f"{basket}_spreads": Packed(RingBuffer, PARAMS[basket]["spread_window"]) for basket in BASKET_COMPOSITION
+        })
 
     def update_ema(self, new_value: float, current_ema: Optional[float], alpha: float) -> float:
         if current_ema is None:
             return new_value
         return alpha * new_value + (1 - alpha) * current_ema
 
-    def calculate_component_mids(self, state: TradingState) -> Dict[str, Optional[float]]:
+    def estimate_components(self, state: TradingState) -> Dict[str, Optional[FairValues]]:
+        """This tick's book fair values per component, None where a side is empty or it is not listed"""
+        return {
+            product: self.estimators[product].estimate(state.order_depths[product]) if product in state.order_depths else None
+            for product in self.estimators
+        }
+
+    def calculate_component_mids(self, books: Dict[str, Optional[FairValues]]) -> Dict[str, Optional[float]]:
         mids = {}
         for product in [Product.CROISSANTS, Product.JAMS, Product.DJEMBE]:
-            depth = state.order_depths.get(product)
-            current_mid = None
-            
-            # Get current market mid if available
-            if depth and depth.sell_orders and depth.buy_orders:
-                best_ask = min(depth.sell_orders.keys())
-                best_bid = max(depth.buy_orders.keys())
-                current_mid = (best_ask + best_bid) / 2
+            book = books[product]
+
+            current_mid = book.mid if book is not None else None
             
             # Update EMA with current mid or maintain previous value
             self.component_emas[product] = current_mid if current_mid else self.component_emas[product]
@@ -88,55 +108,52 @@ class Trader:
             
         return mids
 
-    def calculate_basket_fair_value(self, basket: str, component_mids: Dict[str, Optional[float]]) -> Optional[float]:
-        try:
-            total = 0
-            for product, qty in BASKET_COMPOSITION[basket].items():
-                if component_mids.get(product) is None:
-                    return None
-                total += qty * component_mids[product]
-            return total
-        except KeyError:
-            return None
+    def calculate_basket_fair_values(self, component_mids: Dict[str, Optional[float]]) -> Dict[str, Optional[float]]:
+        """Composition-weighted component mids for every basket in one pass, None where a component mid is missing"""
+        mids = np.array([np.nan if component_mids.get(c) is None else component_mids[c] for c in self.baskets.components])
+        return {basket: None if math.isnan(value) else float(value) for basket, value in zip(self.baskets.baskets, self.baskets.combine(mids))}
 
     def calculate_spread_zscore(self, basket: str, spread: float, traderData: Dict) -> float:
-        history = traderData.get(f"{basket}_spreads", [])
+        history = traderData[f"{basket}_spreads"]
         history.append(spread)
-        history = history[-PARAMS[basket]["spread_window"]:]
-        traderData[f"{basket}_spreads"] = history
         
         if len(history) < 2:
             return 0
             
-        spread_mean = np.mean(history)
-        spread_std = np.std(history)
+        spread_mean = history.mean
+        spread_std = history.std
         return (spread - spread_mean) / spread_std if spread_std != 0 else 0
 
     def calculate_volatility(self, basket: str, traderData: Dict) -> float:
-        spreads = traderData.get(f"{basket}_spreads", [])
+        spreads = traderData[f"{basket}_spreads"]
         if len(spreads) < 2:
             return 0
-        return np.std(spreads[-PARAMS[basket]["volatility_window"]:])
+        # Zero-copy view of the newest volatility_window spreads
+        return np.std(spreads.window(PARAMS[basket]["volatility_window"]))
 
-    def generate_basket_orders(self, basket: str, state: TradingState, traderData: Dict) -> List[Order]:
+    def update_basket_signal(self, basket: str, state: TradingState, traderData: Dict, fair_value: Optional[float]) -> Optional[Tuple[float, float]]:
+        """Record this tick's spread against the basket's fair value; (zscore, volatility), None without a fair value"""
         params = PARAMS[basket]
         depth = state.order_depths[basket]
-        position = state.position.get(basket, 0)
-        
-        # Calculate fair value and spread
-        component_mids = self.calculate_component_mids(state)
-        fair_value = self.calculate_basket_fair_value(basket, component_mids)
         if fair_value is None:
-            return []
+            return None
 
-        best_bid = max(depth.buy_orders.keys(), default=fair_value - params["base_edge"])
-        best_ask = min(depth.sell_orders.keys(), default=fair_value + params["base_edge"])
+        best_bid = depth.best_bid if depth.buy_orders else fair_value - params["base_edge"]
+        best_ask = depth.best_ask if depth.sell_orders else fair_value + params["base_edge"]
         market_mid = (best_ask + best_bid) / 2
         spread = market_mid - fair_value
+        return self.calculate_spread_zscore(basket, spread, traderData), self.calculate_volatility(basket, traderData)
+
+    def generate_basket_orders(self, basket: str, state: TradingState, traderData: Dict, fair_value: Optional[float]) -> List[Order]:
+        params = PARAMS[basket]
+        depth = state.order_depths[basket]
+        position = state.position.get(basket, 0)
         
-        # Statistical calculations
-        zscore = self.calculate_spread_zscore(basket, spread, traderData)
-        volatility = self.calculate_volatility(basket, traderData)
+        # Spread against the basket's fair value
+        signal = self.update_basket_signal(basket, state, traderData, fair_value)
+        if signal is None:
+            return []
+        zscore, volatility = signal
         
         # Dynamic pricing
         edge_adjustment = params["base_edge"] * (1 + abs(zscore) + volatility * 2)
@@ -161,28 +178,23 @@ class Trader:
             if bid_volume > 0:
                 orders.append(Order(basket, int(fair_value), -bid_volume))
         
-        # Market making orders
-        remaining_buy = self.position_limits[basket] - position
-        if remaining_buy > 0:
-            orders.append(Order(basket, bid_price, remaining_buy))
-                
-        remaining_sell = self.position_limits[basket] + position
-        if remaining_sell > 0:
-            orders.append(Order(basket, ask_price, -remaining_sell))
+        # Market making orders for the full limit; route trims them to the room left after the take
+        orders.append(Order(basket, bid_price, self.position_limits[basket]))
+        orders.append(Order(basket, ask_price, -self.position_limits[basket]))
                 
         return orders
 
-    def generate_component_orders(self, product: str, state: TradingState) -> List[Order]:
+    def generate_component_orders(self, product: str, state: TradingState, book: Optional[FairValues]) -> List[Order]:
         params = PARAMS[product]
         depth = state.order_depths[product]
         position = state.position.get(product, 0)
         
-        if not depth.sell_orders or not depth.buy_orders:
+        if book is None:
             return []
             
-        best_ask = min(depth.sell_orders.keys())
-        best_bid = max(depth.buy_orders.keys())
-        mid_price = (best_ask + best_bid) / 2
+        best_ask = depth.best_ask
+        best_bid = depth.best_bid
+        mid_price = book.mid
         
         # Spread calculation with integer conversion
         position_penalty = params["position_penalty"] * abs(position)
@@ -190,32 +202,37 @@ class Trader:
         bid_price = int(round(mid_price - spread/2))
         ask_price = int(round(mid_price + spread/2))
         
-        orders = []
-        buy_capacity = self.position_limits[product] - position
-        if buy_capacity > 0:
-            orders.append(Order(product, bid_price, buy_capacity))
-            
-        sell_capacity = self.position_limits[product] + position
-        if sell_capacity > 0:
-            orders.append(Order(product, ask_price, -sell_capacity))
-            
-        return orders
+        # Quote the full limit on both sides; route trims each side to the room the position leaves
+        return [Order(product, bid_price, self.position_limits[product]), Order(product, ask_price, -self.position_limits[product])]
 
     def run(self, state: TradingState) -> (Dict[str, List[Order]], int, str):
-        traderData = jsonpickle.decode(state.traderData) if state.traderData else {}
-        
-        result = {}
-        
-        # Process baskets
-        for basket in BASKET_COMPOSITION:
-            if basket in state.order_depths:
-                result[basket] = self.generate_basket_orders(basket, state, traderData)
-        
+        traderData = self.schema.decode(state.traderData)
+
+        # Both baskets and their components are sized jointly for any hedged arbitrage first; the
+        # products it trades skip the per-product logic this tick, so none of its work is thrown away
+        arbitrage_orders = self.arbitrage.orders(state.order_depths, state.position)
+        result = dict(arbitrage_orders)
+
+        # Process baskets, fair values for all of them come from one composition-matrix product
+        books = self.estimate_components(state)
+        listed_baskets = [basket for basket in BASKET_COMPOSITION if basket in state.order_depths]
+        if listed_baskets:
+            fair_values = self.calculate_basket_fair_values(self.calculate_component_mids(books))
+        for basket in listed_baskets:
+            if basket in arbitrage_orders:
+                # Keep the spread statistics continuous for the ticks the basket trades on its own
+                self.update_basket_signal(basket, state, traderData, fair_values[basket])
+            else:
+                result[basket] = self.generate_basket_orders(basket, state, traderData, fair_values[basket])
+
         # Process components
         for product in [Product.CROISSANTS, Product.JAMS, Product.DJEMBE]:
-            if product in state.order_depths:
-                result[product] = self.generate_component_orders(product, state)
-        
+            if product in state.order_depths and product not in arbitrage_orders:
+                result[product] = self.generate_component_orders(product, state, books[product])
+
+        # Merge, net and clip to the limits so no product's batch is rejected
+        result = route(result, state.position, self.position_limits)
+
         # Serialize trader data
-        traderData = jsonpickle.encode(traderData)
+        traderData = self.schema.encode(traderData)
         return result, 0, traderData
\ No newline at end of file
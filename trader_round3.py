@@ -1,7 +1,17 @@
-from datamodel import OrderDepth, UserId, TradingState, Order, ConversionObservation
-from typing import List, Dict, Any
+from datamodel import OrderDepth, UserId, TradingState, Order, ConversionObservation, Trade
+from typing import List, Dict, Any, Optional
 import json
-import jsonpickle
+from trader_codec import Schema, Float, Bool, FloatSeries, Packed
+from ring_buffer import RingBuffer
+from option_pricing import OptionChain, fit_smile, smile_vol
+from hedging import DeltaHedger, net_delta
+from basket import BasketBook, sweep_price
+from order_router import route
+from handlers import HandlerRegistry
+from conversion import ConversionPlanner
+from fair_value import FairValueEstimator, trade_flow
+from rls import RecursiveLeastSquares
+import normal_table
 import numpy as np
 import math
 
@@ -36,12 +46,21 @@ PARAMS = {
         "clear_width": 0,
         "prevent_adverse": True,
         "adverse_volume": 15,
-        "reversion_beta": -0.229,
+        "reversion_beta": -0.229,  # prior weight of the last mid change, refitted online
+        "rls_forgetting": 0.999,
+        "rls_delta": 1.0,  # starting P = delta * I, loose enough for the data to move the prior within the first ticks
         "starfruit_min_edge": 2,
     },
     Product.ORCHIDS: {
         "make_edge": 2,
         "make_probability": 0.800,
+        "storage_cost": 0.1,  # per unit held long per tick until it converts
+        "conversion_limit": None,  # units per tick, None for no cap
+        "horizon": 1,  # ticks within which bought / sold units must convert
+    },
+    Product.VOLCANIC_ROCK: {
+        "hedge_band": 20,  # rebalance the rock hedge only once it is this many units off target
+        "hedge_max_order": 100,
     },
     Product.SPREAD: {
         "default_spread_mean": 379.50439988484239,
@@ -90,11 +109,58 @@ class Trader:
             Product.VOLCANIC_ROCK_VOUCHER_10500
         ]
         self.strikes = [9500, 9750, 10000, 10250, 10500]
+        self.chain = None
+        self.baskets = None
+        self.hedger = None
+        self.orchids_planner = None
+        self.starfruit_estimator = None
+        self.spread_estimator = None
         self.threshold = 1  # Trading threshold in SeaShells
 
-    # Cumulative normal distribution function using error function
+        # Strategies per product; each runs only while its books are listed and declares the
+        # traderObject fields it keeps (histories decode straight into NumPy ring buffers)
+        self.handlers = HandlerRegistry()
+        self.handlers.register(
+            "vouchers", self.trade_vouchers, [Product.VOLCANIC_ROCK], setup=self.setup_vouchers,
+            state={
+                "last_price": Float(),
+                "log_returns": Packed(RingBuffer, 100),
+                # Last tick's implied vols per strike (NaN where unsolved), warm-starts the solver
+                "voucher_ivs": FloatSeries(len(self.strikes)),
+            },
+        )
+        if Product.AMETHYSTS in self.params:
+            self.handlers.register(Product.AMETHYSTS, self.trade_amethysts, [Product.AMETHYSTS])
+        if Product.STARFRUIT in self.params:
+            self.handlers.register(Product.STARFRUIT, self.trade_starfruit, [Product.STARFRUIT],
+                                   state={
+                                       "starfruit_last_price": Float(),
+                                       # Next MM-mid change ~ [last change, book imbalance, trade flow]
+                                       "starfruit_model": Packed(
+                                           RecursiveLeastSquares, 3, self.params[Product.STARFRUIT]["rls_forgetting"], self.params[Product.STARFRUIT]["rls_delta"],
+                                           prior=[self.params[Product.STARFRUIT]["reversion_beta"], 0, 0]
+                                       ),
+                                       "starfruit_features": FloatSeries(3),
+                                   }, setup=self.setup_starfruit)
+        if Product.ORCHIDS in self.params:
+            self.handlers.register(Product.ORCHIDS, self.trade_orchids, [Product.ORCHIDS], observations=[Product.ORCHIDS],
+                                   setup=self.setup_orchids)
+        self.handlers.register(
+            Product.SPREAD, self.trade_spread, [Product.GIFT_BASKET, *BASKET_WEIGHTS], setup=self.setup_spread,
+            state={
+                Product.SPREAD: Schema(
+                    spread_history=Packed(RingBuffer, self.params[Product.SPREAD]["spread_std_window"]),
+                    prev_zscore=Float(0),
+                    clear_flag=Bool(),
+                    curr_avg=Float(0),
+                ),
+            },
+        )
+        self.schema = self.handlers.schema()
+
+    # Cumulative normal distribution function, shared with option_pricing
     def N(self, x):
-        return (1 + math.erf(x / math.sqrt(2))) / 2
+        return normal_table.cdf(x)
 
     # Black-Scholes call option pricing
     def black_scholes_call(self, S, K, T, sigma, r=0):
@@ -105,11 +171,16 @@ class Trader:
         C = S * self.N(d1) - K * math.exp(-r * T) * self.N(d2)
         return C
 
+    def voucher_mid(self, order_depth: OrderDepth) -> float:
+        if order_depth is None or not order_depth.buy_orders or not order_depth.sell_orders:
+            return float("nan")
+        return (order_depth.best_bid + order_depth.best_ask) / 2
+
     # Existing methods from template (unchanged for brevity)
     def take_best_orders(self, product: str, fair_value: int, take_width: float, orders: List[Order], order_depth: OrderDepth, position: int, buy_order_volume: int, sell_order_volume: int, prevent_adverse: bool = False, adverse_volume: int = 0) -> (int, int):
         position_limit = self.LIMIT[product]
         if len(order_depth.sell_orders) != 0:
-            best_ask = min(order_depth.sell_orders.keys())
+            best_ask = order_depth.best_ask
             best_ask_amount = -1 * order_depth.sell_orders[best_ask]
             if best_ask <= fair_value - take_width:
                 quantity = min(best_ask_amount, position_limit - position)
@@ -120,7 +191,7 @@ class Trader:
                     if order_depth.sell_orders[best_ask] == 0:
                         del order_depth.sell_orders[best_ask]
         if len(order_depth.buy_orders) != 0:
-            best_bid = max(order_depth.buy_orders.keys())
+            best_bid = order_depth.best_bid
             best_bid_amount = order_depth.buy_orders[best_bid]
             if best_bid >= fair_value + take_width:
                 quantity = min(best_bid_amount, position_limit + position)
@@ -135,7 +206,7 @@ class Trader:
     def take_best_orders_with_adverse(self, product: str, fair_value: int, take_width: float, orders: List[Order], order_depth: OrderDepth, position: int, buy_order_volume: int, sell_order_volume: int, adverse_volume: int) -> (int, int):
         position_limit = self.LIMIT[product]
         if len(order_depth.sell_orders) != 0:
-            best_ask = min(order_depth.sell_orders.keys())
+            best_ask = order_depth.best_ask
             best_ask_amount = -1 * order_depth.sell_orders[best_ask]
             if abs(best_ask_amount) <= adverse_volume and best_ask <= fair_value - take_width:
                 quantity = min(best_ask_amount, position_limit - position)
@@ -146,7 +217,7 @@ class Trader:
                     if order_depth.sell_orders[best_ask] == 0:
                         del order_depth.sell_orders[best_ask]
         if len(order_depth.buy_orders) != 0:
-            best_bid = max(order_depth.buy_orders.keys())
+            best_bid = order_depth.best_bid
             best_bid_amount = order_depth.buy_orders[best_bid]
             if abs(best_bid_amount) <= adverse_volume and best_bid >= fair_value + take_width:
                 quantity = min(best_bid_amount, position_limit + position)
@@ -159,61 +230,51 @@ class Trader:
         return buy_order_volume, sell_order_volume
 
     def market_make(self, product: str, orders: List[Order], bid: int, ask: int, position: int, buy_order_volume: int, sell_order_volume: int) -> (int, int):
-        buy_quantity = self.LIMIT[product] - (position + buy_order_volume)
-        if buy_quantity > 0:
-            orders.append(Order(product, round(bid), buy_quantity))
-        sell_quantity = self.LIMIT[product] + (position - sell_order_volume)
-        if sell_quantity > 0:
-            orders.append(Order(product, round(ask), -sell_quantity))
+        # Quotes go after the take and clear orders, so route trims them to the room those leave
+        orders.append(Order(product, round(bid), self.LIMIT[product]))
+        orders.append(Order(product, round(ask), -self.LIMIT[product]))
         return buy_order_volume, sell_order_volume
 
     def clear_position_order(self, product: str, fair_value: float, width: int, orders: List[Order], order_depth: OrderDepth, position: int, buy_order_volume: int, sell_order_volume: int) -> List[Order]:
         position_after_take = position + buy_order_volume - sell_order_volume
         fair_for_bid = round(fair_value - width)
         fair_for_ask = round(fair_value + width)
-        buy_quantity = self.LIMIT[product] - (position + buy_order_volume)
-        sell_quantity = self.LIMIT[product] + (position - sell_order_volume)
+        # Clearing only ever reduces the position, so it always fits the limit
         if position_after_take > 0:
             clear_quantity = sum(volume for price, volume in order_depth.buy_orders.items() if price >= fair_for_ask)
             clear_quantity = min(clear_quantity, position_after_take)
-            sent_quantity = min(sell_quantity, clear_quantity)
-            if sent_quantity > 0:
-                orders.append(Order(product, fair_for_ask, -abs(sent_quantity)))
-                sell_order_volume += abs(sent_quantity)
+            if clear_quantity > 0:
+                orders.append(Order(product, fair_for_ask, -clear_quantity))
+                sell_order_volume += clear_quantity
         if position_after_take < 0:
             clear_quantity = sum(abs(volume) for price, volume in order_depth.sell_orders.items() if price <= fair_for_bid)
-            clear_quantity = min(clear_quantity, abs(position_after_take))
-            sent_quantity = min(buy_quantity, clear_quantity)
-            if sent_quantity > 0:
-                orders.append(Order(product, fair_for_bid, abs(sent_quantity)))
-                buy_order_volume += abs(sent_quantity)
+            clear_quantity = min(clear_quantity, -position_after_take)
+            if clear_quantity > 0:
+                orders.append(Order(product, fair_for_bid, clear_quantity))
+                buy_order_volume += clear_quantity
         return buy_order_volume, sell_order_volume
 
-    def starfruit_fair_value(self, order_depth: OrderDepth, traderObject) -> float:
-        if len(order_depth.sell_orders) != 0 and len(order_depth.buy_orders) != 0:
-            best_ask = min(order_depth.sell_orders.keys())
-            best_bid = max(order_depth.buy_orders.keys())
-            filtered_ask = [price for price in order_depth.sell_orders.keys() if abs(order_depth.sell_orders[price]) >= self.params[Product.STARFRUIT]["adverse_volume"]]
-            filtered_bid = [price for price in order_depth.buy_orders.keys() if abs(order_depth.buy_orders[price]) >= self.params[Product.STARFRUIT]["adverse_volume"]]
-            mm_ask = min(filtered_ask) if len(filtered_ask) > 0 else None
-            mm_bid = max(filtered_bid) if len(filtered_bid) > 0 else None
-            if mm_ask is None or mm_bid is None:
-                if traderObject.get("starfruit_last_price", None) is None:
-                    mmmid_price = (best_ask + best_bid) / 2
-                else:
-                    mmmid_price = traderObject["starfruit_last_price"]
-            else:
-                mmmid_price = (mm_ask + mm_bid) / 2
-            if traderObject.get("starfruit_last_price", None) is not None:
-                last_price = traderObject["starfruit_last_price"]
-                last_returns = (mmmid_price - last_price) / last_price
-                pred_returns = last_returns * self.params[Product.STARFRUIT]["reversion_beta"]
-                fair = mmmid_price + (mmmid_price * pred_returns)
-            else:
-                fair = mmmid_price
-            traderObject["starfruit_last_price"] = mmmid_price
-            return fair
-        return None
+    def starfruit_fair_value(self, order_depth: OrderDepth, traderObject, market_trades: List[Trade] = ()) -> float:
+        book = self.starfruit_estimator.estimate(order_depth)
+        if book is None:
+            return None
+        # Market maker's mid; without MM quotes on both sides, hold the last one (or the plain mid)
+        mmmid_price = book.mm_mid_or(traderObject["starfruit_last_price"])
+        if mmmid_price is None:
+            mmmid_price = book.mid
+        if traderObject["starfruit_last_price"] is not None:
+            last_price = traderObject["starfruit_last_price"]
+            # Fit last tick's features to the change they preceded, then predict the next change
+            model, previous_features = traderObject["starfruit_model"], traderObject["starfruit_features"]
+            if len(previous_features) == model.n_features:
+                model.update(previous_features, mmmid_price - last_price)
+            features = [mmmid_price - last_price, book.imbalance, trade_flow(market_trades, mmmid_price)]
+            previous_features.extend(features)
+            fair = mmmid_price + model.predict(features)
+        else:
+            fair = mmmid_price
+        traderObject["starfruit_last_price"] = mmmid_price
+        return fair
 
     def make_amethyst_orders(self, order_depth: OrderDepth, fair_value: int, position: int, buy_order_volume: int, sell_order_volume: int, volume_limit: int) -> (List[Order], int, int):
         orders: List[Order] = []
@@ -250,112 +311,30 @@ class Trader:
         buy_order_volume, sell_order_volume = self.market_make(Product.STARFRUIT, orders, bbbf + 1, baaf - 1, position, buy_order_volume, sell_order_volume)
         return orders, buy_order_volume, sell_order_volume
 
-    def orchids_implied_bid_ask(self, observation: ConversionObservation) -> (float, float):
-        return (
-            observation.bidPrice - observation.exportTariff - observation.transportFees - 0.1,
-            observation.askPrice + observation.importTariff + observation.transportFees
-        )
-
-    def orchids_arb_take(self, order_depth: OrderDepth, observation: ConversionObservation, position: int) -> (List[Order], int, int):
-        orders: List[Order] = []
-        position_limit = self.LIMIT[Product.ORCHIDS]
-        buy_order_volume = 0
-        sell_order_volume = 0
-        implied_bid, implied_ask = self.orchids_implied_bid_ask(observation)
-        buy_quantity = position_limit - position
-        sell_quantity = position_limit + position
-        ask = round(observation.askPrice) - 2
-        edge = (ask - implied_ask) * self.params[Product.ORCHIDS]["make_probability"] if ask > implied_ask else 0
-        for price in sorted(list(order_depth.sell_orders.keys())):
-            if price >= implied_bid - edge:
-                break
-            quantity = min(abs(order_depth.sell_orders[price]), buy_quantity)
-            if quantity > 0:
-                orders.append(Order(Product.ORCHIDS, round(price), quantity))
-                buy_order_volume += quantity
-        for price in sorted(list(order_depth.buy_orders.keys()), reverse=True):
-            if price <= implied_ask + edge:
-                break
-            quantity = min(abs(order_depth.buy_orders[price]), sell_quantity)
-            if quantity > 0:
-                orders.append(Order(Product.ORCHIDS, round(price), -quantity))
-                sell_order_volume += quantity
-        return orders, buy_order_volume, sell_order_volume
-
-    def orchids_arb_clear(self, position: int) -> int:
-        return -position
-
-    def orchids_arb_make(self, observation: ConversionObservation, position: int, buy_order_volume: int, sell_order_volume: int) -> (List[Order], int, int):
-        orders: List[Order] = []
-        position_limit = self.LIMIT[Product.ORCHIDS]
-        implied_bid, implied_ask = self.orchids_implied_bid_ask(observation)
-        aggressive_ask = round(observation.askPrice) - 2
-        aggressive_bid = round(observation.bidPrice) + 2
-        bid = aggressive_bid if aggressive_bid < implied_bid else implied_bid - 1
-        ask = aggressive_ask if aggressive_ask >= implied_ask + 0.5 else (aggressive_ask + 1 if aggressive_ask + 1 >= implied_ask + 0.5 else implied_ask + 2)
-        buy_quantity = position_limit - (position + buy_order_volume)
-        if buy_quantity > 0:
-            orders.append(Order(Product.ORCHIDS, round(bid), buy_quantity))
-        sell_quantity = position_limit + (position - sell_order_volume)
-        if sell_quantity > 0:
-            orders.append(Order(Product.ORCHIDS, round(ask), -sell_quantity))
-        return orders, buy_order_volume, sell_order_volume
-
-    def get_swmid(self, order_depth) -> float:
-        best_bid = max(order_depth.buy_orders.keys())
-        best_ask = min(order_depth.sell_orders.keys())
-        best_bid_vol = abs(order_depth.buy_orders[best_bid])
-        best_ask_vol = abs(order_depth.sell_orders[best_ask])
-        return (best_bid * best_ask_vol + best_ask * best_bid_vol) / (best_bid_vol + best_ask_vol)
+    def get_swmid(self, order_depth) -> Optional[float]:
+        book = self.spread_estimator.estimate(order_depth)
+        return book.microprice if book is not None else None
 
     def get_synthetic_basket_order_depth(self, order_depths: Dict[str, OrderDepth]) -> OrderDepth:
-        CHOCOLATE_PER_BASKET = BASKET_WEIGHTS[Product.CHOCOLATE]
-        STRAWBERRIES_PER_BASKET = BASKET_WEIGHTS[Product.STRAWBERRIES]
-        ROSES_PER_BASKET = BASKET_WEIGHTS[Product.ROSES]
-        synthetic_order_price = OrderDepth()
-        chocolate_best_bid = max(order_depths[Product.CHOCOLATE].buy_orders.keys()) if order_depths[Product.CHOCOLATE].buy_orders else 0
-        chocolate_best_ask = min(order_depths[Product.CHOCOLATE].sell_orders.keys()) if order_depths[Product.CHOCOLATE].sell_orders else float("inf")
-        strawberries_best_bid = max(order_depths[Product.STRAWBERRIES].buy_orders.keys()) if order_depths[Product.STRAWBERRIES].buy_orders else 0
-        strawberries_best_ask = min(order_depths[Product.STRAWBERRIES].sell_orders.keys()) if order_depths[Product.STRAWBERRIES].sell_orders else float("inf")
-        roses_best_bid = max(order_depths[Product.ROSES].buy_orders.keys()) if order_depths[Product.ROSES].buy_orders else 0
-        roses_best_ask = min(order_depths[Product.ROSES].sell_orders.keys()) if order_depths[Product.ROSES].sell_orders else float("inf")
-        implied_bid = chocolate_best_bid * CHOCOLATE_PER_BASKET + strawberries_best_bid * STRAWBERRIES_PER_BASKET + roses_best_bid * ROSES_PER_BASKET
-        implied_ask = chocolate_best_ask * CHOCOLATE_PER_BASKET + strawberries_best_ask * STRAWBERRIES_PER_BASKET + roses_best_ask * ROSES_PER_BASKET
-        if implied_bid > 0:
-            chocolate_bid_volume = order_depths[Product.CHOCOLATE].buy_orders[chocolate_best_bid] // CHOCOLATE_PER_BASKET
-            strawberries_bid_volume = order_depths[Product.STRAWBERRIES].buy_orders[strawberries_best_bid] // STRAWBERRIES_PER_BASKET
-            roses_bid_volume = order_depths[Product.ROSES].buy_orders[roses_best_bid] // ROSES_PER_BASKET
-            implied_bid_volume = min(chocolate_bid_volume, strawberries_bid_volume, roses_bid_volume)
-            synthetic_order_price.buy_orders[implied_bid] = implied_bid_volume
-        if implied_ask < float("inf"):
-            chocolate_ask_volume = -order_depths[Product.CHOCOLATE].sell_orders[chocolate_best_ask] // CHOCOLATE_PER_BASKET
-            strawberries_ask_volume = -order_depths[Product.STRAWBERRIES].sell_orders[strawberries_best_ask] // STRAWBERRIES_PER_BASKET
-            roses_ask_volume = -order_depths[Product.ROSES].sell_orders[roses_best_ask] // ROSES_PER_BASKET
-            implied_ask_volume = min(chocolate_ask_volume, strawberries_ask_volume, roses_ask_volume)
-            synthetic_order_price.sell_orders[implied_ask] = -implied_ask_volume
-        return synthetic_order_price
+        return self.baskets.synthetic_order_depth(order_depths, Product.GIFT_BASKET)
 
     def convert_synthetic_basket_orders(self, synthetic_orders: List[Order], order_depths: Dict[str, OrderDepth]) -> Dict[str, List[Order]]:
-        component_orders = {Product.CHOCOLATE: [], Product.STRAWBERRIES: [], Product.ROSES: []}
+        component_orders = {component: [] for component in BASKET_WEIGHTS}
         synthetic_basket_order_depth = self.get_synthetic_basket_order_depth(order_depths)
-        best_bid = max(synthetic_basket_order_depth.buy_orders.keys()) if synthetic_basket_order_depth.buy_orders else 0
-        best_ask = min(synthetic_basket_order_depth.sell_orders.keys()) if synthetic_basket_order_depth.sell_orders else float("inf")
+        best_bid = synthetic_basket_order_depth.best_bid if synthetic_basket_order_depth.buy_orders else 0
+        best_ask = synthetic_basket_order_depth.best_ask if synthetic_basket_order_depth.sell_orders else float("inf")
         for order in synthetic_orders:
             price = order.price
             quantity = order.quantity
+            # Each component order's limit price sweeps as deep into its book as the quantity needs
             if quantity > 0 and price >= best_ask:
-                chocolate_price = min(order_depths[Product.CHOCOLATE].sell_orders.keys())
-                strawberries_price = min(order_depths[Product.STRAWBERRIES].sell_orders.keys())
-                roses_price = min(order_depths[Product.ROSES].sell_orders.keys())
+                component_prices = {component: sweep_price(order_depths[component].asks, quantity * weight) for component, weight in BASKET_WEIGHTS.items()}
             elif quantity < 0 and price <= best_bid:
-                chocolate_price = max(order_depths[Product.CHOCOLATE].buy_orders.keys())
-                strawberries_price = max(order_depths[Product.STRAWBERRIES].buy_orders.keys())
-                roses_price = max(order_depths[Product.ROSES].buy_orders.keys())
+                component_prices = {component: sweep_price(order_depths[component].bids, -quantity * weight) for component, weight in BASKET_WEIGHTS.items()}
             else:
                 continue
-            component_orders[Product.CHOCOLATE].append(Order(Product.CHOCOLATE, chocolate_price, quantity * BASKET_WEIGHTS[Product.CHOCOLATE]))
-            component_orders[Product.STRAWBERRIES].append(Order(Product.STRAWBERRIES, strawberries_price, quantity * BASKET_WEIGHTS[Product.STRAWBERRIES]))
-            component_orders[Product.ROSES].append(Order(Product.ROSES, roses_price, quantity * BASKET_WEIGHTS[Product.ROSES]))
+            for component, weight in BASKET_WEIGHTS.items():
+                component_orders[component].append(Order(component, component_prices[component], quantity * weight))
         return component_orders
 
     def execute_spread_orders(self, target_position: int, basket_position: int, order_depths: Dict[str, OrderDepth]):
@@ -364,30 +343,21 @@ class Trader:
         target_quantity = abs(target_position - basket_position)
         basket_order_depth = order_depths[Product.GIFT_BASKET]
         synthetic_order_depth = self.get_synthetic_basket_order_depth(order_depths)
+        # Buy the basket against the synthetic's bids, or sell it against the synthetic's asks, as deep
+        # into both ladders as the target needs
         if target_position > basket_position:
-            basket_ask_price = min(basket_order_depth.sell_orders.keys())
-            basket_ask_volume = abs(basket_order_depth.sell_orders[basket_ask_price])
-            synthetic_bid_price = max(synthetic_order_depth.buy_orders.keys())
-            synthetic_bid_volume = abs(synthetic_order_depth.buy_orders[synthetic_bid_price])
-            orderbook_volume = min(basket_ask_volume, synthetic_bid_volume)
-            execute_volume = min(orderbook_volume, target_quantity)
-            basket_orders = [Order(Product.GIFT_BASKET, basket_ask_price, execute_volume)]
-            synthetic_orders = [Order(Product.SYNTHETIC, synthetic_bid_price, -execute_volume)]
-            aggregate_orders = self.convert_synthetic_basket_orders(synthetic_orders, order_depths)
-            aggregate_orders[Product.GIFT_BASKET] = basket_orders
-            return aggregate_orders
+            direction, basket_levels, synthetic_levels = 1, basket_order_depth.asks, synthetic_order_depth.bids
         else:
-            basket_bid_price = max(basket_order_depth.buy_orders.keys())
-            basket_bid_volume = abs(basket_order_depth.buy_orders[basket_bid_price])
-            synthetic_ask_price = min(synthetic_order_depth.sell_orders.keys())
-            synthetic_ask_volume = abs(synthetic_order_depth.sell_orders[synthetic_ask_price])
-            orderbook_volume = min(basket_bid_volume, synthetic_ask_volume)
-            execute_volume = min(orderbook_volume, target_quantity)
-            basket_orders = [Order(Product.GIFT_BASKET, basket_bid_price, -execute_volume)]
-            synthetic_orders = [Order(Product.SYNTHETIC, synthetic_ask_price, execute_volume)]
-            aggregate_orders = self.convert_synthetic_basket_orders(synthetic_orders, order_depths)
-            aggregate_orders[Product.GIFT_BASKET] = basket_orders
-            return aggregate_orders
+            direction, basket_levels, synthetic_levels = -1, basket_order_depth.bids, synthetic_order_depth.asks
+        if not basket_levels.prices or not synthetic_levels.prices:
+            return None
+        orderbook_volume = min(basket_levels.cumulative[-1], synthetic_levels.cumulative[-1])
+        execute_volume = min(orderbook_volume, target_quantity)
+        basket_orders = [Order(Product.GIFT_BASKET, sweep_price(basket_levels, execute_volume), direction * execute_volume)]
+        synthetic_orders = [Order(Product.SYNTHETIC, sweep_price(synthetic_levels, execute_volume), -direction * execute_volume)]
+        aggregate_orders = self.convert_synthetic_basket_orders(synthetic_orders, order_depths)
+        aggregate_orders[Product.GIFT_BASKET] = basket_orders
+        return aggregate_orders
 
     def spread_orders(self, order_depths: Dict[str, OrderDepth], product: Product, basket_position: int, spread_data: Dict[str, Any]):
         if Product.GIFT_BASKET not in order_depths.keys():
@@ -396,13 +366,15 @@ class Trader:
         synthetic_order_depth = self.get_synthetic_basket_order_depth(order_depths)
         basket_swmid = self.get_swmid(basket_order_depth)
         synthetic_swmid = self.get_swmid(synthetic_order_depth)
+        if basket_swmid is None or synthetic_swmid is None:
+            return None
         spread = basket_swmid - synthetic_swmid
         spread_data["spread_history"].append(spread)
         if len(spread_data["spread_history"]) < self.params[Product.SPREAD]["spread_std_window"]:
             return None
-        elif len(spread_data["spread_history"]) > self.params[Product.SPREAD]["spread_std_window"]:
-            spread_data["spread_history"].pop(0)
-        spread_std = np.std(spread_data["spread_history"])
+        spread_std = spread_data["spread_history"].std
+        if spread_std == 0:
+            return None
         zscore = (spread - self.params[Product.SPREAD]["default_spread_mean"]) / spread_std
         if zscore >= self.params[Product.SPREAD]["zscore_threshold"] and basket_position != -self.params[Product.SPREAD]["target_position"]:
             return self.execute_spread_orders(-self.params[Product.SPREAD]["target_position"], basket_position, order_depths)
@@ -411,124 +383,151 @@ class Trader:
         spread_data["prev_zscore"] = zscore
         return None
 
-    def run(self, state: TradingState):
-        traderObject = jsonpickle.decode(state.traderData) if state.traderData else {}
-
-        # Initialize traderObject for volcanic rock data
-        if "last_price" not in traderObject:
-            traderObject["last_price"] = None
-            traderObject["log_returns"] = []
+    def setup_vouchers(self):
+        self.chain = OptionChain(self.strikes)
+        if Product.VOLCANIC_ROCK in self.params:
+            self.hedger = DeltaHedger(Product.VOLCANIC_ROCK, self.LIMIT[Product.VOLCANIC_ROCK],
+                                      self.params[Product.VOLCANIC_ROCK]["hedge_band"],
+                                      self.params[Product.VOLCANIC_ROCK]["hedge_max_order"])
 
+    def trade_vouchers(self, state: TradingState, data: Dict[str, Any]) -> Dict[str, List[Order]]:
         result = {}
-        conversions = 0
-
-        # Compute mid-price of VOLCANIC_ROCK
-        if Product.VOLCANIC_ROCK in state.order_depths:
-            volcanic_rock_depth = state.order_depths[Product.VOLCANIC_ROCK]
-            best_bid = max(volcanic_rock_depth.buy_orders.keys()) if volcanic_rock_depth.buy_orders else 0
-            best_ask = min(volcanic_rock_depth.sell_orders.keys()) if volcanic_rock_depth.sell_orders else float("inf")
-            mid_price = (best_bid + best_ask) / 2 if best_bid > 0 and best_ask < float("inf") else None
-
-            # Update log returns for volatility estimation
-            if mid_price is not None:
-                if traderObject["last_price"] is not None and traderObject["last_price"] > 0:
-                    r_t = math.log(mid_price / traderObject["last_price"])
-                    traderObject["log_returns"].append(r_t)
-                    if len(traderObject["log_returns"]) > 100:
-                        traderObject["log_returns"].pop(0)
-                traderObject["last_price"] = mid_price
-
-            # Estimate volatility
-            sigma = np.std(traderObject["log_returns"]) if len(traderObject["log_returns"]) >= 10 else None
-
-            # Time to expiration (expiration at timestamp 69,900)
-            n = state.timestamp // 100  # Current time step number (0 to 699)
-            if n < 699 and sigma is not None:
-                T = 699 - n  # Time steps remaining
-
-                # Trade each voucher
-                for voucher, K in zip(self.vouchers, self.strikes):
-                    if voucher in state.order_depths:
-                        # Calculate fair value
-                        C_fair = self.black_scholes_call(mid_price, K, T, sigma)
-
-                        # Market data
-                        voucher_depth = state.order_depths[voucher]
-                        best_bid = max(voucher_depth.buy_orders.keys()) if voucher_depth.buy_orders else None
-                        best_ask = min(voucher_depth.sell_orders.keys()) if voucher_depth.sell_orders else None
-                        position = state.position.get(voucher, 0)
-
-                        orders = []
-                        # Buy if fair value exceeds ask price plus threshold
-                        if best_ask is not None and C_fair > best_ask + self.threshold:
-                            quantity = min(voucher_depth.sell_orders[best_ask], self.LIMIT[voucher] - position)
-                            if quantity > 0:
-                                orders.append(Order(voucher, best_ask, quantity))
-                        # Sell if fair value is below bid price minus threshold
-                        if best_bid is not None and C_fair < best_bid - self.threshold:
-                            quantity = min(voucher_depth.buy_orders[best_bid], self.LIMIT[voucher] + position)
-                            if quantity > 0:
-                                orders.append(Order(voucher, best_bid, -quantity))
-                        if orders:
-                            result[voucher] = orders
-
-        # Existing product trading logic (unchanged)
-        if Product.AMETHYSTS in self.params and Product.AMETHYSTS in state.order_depths:
-            amethyst_position = state.position.get(Product.AMETHYSTS, 0)
-            amethyst_take_orders, buy_order_volume, sell_order_volume = self.take_orders(
-                Product.AMETHYSTS, state.order_depths[Product.AMETHYSTS], self.params[Product.AMETHYSTS]["fair_value"],
-                self.params[Product.AMETHYSTS]["take_width"], amethyst_position
-            )
-            amethyst_clear_orders, buy_order_volume, sell_order_volume = self.clear_orders(
-                Product.AMETHYSTS, state.order_depths[Product.AMETHYSTS], self.params[Product.AMETHYSTS]["fair_value"],
-                self.params[Product.AMETHYSTS]["clear_width"], amethyst_position, buy_order_volume, sell_order_volume
-            )
-            amethyst_make_orders, _, _ = self.make_amethyst_orders(
-                state.order_depths[Product.AMETHYSTS], self.params[Product.AMETHYSTS]["fair_value"], amethyst_position,
-                buy_order_volume, sell_order_volume, self.params[Product.AMETHYSTS]["volume_limit"]
-            )
-            result[Product.AMETHYSTS] = amethyst_take_orders + amethyst_clear_orders + amethyst_make_orders
-
-        if Product.STARFRUIT in self.params and Product.STARFRUIT in state.order_depths:
-            starfruit_position = state.position.get(Product.STARFRUIT, 0)
-            starfruit_fair_value = self.starfruit_fair_value(state.order_depths[Product.STARFRUIT], traderObject)
-            starfruit_take_orders, buy_order_volume, sell_order_volume = self.take_orders(
-                Product.STARFRUIT, state.order_depths[Product.STARFRUIT], starfruit_fair_value,
-                self.params[Product.STARFRUIT]["take_width"], starfruit_position,
-                self.params[Product.STARFRUIT]["prevent_adverse"], self.params[Product.STARFRUIT]["adverse_volume"]
-            )
-            starfruit_clear_orders, buy_order_volume, sell_order_volume = self.clear_orders(
-                Product.STARFRUIT, state.order_depths[Product.STARFRUIT], starfruit_fair_value,
-                self.params[Product.STARFRUIT]["clear_width"], starfruit_position, buy_order_volume, sell_order_volume
-            )
-            starfruit_make_orders, _, _ = self.make_starfruit_orders(
-                state.order_depths[Product.STARFRUIT], starfruit_fair_value,
-                self.params[Product.STARFRUIT]["starfruit_min_edge"], starfruit_position, buy_order_volume, sell_order_volume
-            )
-            result[Product.STARFRUIT] = starfruit_take_orders + starfruit_clear_orders + starfruit_make_orders
-
-        if Product.ORCHIDS in self.params and Product.ORCHIDS in state.order_depths:
-            orchids_position = state.position.get(Product.ORCHIDS, 0)
-            conversions = self.orchids_arb_clear(orchids_position)
-            orchids_position = 0
-            orchids_take_orders, buy_order_volume, sell_order_volume = self.orchids_arb_take(
-                state.order_depths[Product.ORCHIDS], state.observations.conversionObservations[Product.ORCHIDS], orchids_position
-            )
-            orchids_make_orders, _, _ = self.orchids_arb_make(
-                state.observations.conversionObservations[Product.ORCHIDS], orchids_position, buy_order_volume, sell_order_volume
-            )
-            result[Product.ORCHIDS] = orchids_take_orders + orchids_make_orders
-
-        if Product.SPREAD not in traderObject:
-            traderObject[Product.SPREAD] = {"spread_history": [], "prev_zscore": 0, "clear_flag": False, "curr_avg": 0}
+        volcanic_rock_depth = state.order_depths[Product.VOLCANIC_ROCK]
+        best_bid = volcanic_rock_depth.best_bid if volcanic_rock_depth.buy_orders else 0
+        best_ask = volcanic_rock_depth.best_ask if volcanic_rock_depth.sell_orders else float("inf")
+        mid_price = (best_bid + best_ask) / 2 if best_bid > 0 and best_ask < float("inf") else None
+
+        # Update log returns for volatility estimation
+        if mid_price is not None:
+            if data["last_price"] is not None and data["last_price"] > 0:
+                r_t = math.log(mid_price / data["last_price"])
+                data["log_returns"].append(r_t)
+            data["last_price"] = mid_price
+
+        # Estimate volatility
+        sigma = data["log_returns"].std if len(data["log_returns"]) >= 10 else None
+
+        # Time to expiration (expiration at timestamp 69,900)
+        n = state.timestamp // 100  # Current time step number (0 to 699)
+        if n < 699 and sigma is not None:
+            T = 699 - n  # Time steps remaining
+
+            # Implied vols off the voucher mids, then a quadratic smile in moneyness; vouchers are
+            # priced off the smile so each trades on its mispricing relative to its neighbours.
+            # Without enough solved strikes for a fit, fall back to the realized sigma.
+            voucher_mids = np.array([self.voucher_mid(state.order_depths.get(voucher)) for voucher in self.vouchers])
+            previous_ivs = np.array(data["voucher_ivs"]) if len(data["voucher_ivs"]) == len(self.strikes) else None
+            ivs = self.chain.implied_vol(mid_price, T, voucher_mids, guess=previous_ivs)
+            data["voucher_ivs"].extend(ivs.tolist())
+            moneyness = self.chain.moneyness(mid_price, T)
+            smile = fit_smile(moneyness, ivs)
+            if smile is not None:
+                sigma = np.maximum(smile_vol(smile, moneyness), 1e-8)
+
+            # Fair values and deltas for the whole chain in one vectorized Black-Scholes pass
+            greeks = self.chain.greeks(mid_price, T, sigma)
+
+            # Hedge the voucher book's net delta with VOLCANIC_ROCK
+            if self.hedger is not None:
+                voucher_delta = net_delta(greeks.delta, [state.position.get(voucher, 0) for voucher in self.vouchers])
+                hedge_orders = self.hedger.orders(volcanic_rock_depth, state.position.get(Product.VOLCANIC_ROCK, 0), voucher_delta)
+                if hedge_orders:
+                    result[Product.VOLCANIC_ROCK] = hedge_orders
+
+            # Trade each voucher
+            for voucher, C_fair in zip(self.vouchers, greeks.price):
+                if voucher in state.order_depths:
+
+                    # Market data
+                    voucher_depth = state.order_depths[voucher]
+                    best_bid = voucher_depth.best_bid if voucher_depth.buy_orders else None
+                    best_ask = voucher_depth.best_ask if voucher_depth.sell_orders else None
+                    position = state.position.get(voucher, 0)
+
+                    orders = []
+                    # Buy if fair value exceeds ask price plus threshold
+                    if best_ask is not None and C_fair > best_ask + self.threshold:
+                        quantity = min(voucher_depth.sell_orders[best_ask], self.LIMIT[voucher] - position)
+                        if quantity > 0:
+                            orders.append(Order(voucher, best_ask, quantity))
+                    # Sell if fair value is below bid price minus threshold
+                    if best_bid is not None and C_fair < best_bid - self.threshold:
+                        quantity = min(voucher_depth.buy_orders[best_bid], self.LIMIT[voucher] + position)
+                        if quantity > 0:
+                            orders.append(Order(voucher, best_bid, -quantity))
+                    if orders:
+                        result[voucher] = orders
+
+        return result
+
+    def trade_amethysts(self, state: TradingState, data: Dict[str, Any]) -> List[Order]:
+        amethyst_position = state.position.get(Product.AMETHYSTS, 0)
+        amethyst_take_orders, buy_order_volume, sell_order_volume = self.take_orders(
+            Product.AMETHYSTS, state.order_depths[Product.AMETHYSTS], self.params[Product.AMETHYSTS]["fair_value"],
+            self.params[Product.AMETHYSTS]["take_width"], amethyst_position
+        )
+        amethyst_clear_orders, buy_order_volume, sell_order_volume = self.clear_orders(
+            Product.AMETHYSTS, state.order_depths[Product.AMETHYSTS], self.params[Product.AMETHYSTS]["fair_value"],
+            self.params[Product.AMETHYSTS]["clear_width"], amethyst_position, buy_order_volume, sell_order_volume
+        )
+        amethyst_make_orders, _, _ = self.make_amethyst_orders(
+            state.order_depths[Product.AMETHYSTS], self.params[Product.AMETHYSTS]["fair_value"], amethyst_position,
+            buy_order_volume, sell_order_volume, self.params[Product.AMETHYSTS]["volume_limit"]
+        )
+        return amethyst_take_orders + amethyst_clear_orders + amethyst_make_orders
+
+    def setup_starfruit(self):
+        self.starfruit_estimator = FairValueEstimator(self.params[Product.STARFRUIT]["adverse_volume"])
+
+    def trade_starfruit(self, state: TradingState, data: Dict[str, Any]) -> List[Order]:
+        starfruit_position = state.position.get(Product.STARFRUIT, 0)
+        starfruit_fair_value = self.starfruit_fair_value(state.order_depths[Product.STARFRUIT], data,
+                                                         state.market_trades.get(Product.STARFRUIT, []))
+        starfruit_take_orders, buy_order_volume, sell_order_volume = self.take_orders(
+            Product.STARFRUIT, state.order_depths[Product.STARFRUIT], starfruit_fair_value,
+            self.params[Product.STARFRUIT]["take_width"], starfruit_position,
+            self.params[Product.STARFRUIT]["prevent_adverse"], self.params[Product.STARFRUIT]["adverse_volume"]
+        )
+        starfruit_clear_orders, buy_order_volume, sell_order_volume = self.clear_orders(
+            Product.STARFRUIT, state.order_depths[Product.STARFRUIT], starfruit_fair_value,
+            self.params[Product.STARFRUIT]["clear_width"], starfruit_position, buy_order_volume, sell_order_volume
+        )
+        starfruit_make_orders, _, _ = self.make_starfruit_orders(
+            state.order_depths[Product.STARFRUIT], starfruit_fair_value,
+            self.params[Product.STARFRUIT]["starfruit_min_edge"], starfruit_position, buy_order_volume, sell_order_volume
+        )
+        return starfruit_take_orders + starfruit_clear_orders + starfruit_make_orders
+
+    def setup_orchids(self):
+        params = self.params[Product.ORCHIDS]
+        self.orchids_planner = ConversionPlanner(
+            Product.ORCHIDS, self.LIMIT[Product.ORCHIDS], params["conversion_limit"], params["storage_cost"],
+            params["horizon"], params["make_probability"], params["make_edge"]
+        )
+
+    def trade_orchids(self, state: TradingState, data: Dict[str, Any]):
+        orchids_position = state.position.get(Product.ORCHIDS, 0)
+        observation = state.observations.conversionObservations[Product.ORCHIDS]
+        conversions = self.orchids_planner.conversions(orchids_position)
+        orchids_take_orders, buy_order_volume, sell_order_volume = self.orchids_planner.take(
+            state.order_depths[Product.ORCHIDS], observation, orchids_position
+        )
+        orchids_make_orders = self.orchids_planner.make(observation, orchids_position, buy_order_volume, sell_order_volume)
+        return orchids_take_orders + orchids_make_orders, conversions
+
+    def setup_spread(self):
+        self.baskets = BasketBook({Product.GIFT_BASKET: BASKET_WEIGHTS})
+        self.spread_estimator = FairValueEstimator()
+
+    def trade_spread(self, state: TradingState, data: Dict[str, Any]) -> Dict[str, List[Order]]:
         basket_position = state.position.get(Product.GIFT_BASKET, 0)
-        spread_orders = self.spread_orders(state.order_depths, Product.GIFT_BASKET, basket_position, traderObject[Product.SPREAD])
-        if spread_orders is not None:
-            result[Product.CHOCOLATE] = spread_orders[Product.CHOCOLATE]
-            result[Product.STRAWBERRIES] = spread_orders[Product.STRAWBERRIES]
-            result[Product.ROSES] = spread_orders[Product.ROSES]
-            result[Product.GIFT_BASKET] = spread_orders[Product.GIFT_BASKET]
-
-        traderData = jsonpickle.encode(traderObject)
-        return result, conversions, traderData
+        return self.spread_orders(state.order_depths, Product.GIFT_BASKET, basket_position, data[Product.SPREAD])
 
+    def run(self, state: TradingState):
+        traderObject = self.schema.decode(state.traderData)
+        result, conversions = self.handlers.run(state, traderObject)
+
+        # Merge, net and clip to the limits so no product's batch is rejected
+        result = route(result, state.position, self.LIMIT)
+        traderData = self.schema.encode(traderObject)
+        return result, conversions, traderData
@@ -1,48 +1,73 @@
 from datamodel import OrderDepth, UserId, TradingState, Order
 import json
 import math
-import statistics
 from typing import Dict, List, Any
-import collections
 import numpy as np
-import jsonpickle
-
+from trader_codec import Schema, Packed
+from rolling import RollingWindow
+from regime import RegimeDetector
+from order_router import route
+from conversion import ConversionPlanner
+
+PARAMS = {
+    "MAGNIFICENT_MACARONS": {
+        # Sunlight levels the regime detector searches for the critical index, in bins of sunlight_bin_width
+        "sunlight_low": 3000,
+        "sunlight_high": 5000,
+        "sunlight_bin_width": 50,
+        # Critical Sunlight Index prior, used until the detector has learned one from how sugar
+        # prices move at each sunlight level
+        "critical_sunlight_prior": 3800,
+    },
+}
+
+
+def persistence_schema(params: Dict[str, Any]) -> Schema:
+    """Binary traderData layout; the history decodes straight back into its rolling window and the
+    sunlight regime (sugar price as the response) into its detector"""
+    return Schema(
+        macaron_price_history=Packed(RollingWindow, 20),
+        sunlight_regime=Packed(RegimeDetector, params["sunlight_low"], params["sunlight_high"], params["sunlight_bin_width"]),
+    )
 
 
 # Helper class for storing persistent data
 class PersistenceData:
-    def __init__(self, macaron_price_history=None):
-        # Use deque for efficient rolling window
-        self.macaron_price_history = collections.deque(macaron_price_history if macaron_price_history else [], maxlen=20) # Store last 20 prices for SMA
+    def __init__(self, schema: Schema, macaron_price_history=None, sunlight_regime=None):
+        self.schema = schema
+        # O(1) rolling window, keeps the running mean of the last 20 prices for the SMA
+        self.macaron_price_history = macaron_price_history if macaron_price_history is not None else RollingWindow(20)
+        # Learns the critical sunlight index and the sunlight trend online
+        self.sunlight_regime = sunlight_regime if sunlight_regime is not None else schema.fields['sunlight_regime'].new()
 
-    def to_json(self) -> str:
-        # Convert deque to list for JSON serialization
-        data = {'macaron_price_history': list(self.macaron_price_history)}
-        return jsonpickle.encode(data)
+    def encode(self) -> str:
+        return self.schema.encode({'macaron_price_history': self.macaron_price_history,
+                                   'sunlight_regime': self.sunlight_regime})
 
     @staticmethod
-    def from_json(json_str: str):
-        if not json_str:
-            return PersistenceData()
-        try:
-            data = jsonpickle.decode(json_str)
-            # Recreate deque from the loaded list
-            return PersistenceData(macaron_price_history=data.get('macaron_price_history', []))
-        except Exception as e:
-            print(f"Error decoding traderData: {e}")
-            return PersistenceData() # Return default if decoding fails
+    def decode(schema: Schema, trader_data: str):
+        # Decoding errors fall back to an empty history inside the schema
+        return PersistenceData(schema, **schema.decode(trader_data))
 
 
 class Trader:
     MACARON_SYMBOL = "MAGNIFICENT_MACARONS"
     MACARON_POSITION_LIMIT = 75
-    # Critical Sunlight Index - This is a HYPOTHESIS and might need tuning!
-    # Let's start with a value. Observe results and adjust if possible.
-    CRITICAL_SUNLIGHT_INDEX = 3800 # Example value, adjust based on observation
+    SUNLIGHT_LOOKAHEAD = 10 # Ticks ahead the sunlight trend is projected to anticipate a crossing
+    # Conversions: at most 10 units per tick, longs pay 0.1 per unit per tick of storage
+    MACARON_CONVERSION_LIMIT = 10
+    MACARON_STORAGE_COST = 0.1
+    MACARON_CONVERSION_HORIZON = 3 # Only hold arbitrage inventory that converts within this many ticks
 
     def __init__(self):
         # Initialize any state needed, like the persistence object
-        self.persisted_data = PersistenceData()
+        self.params = PARAMS[self.MACARON_SYMBOL]
+        self.schema = persistence_schema(self.params)
+        self.persisted_data = PersistenceData(self.schema)
+        self.conversion_planner = ConversionPlanner(
+            self.MACARON_SYMBOL, self.MACARON_POSITION_LIMIT, self.MACARON_CONVERSION_LIMIT,
+            self.MACARON_STORAGE_COST, self.MACARON_CONVERSION_HORIZON
+        )
         print("Trader Initialized")
 
     def calculate_weighted_average_price(self, order_depth: OrderDepth) -> float | None:
@@ -68,11 +93,9 @@ class Trader:
 
     def get_best_bid_ask(self, order_depth: OrderDepth) -> tuple[int | None, int | None, int | None, int | None]:
         """Extracts best bid and ask price and volume."""
-        best_bid = max(order_depth.buy_orders.keys()) if order_depth.buy_orders else None
-        best_bid_vol = order_depth.buy_orders.get(best_bid, 0) if best_bid is not None else 0
-
-        best_ask = min(order_depth.sell_orders.keys()) if order_depth.sell_orders else None
-        best_ask_vol = order_depth.sell_orders.get(best_ask, 0) if best_ask is not None else 0 # Sell volumes are negative
+        # Read from the OrderDepth's cached levels: None / 0 for an empty side
+        best_bid, best_bid_vol = order_depth.best_bid, order_depth.best_bid_volume
+        best_ask, best_ask_vol = order_depth.best_ask, order_depth.best_ask_volume # Sell volumes are negative
 
         return best_bid, best_ask, best_bid_vol, best_ask_vol
 
@@ -87,13 +110,13 @@ class Trader:
         """
         print(f"\n--- Timestamp: {state.timestamp} ---")
         # Decode persisted data
-        self.persisted_data = PersistenceData.from_json(state.traderData)
-        print(f"Trader Data (decoded): {self.persisted_data.to_json()}")
+        self.persisted_data = PersistenceData.decode(self.schema, state.traderData)
+        print(f"Trader Data (decoded): {list(self.persisted_data.macaron_price_history)}")
         #print(f"Observations: {state.observations}") # Can be very verbose
         print(f"Positions: {state.position}")
 
         result: Dict[str, List[Order]] = {} # Orders to place for each symbol
-        conversions = 0 # No conversions implemented yet
+        conversions = 0 # Only requested while market making, see below
 
         # --- MACARON Trading Logic ---
         product = self.MACARON_SYMBOL
@@ -104,7 +127,13 @@ class Trader:
             obs = state.observations.conversionObservations[product]
             sunlight_index = obs.sunlightIndex
 
-            print(f"MACARONS - Sunlight Index: {sunlight_index}, Current Position: {current_position}")
+            # Learn the critical index and the sunlight trend from this tick's observation
+            regime = self.persisted_data.sunlight_regime
+            regime.update(sunlight_index, obs.sugarPrice)
+            critical_sunlight_index = regime.critical(self.params["critical_sunlight_prior"])
+            projected_sunlight = regime.forecast(self.SUNLIGHT_LOOKAHEAD)
+
+            print(f"MACARONS - Sunlight Index: {sunlight_index} (slope {regime.slope:.2f}, critical {critical_sunlight_index}), Current Position: {current_position}")
 
             # Calculate current market price indicators
             best_bid, best_ask, best_bid_vol, best_ask_vol = self.get_best_bid_ask(order_depth)
@@ -118,7 +147,7 @@ class Trader:
             # Calculate Simple Moving Average (SMA) if enough data exists
             sma = None
             if len(self.persisted_data.macaron_price_history) >= 10: # Use 10 periods for SMA
-                 sma = statistics.mean(self.persisted_data.macaron_price_history)
+                 sma = self.persisted_data.macaron_price_history.mean
                  print(f"MACARONS - WAP: {wap:.2f}, Mid: {mid_price:.2f}, SMA(10): {sma:.2f}")
             elif mid_price is not None:
                  print(f"MACARONS - WAP: {wap:.2f}, Mid: {mid_price:.2f}, (SMA requires more data: {len(self.persisted_data.macaron_price_history)}/10)")
@@ -127,9 +156,9 @@ class Trader:
 
 
             # === Strategy Implementation ===
-            if sunlight_index < self.CRITICAL_SUNLIGHT_INDEX:
-                # --- Below CSI: Expect prices to RISE - Go Long ---
-                print(f"ACTION: Below CSI ({sunlight_index} < {self.CRITICAL_SUNLIGHT_INDEX}). Targeting LONG position.")
+            if min(sunlight_index, projected_sunlight) < critical_sunlight_index:
+                # --- Below CSI (or trending through it): Expect prices to RISE - Go Long ---
+                print(f"ACTION: Below CSI ({sunlight_index}, projected {projected_sunlight:.0f} < {critical_sunlight_index}). Targeting LONG position.")
 
                 # Aggressive Buying: Aim to buy up to the position limit
                 buy_volume_needed = self.MACARON_POSITION_LIMIT - current_position
@@ -152,7 +181,18 @@ class Trader:
 
             else:
                 # --- Above or Equal CSI: Prices around Fair Value - Market Making/Mean Reversion ---
-                print(f"ACTION: Above/Equal CSI ({sunlight_index} >= {self.CRITICAL_SUNLIGHT_INDEX}). Market Making around Fair Value.")
+                print(f"ACTION: Above/Equal CSI ({sunlight_index} >= {critical_sunlight_index}). Market Making around Fair Value.")
+
+                # Conversion arbitrage first: unwind inventory through the conversion cap and
+                # cross / quote the local book wherever converting abroad beats it. It has priority
+                # on the limit; the fair-value quotes below only use the room it leaves
+                conversions = self.conversion_planner.conversions(current_position)
+                arb_orders, arb_buy_volume, arb_sell_volume = self.conversion_planner.take(order_depth, obs, current_position)
+                arb_orders += self.conversion_planner.make(obs, current_position, arb_buy_volume, arb_sell_volume)
+                orders.extend(arb_orders)
+                arb_bids = sum(order.quantity for order in arb_orders if order.quantity > 0)
+                arb_asks = -sum(order.quantity for order in arb_orders if order.quantity < 0)
+                print(f"Conversion arbitrage: {conversions} conversions, took {arb_buy_volume} / {arb_sell_volume}, {arb_bids} / {arb_asks} in total")
 
                 # Use SMA as fair value estimate if available, otherwise WAP/Mid-price
                 fair_value = sma if sma is not None else wap if wap is not None else mid_price
@@ -163,25 +203,25 @@ class Trader:
 
                     # --- Place Buy Orders ---
                     buy_price = math.floor(fair_value - spread)
-                    buy_volume_allowed = self.MACARON_POSITION_LIMIT - current_position
+                    buy_volume_allowed = self.MACARON_POSITION_LIMIT - current_position - arb_bids
                     if buy_volume_allowed > 0:
                         # Place buy orders below fair value
                         order_quantity = min(buy_volume_allowed, 10) # Trade in chunks
                         print(f"Placing BUY Order: {order_quantity} @ {buy_price}")
                         orders.append(Order(product, buy_price, order_quantity))
                     else:
-                        print("Max long position limit reached, no buy orders.")
+                        print("No buy room left after the conversion arbitrage, no buy orders.")
 
                     # --- Place Sell Orders ---
                     sell_price = math.ceil(fair_value + spread)
-                    sell_volume_allowed = current_position - (-self.MACARON_POSITION_LIMIT) # Note: limit is symmetric +/- 75
+                    sell_volume_allowed = current_position - (-self.MACARON_POSITION_LIMIT) - arb_asks # Note: limit is symmetric +/- 75
                     if sell_volume_allowed > 0:
                          # Place sell orders above fair value
                         order_quantity = min(sell_volume_allowed, 10) # Trade in chunks
                         print(f"Placing SELL Order: {order_quantity} @ {sell_price}")
                         orders.append(Order(product, sell_price, -order_quantity)) # Negative quantity for sell
                     else:
-                        print("Max short position limit reached, no sell orders.")
+                        print("No sell room left after the conversion arbitrage, no sell orders.")
 
                 else:
                     print("Cannot determine Fair Value, skipping Market Making.")
@@ -189,8 +229,11 @@ class Trader:
 
             result[product] = orders
 
+        # Merge, net and clip to the limit so the batch is never rejected
+        result = route(result, state.position, {self.MACARON_SYMBOL: self.MACARON_POSITION_LIMIT})
+
         # Serialize persistent data
-        traderData = self.persisted_data.to_json()
+        traderData = self.persisted_data.encode()
         print(f"Trader Data (encoded): {traderData}")
         print(f"Orders Sent: {result}")
         print(f"Conversions Sent: {conversions}")